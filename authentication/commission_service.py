@@ -5,8 +5,8 @@ from decimal import Decimal
 from django.db.models import Sum, Count, Q, F
 from django.utils import timezone
 from datetime import datetime, timedelta, date
-from .models import TapNexSuperuser
-from booking.models import Booking
+from .platform_settings import get_platform_settings
+from booking.models import Booking, DailyRevenueRollup
 
 
 class CommissionCalculator:
@@ -48,29 +48,23 @@ class CommissionCalculator:
             end_date = date.today()
         
         # Get TapNex superuser settings - REQUIRED, no defaults
-        try:
-            tapnex_user = TapNexSuperuser.objects.first()
-            if not tapnex_user or tapnex_user.commission_rate is None or tapnex_user.platform_fee is None:
-                raise ValueError("Commission rate and platform fee must be configured in superuser settings")
-            
-            commission_rate = tapnex_user.commission_rate
-            platform_fee = tapnex_user.platform_fee
-            platform_fee_type = tapnex_user.platform_fee_type
-        except TapNexSuperuser.DoesNotExist:
+        platform_settings = get_platform_settings()
+        if not platform_settings.has_superuser:
             raise ValueError("TapNex superuser not found. Commission rates must be configured.")
+        if not platform_settings.is_configured:
+            raise ValueError("Commission rate and platform fee must be configured in superuser settings")
+        
+        commission_rate = platform_settings.commission_rate
+        platform_fee = platform_settings.platform_fee
+        platform_fee_type = platform_settings.platform_fee_type
         
-        # Get confirmed bookings in date range
-        bookings = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date
-        ).exclude(total_amount__isnull=True)
+        # Paid-booking revenue in date range, from the daily rollups
+        rollups = DailyRevenueRollup.objects.between(start_date, end_date)
+        by_type = {row['booking_type']: row for row in rollups.grouped('booking_type')}
         
         # Calculate totals
-        total_bookings = bookings.count()
-        gross_revenue = bookings.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
+        total_bookings = sum(row['total_booking_count'] for row in by_type.values())
+        gross_revenue = sum((row['total_gross_amount'] for row in by_type.values()), Decimal('0.00'))
         
         # Calculate commission breakdown
         commission_amount = (gross_revenue * commission_rate) / 100
@@ -85,34 +79,24 @@ class CommissionCalculator:
         net_payout = gross_revenue - total_commission
         
         # Booking type breakdown
-        private_bookings = bookings.filter(booking_type='PRIVATE')
-        shared_bookings = bookings.filter(booking_type='SHARED')
-        
-        private_revenue = private_bookings.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        
-        shared_revenue = shared_bookings.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
+        private = by_type.get('PRIVATE', {})
+        shared = by_type.get('SHARED', {})
         
-        # Daily revenue trend (last 7 days)
+        # Daily revenue trend (last 7 days), one grouped query
+        by_day = {
+            row['date']: row
+            for row in rollups.filter(date__gte=end_date - timedelta(days=6)).grouped('date')
+        }
         daily_revenue = []
-        for i in range(7):
+        for i in range(6, -1, -1):  # Chronological order
             day = end_date - timedelta(days=i)
-            day_bookings = bookings.filter(created_at__date=day)
-            day_revenue = day_bookings.aggregate(
-                total=Sum('total_amount')
-            )['total'] or Decimal('0.00')
-            
+            row = by_day.get(day, {})
             daily_revenue.append({
                 'date': day,
-                'revenue': day_revenue,
-                'bookings': day_bookings.count()
+                'revenue': row.get('total_gross_amount', Decimal('0.00')),
+                'bookings': row.get('total_booking_count', 0)
             })
         
-        daily_revenue.reverse()  # Chronological order
-        
         return {
             'period': {
                 'start_date': start_date,
@@ -128,10 +112,10 @@ class CommissionCalculator:
                 'total_bookings': total_bookings
             },
             'booking_breakdown': {
-                'private_bookings': private_bookings.count(),
-                'shared_bookings': shared_bookings.count(),
-                'private_revenue': private_revenue,
-                'shared_revenue': shared_revenue
+                'private_bookings': private.get('total_booking_count', 0),
+                'shared_bookings': shared.get('total_booking_count', 0),
+                'private_revenue': private.get('total_gross_amount', Decimal('0.00')),
+                'shared_revenue': shared.get('total_gross_amount', Decimal('0.00'))
             },
             'settings': {
                 'commission_rate': commission_rate,
@@ -164,18 +148,13 @@ class CommissionCalculator:
         if not end_date:
             end_date = date.today()
         
-        # Get bookings with game information
-        bookings = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
-            game__isnull=False
-        ).select_related('game')
-        
-        # Group by game
+        # Group by game (and booking type) over the daily rollups
         game_stats = {}
-        for booking in bookings:
-            game_name = booking.game.name
+        rows = DailyRevenueRollup.objects.between(start_date, end_date).filter(
+            game__isnull=False
+        ).grouped('game__name', 'booking_type')
+        for row in rows:
+            game_name = row['game__name']
             if game_name not in game_stats:
                 game_stats[game_name] = {
                     'bookings': 0,
@@ -187,15 +166,15 @@ class CommissionCalculator:
                 }
             
             stats = game_stats[game_name]
-            stats['bookings'] += 1
-            stats['revenue'] += booking.total_amount or Decimal('0.00')
+            stats['bookings'] += row['total_booking_count']
+            stats['revenue'] += row['total_gross_amount']
             
-            if booking.booking_type == 'PRIVATE':
-                stats['private_bookings'] += 1
-                stats['private_revenue'] += booking.total_amount or Decimal('0.00')
+            if row['booking_type'] == 'PRIVATE':
+                stats['private_bookings'] += row['total_booking_count']
+                stats['private_revenue'] += row['total_gross_amount']
             else:
-                stats['shared_bookings'] += 1
-                stats['shared_revenue'] += booking.total_amount or Decimal('0.00')
+                stats['shared_bookings'] += row['total_booking_count']
+                stats['shared_revenue'] += row['total_gross_amount']
         
         # Sort by revenue
         sorted_games = sorted(
@@ -216,26 +195,13 @@ class RevenueTracker:
         today = date.today()
         
         # Today's metrics
-        today_bookings = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date=today
-        )
-        
-        today_revenue = today_bookings.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
+        today_totals = DailyRevenueRollup.objects.between(today, today).totals()
+        today_revenue = today_totals['gross_amount']
         
         # This month's metrics
         month_start = today.replace(day=1)
-        month_bookings = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=month_start,
-            created_at__date__lte=today
-        )
-        
-        month_revenue = month_bookings.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
+        month_totals = DailyRevenueRollup.objects.between(month_start, today).totals()
+        month_revenue = month_totals['gross_amount']
         
         # Active bookings (currently in progress)
         active_bookings = Booking.objects.filter(
@@ -248,15 +214,14 @@ class RevenueTracker:
         ).count()
         
         # Get commission settings - REQUIRED, no defaults
-        try:
-            tapnex_user = TapNexSuperuser.objects.first()
-            if not tapnex_user or tapnex_user.commission_rate is None or tapnex_user.platform_fee is None:
-                raise ValueError("Commission rate and platform fee must be configured in superuser settings")
-            
-            commission_rate = tapnex_user.commission_rate
-            platform_fee = tapnex_user.platform_fee
-        except TapNexSuperuser.DoesNotExist:
+        platform_settings = get_platform_settings()
+        if not platform_settings.has_superuser:
             raise ValueError("TapNex superuser not found. Commission rates must be configured.")
+        if not platform_settings.is_configured:
+            raise ValueError("Commission rate and platform fee must be configured in superuser settings")
+        
+        commission_rate = platform_settings.commission_rate
+        platform_fee = platform_settings.platform_fee
         
         # Calculate today's commission
         today_commission = CommissionCalculator.calculate_commission(
@@ -265,12 +230,12 @@ class RevenueTracker:
         
         return {
             'today': {
-                'bookings': today_bookings.count(),
+                'bookings': today_totals['booking_count'],
                 'revenue': today_revenue,
                 'commission': today_commission['total_commission']
             },
             'month': {
-                'bookings': month_bookings.count(),
+                'bookings': month_totals['booking_count'],
                 'revenue': month_revenue
             },
             'active': {
@@ -298,18 +263,10 @@ class RevenueTracker:
             prev_month_end = current_month_start - timedelta(days=1)
         
         # Current month revenue
-        current_revenue = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=current_month_start,
-            created_at__date__lte=today
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0.00')
+        current_revenue = DailyRevenueRollup.objects.between(current_month_start, today).totals()['gross_amount']
         
         # Previous month revenue
-        prev_revenue = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=prev_month_start,
-            created_at__date__lte=prev_month_end
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0.00')
+        prev_revenue = DailyRevenueRollup.objects.between(prev_month_start, prev_month_end).totals()['gross_amount']
         
         # Calculate growth percentage
         if prev_revenue > 0:
@@ -9,9 +9,15 @@ from datetime import datetime, timedelta, date
 from decimal import Decimal
 from .models import Customer, CafeOwner
 from .decorators import customer_required, cafe_owner_required
-from booking.models import Game, Booking, GameSlot, SlotAvailability
+from booking.models import Game, Booking, GameSlot, SlotAvailability, DailyRevenueRollup
+from booking.occupancy import occupancy_report
+from booking.pagination import BOOKING_KEYSET, keyset_page
+from booking.search import search_bookings
 import json
 
+# Owner bookings header counts matches up to this many ("1000+ Total" beyond)
+BOOKING_COUNT_CAP = 1000
+
 
 @customer_required
 def customer_dashboard(request):
@@ -116,12 +122,7 @@ def owner_overview(request):
     today = now.date()
     yesterday = today - timedelta(days=1)
     
-    # Auto-update booking statuses for real-time accuracy
-    from booking.booking_service import auto_update_bookings_status
-    bookings_to_check = Booking.objects.filter(
-        status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
-    ).select_related('game_slot')
-    auto_update_bookings_status(bookings_to_check)
+    # Booking statuses are advanced by the update_booking_statuses worker command
     
     # Real-time stats with single aggregate query (NO CACHE)
     # Note: owner_payout is the net amount owner receives after commission deduction
@@ -293,16 +294,9 @@ def owner_bookings(request):
     game_filter = request.GET.get('game', 'all')
     date_filter = request.GET.get('date', 'month')  # Default to current month
     search_query = request.GET.get('search', '')
-    page = int(request.GET.get('page', 1))
+    cursor = request.GET.get('cursor')
     
-    # Auto-update booking statuses only for relevant bookings (performance optimization)
-    from booking.booking_service import auto_update_bookings_status
-    
-    bookings_to_check = Booking.objects.filter(
-        status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
-    ).select_related('game_slot')
-    
-    auto_update_bookings_status(bookings_to_check)
+    # Booking statuses are advanced by the update_booking_statuses worker command
     
     # Optimized base queryset with select_related (NO CACHE for real-time)
     bookings = Booking.objects.select_related('game', 'customer__user', 'game_slot')
@@ -327,29 +321,17 @@ def owner_bookings(request):
         bookings = bookings.filter(game_slot__date__year=now.year, game_slot__date__month=now.month)
     
     if search_query:
-        bookings = bookings.filter(
-            Q(id__icontains=search_query) |
-            Q(customer__user__first_name__icontains=search_query) |
-            Q(customer__user__last_name__icontains=search_query) |
-            Q(customer__user__email__icontains=search_query)
-        )
-    
-    # Order by game slot date and time (newest first)
-    bookings = bookings.order_by('-game_slot__date', '-game_slot__start_time')
+        # Customer name/username/email/phone (indexed search column) or booking id prefix
+        bookings = search_bookings(bookings, search_query)
     
-    # Get total count before pagination
-    total_bookings = bookings.count()
+    # Total for the header, counted only up to the cap so large histories stay cheap
+    total_bookings = bookings.order_by()[:BOOKING_COUNT_CAP + 1].count()
+    total_bookings_capped = total_bookings > BOOKING_COUNT_CAP
+    total_bookings = min(total_bookings, BOOKING_COUNT_CAP)
     
-    # Pagination
-    from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-    paginator = Paginator(bookings, 25)  # 25 bookings per page
-    
-    try:
-        bookings_page = paginator.page(page)
-    except PageNotAnInteger:
-        bookings_page = paginator.page(1)
-    except EmptyPage:
-        bookings_page = paginator.page(paginator.num_pages)
+    # Keyset pagination by game slot date, start time and id (newest first):
+    # the cursor marks where the page starts, so deep pages cost the same as the first
+    bookings_page = keyset_page(bookings, BOOKING_KEYSET, cursor, per_page=25)
     
     # Use single aggregate query for counts (real-time stats) - BEFORE applying filters
     # All status counts require payment_status='PAID' except pending_payment
@@ -397,6 +379,7 @@ def owner_bookings(request):
         'cafe_owner': cafe_owner,
         'bookings': bookings_page,
         'total_bookings': total_bookings,
+        'total_bookings_capped': total_bookings_capped,
         'confirmed_bookings': stats['confirmed'] or 0,
         'in_progress_bookings': stats['in_progress'] or 0,
         'completed_bookings': stats['completed'] or 0,
@@ -601,57 +584,36 @@ def owner_revenue(request):
         start_date = today.replace(day=1)
         end_date = today
     
+    # Revenue figures come from the daily rollups (a few rows per day), not a booking scan
+    rollups = DailyRevenueRollup.objects.between(start_date, end_date)
+    totals = rollups.totals()
+    
     # Total revenue for owner (after commission) - Use owner_payout
-    total_revenue = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).aggregate(total=Sum('owner_payout'))['total'] or Decimal('0.00')
+    total_revenue = totals['owner_payout']
     
     # Gross revenue (before commission) for reference
-    gross_revenue = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).aggregate(total=Sum('subtotal'))['total'] or Decimal('0.00')
+    gross_revenue = totals['subtotal']
     
     # Total commission deducted
-    total_commission = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).aggregate(total=Sum('commission_amount'))['total'] or Decimal('0.00')
+    total_commission = totals['commission_amount']
     
     # Revenue by payment method (using owner_payout)
-    revenue_by_method = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).values('payment_method').annotate(
-        total=Sum('owner_payout'),
-        count=Count('id')
-    )
+    revenue_by_method = [
+        {'payment_method': row['payment_method'], 'total': row['total_owner_payout'], 'count': row['total_booking_count']}
+        for row in rollups.grouped('payment_method')
+    ]
     
     # Revenue by game (using owner_payout)
-    revenue_by_game = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).values('game__name').annotate(
-        total=Sum('owner_payout'),
-        count=Count('id')
-    ).order_by('-total')[:10]
+    revenue_by_game = [
+        {'game__name': row['game__name'], 'total': row['total_owner_payout'], 'count': row['total_booking_count']}
+        for row in rollups.grouped('game__name').order_by('-total_owner_payout')[:10]
+    ]
     
     # Revenue trend (daily for the period) - owner_payout
-    revenue_trend = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=end_date,
-        payment_status='PAID'
-    ).annotate(
-        date=TruncDate('start_time')
-    ).values('date').annotate(
-        revenue=Sum('owner_payout')
-    ).order_by('date')
+    revenue_trend = [
+        {'date': row['date'].isoformat(), 'revenue': float(row['total_owner_payout'])}
+        for row in rollups.grouped('date')
+    ]
     
     # Payment management
     pending_payments = Booking.objects.filter(
@@ -663,12 +625,8 @@ def owner_revenue(request):
     ).select_related('game', 'customer').order_by('-created_at')[:20]
     
     # Get commission rate from TapNex superuser settings (dynamic, not hardcoded)
-    from authentication.models import TapNexSuperuser
-    try:
-        tapnex_user = TapNexSuperuser.objects.first()
-        commission_rate = tapnex_user.commission_rate if tapnex_user and tapnex_user.commission_rate else Decimal('0.00')
-    except TapNexSuperuser.DoesNotExist:
-        commission_rate = Decimal('0.00')
+    from authentication.platform_settings import get_platform_settings
+    commission_rate = get_platform_settings().commission_rate or Decimal('0.00')
     
     context = {
         'cafe_owner': cafe_owner,
@@ -679,7 +637,7 @@ def owner_revenue(request):
         'commission_rate': commission_rate,
         'revenue_by_method': revenue_by_method,
         'revenue_by_game': revenue_by_game,
-        'revenue_trend': list(revenue_trend),
+        'revenue_trend': revenue_trend,
         'pending_payments': pending_payments,
         'failed_payments': failed_payments,
         'period': period,
@@ -728,11 +686,23 @@ def owner_reports(request):
         count=Count('id')
     ).order_by('hour')
     
+    # Revenue comparison (current period vs previous period) - Use owner_payout, from the daily rollups
+    previous_start_date = start_date - timedelta(days=days)
+    previous_end_date = start_date - timedelta(days=1)
+    
+    current_totals = DailyRevenueRollup.objects.between(start_date, today).totals()
+    current_revenue = current_totals['owner_payout']
+    previous_revenue = DailyRevenueRollup.objects.between(
+        previous_start_date, previous_end_date
+    ).totals()['owner_payout']
+    
+    revenue_change = ((current_revenue - previous_revenue) / previous_revenue * 100) if previous_revenue > 0 else 0
+    
     # Average booking value - Use owner_payout
-    avg_booking_value = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        payment_status='PAID'
-    ).aggregate(avg=Avg('owner_payout'))['avg'] or Decimal('0.00')
+    avg_booking_value = (
+        current_totals['owner_payout'] / current_totals['booking_count']
+        if current_totals['booking_count'] else Decimal('0.00')
+    )
     
     # Cancellation analysis
     total_bookings = Booking.objects.filter(start_time__date__gte=start_date).count()
@@ -754,29 +724,8 @@ def owner_reports(request):
         ltv=Sum('bookings__owner_payout', filter=Q(bookings__payment_status='PAID'))
     ).aggregate(avg_ltv=Avg('ltv'))['avg_ltv'] or Decimal('0.00')
     
-    # Utilization rate
-    all_games = Game.objects.filter(is_active=True).count()
-    total_possible_slots = all_games * days * 12  # Assuming 12 hours per day
-    total_bookings_count = Booking.objects.filter(start_time__date__gte=start_date).count()
-    utilization_rate = (total_bookings_count / total_possible_slots * 100) if total_possible_slots > 0 else 0
-    
-    # Revenue comparison (current period vs previous period) - Use owner_payout
-    previous_start_date = start_date - timedelta(days=days)
-    previous_end_date = start_date - timedelta(days=1)
-    
-    current_revenue = Booking.objects.filter(
-        start_time__date__gte=start_date,
-        start_time__date__lte=today,
-        payment_status='PAID'
-    ).aggregate(total=Sum('owner_payout'))['total'] or Decimal('0.00')
-    
-    previous_revenue = Booking.objects.filter(
-        start_time__date__gte=previous_start_date,
-        start_time__date__lte=previous_end_date,
-        payment_status='PAID'
-    ).aggregate(total=Sum('owner_payout'))['total'] or Decimal('0.00')
-    
-    revenue_change = ((current_revenue - previous_revenue) / previous_revenue * 100) if previous_revenue > 0 else 0
+    # Utilization rate - booked seat-hours over the seat-hours the active games' slots offered
+    utilization_rate = occupancy_report(start_date, today).overall()['utilization'] * 100
     
     context = {
         'cafe_owner': cafe_owner,
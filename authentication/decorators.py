@@ -1,4 +1,7 @@
 from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -12,31 +15,50 @@ def customer_required(view_func):
     Decorator that requires the user to be a customer.
     Redirects to appropriate login if not authenticated or not a customer.
     Preserves the 'next' parameter for redirect after login.
+    Works on both sync and async views.
     """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        @login_required(login_url='/accounts/login/')
+        async def _wrapped_async_view(request, *args, **kwargs):
+            # The profile lookups below hit the database
+            denied = await sync_to_async(_customer_access_denied)(request)
+            if denied is not None:
+                return denied
+            return await view_func(request, *args, **kwargs)
+        return _wrapped_async_view
+    
     @wraps(view_func)
     @login_required(login_url='/accounts/login/')
     def _wrapped_view(request, *args, **kwargs):
-        if not hasattr(request.user, 'customer_profile'):
-            # If user is authenticated but not a customer, show access denied
-            if request.user.is_authenticated:
-                messages.error(request, 'Access denied. This area is for customers only.')
-                if hasattr(request.user, 'cafe_owner_profile'):
-                    return redirect('authentication:cafe_owner_dashboard')
-                elif request.user.is_superuser:
-                    return redirect('authentication:tapnex_dashboard')
-                else:
-                    # Redirect to customer login with next parameter
-                    from django.http import QueryDict
-                    next_url = request.get_full_path()
-                    return redirect(f'/accounts/login/?next={next_url}')
+        denied = _customer_access_denied(request)
+        if denied is not None:
+            return denied
+        return view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+def _customer_access_denied(request):
+    """Redirect response if the request's user is not a customer, otherwise None"""
+    if not hasattr(request.user, 'customer_profile'):
+        # If user is authenticated but not a customer, show access denied
+        if request.user.is_authenticated:
+            messages.error(request, 'Access denied. This area is for customers only.')
+            if hasattr(request.user, 'cafe_owner_profile'):
+                return redirect('authentication:cafe_owner_dashboard')
+            elif request.user.is_superuser:
+                return redirect('authentication:tapnex_dashboard')
             else:
-                # User not authenticated - redirect to login with next parameter
+                # Redirect to customer login with next parameter
                 from django.http import QueryDict
                 next_url = request.get_full_path()
                 return redirect(f'/accounts/login/?next={next_url}')
-        
-        return view_func(request, *args, **kwargs)
-    return _wrapped_view
+        else:
+            # User not authenticated - redirect to login with next parameter
+            from django.http import QueryDict
+            next_url = request.get_full_path()
+            return redirect(f'/accounts/login/?next={next_url}')
+    return None
 
 
 def cafe_owner_required(view_func):
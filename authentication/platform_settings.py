@@ -0,0 +1,110 @@
+"""
+Platform pricing settings provider
+Serves the TapNex fee/commission configuration and the cafe owner's Razorpay
+account as one immutable snapshot, cached in the shared cache so booking and
+payment hot paths don't query TapNexSuperuser/CafeOwner on every request.
+
+The snapshot is invalidated by signals whenever either model is saved or
+deleted (see authentication/signals.py); the TTL is only a backstop.
+
+Invalidation only reaches other workers through a shared cache, so with the
+per-process locmem backend the snapshot is read from the database on every
+call instead: otherwise workers that didn't handle the save would keep
+charging the old fee or commission for up to SETTINGS_TTL. Multi-worker
+deployments should set CACHE_BACKEND to file, db or redis to get the caching.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+from booking.cache import CacheNamespace
+
+SETTINGS_TTL = 300  # Seconds
+
+settings_cache = CacheNamespace('platform_settings', timeout=SETTINGS_TTL)
+
+
+@dataclass(frozen=True)
+class PlatformSettings:
+    """Immutable snapshot of platform pricing configuration"""
+    
+    commission_rate: Optional[Decimal] = None
+    platform_fee: Optional[Decimal] = None
+    platform_fee_type: str = 'PERCENT'
+    owner_razorpay_account_id: str = ''
+    has_superuser: bool = False
+    
+    @property
+    def is_configured(self):
+        """Commission rate and platform fee are both set"""
+        return self.commission_rate is not None and self.platform_fee is not None
+    
+    def calculate_platform_fee(self, amount):
+        """
+        Platform fee charged on a booking subtotal
+        
+        Args:
+            amount: Booking subtotal (Decimal)
+        
+        Returns:
+            Decimal: Platform fee (0.00 if not configured)
+        """
+        if self.platform_fee is None:
+            return Decimal('0.00')
+        if self.platform_fee_type == 'PERCENT':
+            return (amount * self.platform_fee) / 100
+        return self.platform_fee  # FIXED
+
+
+def get_platform_settings():
+    """
+    Current platform settings snapshot
+    
+    Fetch it once per request and pass it along, so every calculation in the
+    request uses the same pricing.
+    
+    Returns:
+        PlatformSettings
+    """
+    if not _cache_is_shared():
+        return _load_platform_settings()
+    
+    scope = ('current',)
+    hits, versions = settings_cache.get_many([scope])
+    snapshot = hits.get(scope)
+    if snapshot is None:
+        snapshot = _load_platform_settings()
+        settings_cache.set_many({scope: snapshot}, versions)
+    return snapshot
+
+
+def invalidate_platform_settings():
+    """Drop the cached snapshot (after the current transaction commits)"""
+    settings_cache.invalidate('current')
+
+
+def _cache_is_shared():
+    """Whether cache invalidations reach every worker (anything but locmem)"""
+    from django.core.cache import caches
+    from django.core.cache.backends.locmem import LocMemCache
+    
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def _load_platform_settings():
+    """Read the snapshot from the database"""
+    from .models import CafeOwner, TapNexSuperuser
+    
+    tapnex_user = TapNexSuperuser.objects.first()
+    owner_account_id = CafeOwner.objects.values_list('razorpay_account_id', flat=True).first()
+    
+    if not tapnex_user:
+        return PlatformSettings(owner_razorpay_account_id=owner_account_id or '')
+    
+    return PlatformSettings(
+        commission_rate=tapnex_user.commission_rate,
+        platform_fee=tapnex_user.platform_fee,
+        platform_fee_type=tapnex_user.platform_fee_type,
+        owner_razorpay_account_id=owner_account_id or '',
+        has_superuser=True,
+    )
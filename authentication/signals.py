@@ -1,9 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from allauth.socialaccount.signals import pre_social_login
 from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth.models import User
-from .models import Customer
+from .models import Customer, CafeOwner, TapNexSuperuser
+from .platform_settings import invalidate_platform_settings
 
 
 @receiver(pre_social_login)
@@ -46,4 +47,13 @@ def create_customer_profile_post_save(sender, instance, created, **kwargs):
                     'google_id': social_account.uid,
                     'avatar_url': social_account.extra_data.get('picture', ''),
                 }
-            )
\ No newline at end of file
+            )
+
+
+@receiver(post_save, sender=TapNexSuperuser)
+@receiver(post_delete, sender=TapNexSuperuser)
+@receiver(post_save, sender=CafeOwner)
+@receiver(post_delete, sender=CafeOwner)
+def invalidate_platform_settings_cache(sender, **kwargs):
+    """Pricing or payout account changed, drop the cached platform settings"""
+    invalidate_platform_settings()
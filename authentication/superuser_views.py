@@ -16,6 +16,7 @@ from django.core.paginator import Paginator
 from datetime import datetime, timedelta, date
 from decimal import Decimal
 import json
+import os
 
 from .models import TapNexSuperuser, CafeOwner, Customer
 from .decorators import tapnex_superuser_required
@@ -609,3 +610,11 @@ def test_telegram_notification(request):
     result = service.send_test_message()
     
     return JsonResponse(result)
+
+
+@tapnex_superuser_required
+def outbound_http_stats(request):
+    """Outbound HTTP counters (requests, failures, retries, latency, circuit state) for this process"""
+    from booking.http_client import http_stats
+    
+    return JsonResponse({'pid': os.getpid(), 'services': http_stats()})
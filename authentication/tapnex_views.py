@@ -18,7 +18,7 @@ from .models import TapNexSuperuser, CafeOwner
 from .decorators import tapnex_superuser_required
 from .commission_service import CommissionCalculator, RevenueTracker
 from .forms import CommissionSettingsForm, CafeOwnerManagementForm
-from booking.models import Booking, Game
+from booking.models import Booking, Game, DailyRevenueRollup
 
 
 @tapnex_superuser_required
@@ -321,11 +321,12 @@ def system_analytics(request):
         status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED']
     ).count()
     
-    # Revenue trends (last 12 months)
-    monthly_trends = []
-    today = date.today()
+    # Revenue trends (last 12 months), one grouped query over the daily rollups
+    from django.db.models.functions import TruncMonth
     
-    for i in range(12):
+    today = date.today()
+    month_starts = []
+    for i in range(11, -1, -1):  # Chronological order
         # Calculate month
         if today.month - i <= 0:
             month = 12 + (today.month - i)
@@ -333,25 +334,22 @@ def system_analytics(request):
         else:
             month = today.month - i
             year = today.year
-        
-        month_start = date(year, month, 1)
-        if month == 12:
-            month_end = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            month_end = date(year, month + 1, 1) - timedelta(days=1)
-        
-        month_revenue = Booking.objects.filter(
-            status__in=['CONFIRMED', 'IN_PROGRESS', 'COMPLETED'],
-            created_at__date__gte=month_start,
-            created_at__date__lte=month_end
-        ).aggregate(total=models.Sum('total_amount'))['total'] or Decimal('0.00')
-        
-        monthly_trends.append({
-            'month': month_start.strftime('%b %Y'),
-            'revenue': month_revenue
-        })
+        month_starts.append(date(year, month, 1))
     
-    monthly_trends.reverse()  # Chronological order
+    revenue_by_month = {
+        row['month']: row['total'] or Decimal('0.00')
+        for row in DailyRevenueRollup.objects.between(month_starts[0], today).annotate(
+            month=TruncMonth('date')
+        ).values('month').annotate(total=models.Sum('gross_amount')).order_by('month')
+    }
+    
+    monthly_trends = [
+        {
+            'month': month_start.strftime('%b %Y'),
+            'revenue': revenue_by_month.get(month_start, Decimal('0.00'))
+        }
+        for month_start in month_starts
+    ]
     
     # Booking type distribution
     booking_type_stats = {
@@ -0,0 +1,48 @@
+"""
+Authentication app tests
+"""
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from .models import TapNexSuperuser
+from .platform_settings import get_platform_settings
+
+
+class PlatformSettingsCacheTests(TestCase):
+    """A fee change saved by another worker reaches this one"""
+    
+    def setUp(self):
+        self.tapnex = TapNexSuperuser.objects.create(
+            user=User.objects.create_user(username='tapnex'),
+            commission_rate=Decimal('7.00'),
+            platform_fee=Decimal('5.00'),
+        )
+    
+    def _change_fee_elsewhere(self, fee):
+        # A queryset update sends no signals, like a save handled by another process
+        TapNexSuperuser.objects.filter(pk=self.tapnex.pk).update(platform_fee=fee)
+    
+    def test_process_local_cache_reads_current_settings(self):
+        self.assertEqual(get_platform_settings().platform_fee, Decimal('5.00'))
+        
+        self._change_fee_elsewhere(Decimal('9.00'))
+        
+        self.assertEqual(get_platform_settings().platform_fee, Decimal('9.00'))
+    
+    def test_shared_cache_serves_snapshot_until_invalidated(self):
+        with tempfile.TemporaryDirectory() as location:
+            shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+            with override_settings(CACHES=shared):
+                self.assertEqual(get_platform_settings().platform_fee, Decimal('5.00'))
+                
+                self._change_fee_elsewhere(Decimal('9.00'))
+                with self.assertNumQueries(0):
+                    self.assertEqual(get_platform_settings().platform_fee, Decimal('5.00'))
+                
+                # The saving worker's signal bumps the shared version for everyone
+                with self.captureOnCommitCallbacks(execute=True):
+                    TapNexSuperuser.objects.get(pk=self.tapnex.pk).save()
+                self.assertEqual(get_platform_settings().platform_fee, Decimal('9.00'))
@@ -10,29 +10,91 @@ from django.views import View
 from django.core.serializers import serialize
 import json
 import random
+from collections import defaultdict
 from datetime import datetime, timedelta
+from django.utils import timezone
 from .models import GamingStation, Booking
 
 
 @require_http_methods(["GET"])
-def station_status_api(request):
+async def availability_stream(request, game_id):
+    """
+    Server-Sent Events stream of slot availability changes for one game
+    
+    Each event carries one slot's current counters; its id can be sent back
+    as Last-Event-ID (EventSource does this on reconnect) to replay missed
+    changes. A 'reset' event means the gap was too old and the client should
+    reload its slot list.
+    
+    Served from an async generator under ASGI; under WSGI the sync generator
+    holds a worker thread for the life of the stream.
+    """
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import StreamingHttpResponse
+    from django.shortcuts import aget_object_or_404
+    from .models import Game
+    from .availability_stream import astream_availability, stream_availability
+    
+    game = await aget_object_or_404(Game, id=game_id, is_active=True)
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    if isinstance(request, ASGIRequest):
+        stream = astream_availability(game.id, last_event_id)
+    else:
+        stream = stream_availability(game.id, last_event_id)
+    
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+
+@require_http_methods(["GET"])
+async def station_status_api(request):
     """
     API endpoint to get current status of all gaming stations
+    
+    Async view: stations, their current bookings and today's booked time are
+    read with three async ORM queries rather than several queries per station.
     """
     try:
-        stations = GamingStation.objects.all()
+        now = timezone.now()
+        stations = [station async for station in GamingStation.objects.all()]
+        
+        current_bookings = {}
+        async for booking in Booking.objects.filter(
+            gaming_station__isnull=False,
+            start_time__lte=now,
+            end_time__gte=now,
+            status__in=['CONFIRMED', 'IN_PROGRESS']
+        ).order_by('start_time'):
+            current_bookings.setdefault(booking.gaming_station_id, booking)
+        
+        booked_minutes = defaultdict(float)
+        async for station_id, start_time, end_time in Booking.objects.filter(
+            gaming_station__isnull=False,
+            start_time__date=timezone.localdate(),
+            end_time__isnull=False
+        ).values_list('gaming_station_id', 'start_time', 'end_time'):
+            booked_minutes[station_id] += (end_time - start_time).total_seconds() / 60
+        
         station_data = []
         
         for station in stations:
             # Get current booking if any
-            current_booking = station.get_current_booking()
+            current_booking = current_bookings.get(station.id)
             
             # Calculate capacity and progress
-            daily_capacity = calculate_daily_capacity(station)
+            daily_capacity = _capacity_percentage(booked_minutes[station.id])
             progress = calculate_session_progress(current_booking) if current_booking else 0
             
             # Determine availability
-            is_available = station.is_available()
+            is_available = station.is_available
             is_maintenance = getattr(station, 'is_maintenance', False)
             
             station_info = {
@@ -45,7 +107,7 @@ def station_status_api(request):
                 'capacity': daily_capacity,
                 'progress': progress,
                 'daily_capacity': daily_capacity,
-                'next_available': get_next_available_time(station),
+                'next_available': _next_available_label(station, current_booking),
                 'peak_hours': get_peak_hours(station),
                 'time_remaining': get_time_remaining(current_booking) if current_booking else None,
                 'current_booking': {
@@ -62,7 +124,7 @@ def station_status_api(request):
             'stations': station_data,
             'timestamp': datetime.now().isoformat()
         })
-        
+    
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -89,17 +151,22 @@ def calculate_daily_capacity(station):
             duration = booking.end_time - booking.start_time
             total_booked_minutes += duration.total_seconds() / 60
         
-        # Assume 16 hours of operation per day (8 AM to 12 AM)
-        total_available_minutes = 16 * 60
-        
-        capacity_percentage = min((total_booked_minutes / total_available_minutes) * 100, 100)
-        return round(capacity_percentage, 1)
-        
+        return _capacity_percentage(total_booked_minutes)
+    
     except Exception:
         # Return a random value for demo purposes
         return round(random.uniform(20, 85), 1)
 
 
+def _capacity_percentage(total_booked_minutes):
+    """Share of the operating day that is booked"""
+    # Assume 16 hours of operation per day (8 AM to 12 AM)
+    total_available_minutes = 16 * 60
+    
+    capacity_percentage = min((total_booked_minutes / total_available_minutes) * 100, 100)
+    return round(capacity_percentage, 1)
+
+
 def calculate_session_progress(booking):
     """
     Calculate the progress percentage of a current booking session
@@ -129,7 +196,7 @@ def calculate_session_progress(booking):
         
         progress = (elapsed_duration / total_duration) * 100
         return max(0, min(100, round(progress, 1)))
-        
+    
     except Exception:
         # Return a random progress for demo purposes
         return round(random.uniform(10, 90), 1)
@@ -155,7 +222,7 @@ def get_time_remaining(booking):
         
         remaining = (booking_end - now).total_seconds()
         return max(0, int(remaining))
-        
+    
     except Exception:
         # Return a random time for demo purposes
         return random.randint(300, 7200)  # 5 minutes to 2 hours
@@ -166,24 +233,28 @@ def get_next_available_time(station):
     Get the next available time slot for a station
     """
     try:
-        if station.is_available():
-            return "Now"
-        
-        # Find the next available slot
-        current_booking = station.get_current_booking()
-        if current_booking:
-            return current_booking.end_time.strftime("%I:%M %p")
-        
-        # Default fallback
-        next_hour = datetime.now() + timedelta(hours=1)
-        return next_hour.strftime("%I:%M %p")
-        
+        return _next_available_label(station, station.get_current_booking())
+    
     except Exception:
         # Return a random next available time
         next_time = datetime.now() + timedelta(minutes=random.randint(30, 180))
         return next_time.strftime("%I:%M %p")
 
 
+def _next_available_label(station, current_booking):
+    """Next available time for a station given its current booking (no queries)"""
+    if station.is_available:
+        return "Now"
+    
+    # Find the next available slot
+    if current_booking:
+        return current_booking.end_time.strftime("%I:%M %p")
+    
+    # Default fallback
+    next_hour = datetime.now() + timedelta(hours=1)
+    return next_hour.strftime("%I:%M %p")
+
+
 def get_peak_hours(station):
     """
     Get peak hours information for a station
@@ -230,7 +301,7 @@ class StationUpdateView(View):
                 return self.handle_maintenance_mode(station, data)
             else:
                 return self.handle_status_change(station, data)
-                
+        
         except GamingStation.DoesNotExist:
             return JsonResponse({
                 'success': False,
@@ -289,7 +360,7 @@ class StationUpdateView(View):
             'id': station.id,
             'name': station.name,
             'station_type': station.station_type,
-            'is_available': station.is_available(),
+            'is_available': station.is_available,
             'is_maintenance': getattr(station, 'is_maintenance', False),
             'hourly_rate': float(station.hourly_rate),
             'capacity': calculate_daily_capacity(station),
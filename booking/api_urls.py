@@ -9,6 +9,7 @@ from .api_views import (
     GameSlotsWeekAPI,
     AvailableDatesAPI
 )
+from .api_realtime import availability_stream
 
 app_name = 'booking_api'
 
@@ -24,4 +25,7 @@ urlpatterns = [
     
     # Available dates
     path('games/<uuid:game_id>/available-dates/', AvailableDatesAPI.as_view(), name='available_dates'),
+    
+    # Availability changes (Server-Sent Events)
+    path('games/<uuid:game_id>/availability/stream/', availability_stream, name='availability_stream'),
 ]
@@ -6,13 +6,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Prefetch
 from datetime import datetime, timedelta
 from django.utils import timezone
 
-from .models import Game, GameSlot, SlotAvailability, Booking
-from .serializers import GameSerializer, GameSlotSerializer, SlotsByDateSerializer
-from .booking_service import BookingService
+from .models import Game, GameSlot
+from .serializers import GameSerializer
+from .availability_cache import get_day_snapshots, render_slots, snapshot_token
+from .etags import make_etag, not_modified, with_etag
 
 
 class GameDetailAPI(APIView):
@@ -40,6 +40,8 @@ class GameSlotsAPI(APIView):
     
     Query Parameters:
     - date: ISO format date (YYYY-MM-DD), defaults to today
+    
+    Supports If-None-Match: unchanged polls get an empty 304
     """
     
     def get(self, request, game_id):
@@ -61,106 +63,35 @@ class GameSlotsAPI(APIView):
         else:
             selected_date = timezone.now().date()
         
-        # Get slots with optimized queries
-        slots = GameSlot.objects.filter(
-            game=game,
-            date=selected_date,
-            is_active=True
-        ).select_related(
-            'game',
-            'availability'
-        ).prefetch_related(
-            Prefetch(
-                'bookings',
-                queryset=Booking.objects.filter(
-                    status__in=['CONFIRMED', 'COMPLETED', 'PENDING']
-                ).select_related('customer')
-            )
-        ).order_by('start_time')
-        
-        # Expire old reservations in bulk BEFORE processing slots (performance optimization)
-        # Only expire if there are any to avoid unnecessary queries
-        expired_count = Booking.objects.filter(
-            game_slot__game=game,
-            game_slot__date=selected_date,
-            status='PENDING',
-            reservation_expires_at__lte=timezone.now()
-        ).update(status='EXPIRED', is_reservation_expired=True)
-        
-        # CRITICAL: Refresh slots from database after expiring reservations
-        # The .select_related('availability') loaded stale data before expiration
-        if expired_count > 0:
-            slots = GameSlot.objects.filter(
-                game=game,
-                date=selected_date,
-                is_active=True
-            ).select_related(
-                'game',
-                'availability'
-            ).prefetch_related(
-                Prefetch(
-                    'bookings',
-                    queryset=Booking.objects.filter(
-                        status__in=['CONFIRMED', 'COMPLETED', 'PENDING']
-                    ).select_related('customer')
-                )
-            ).order_by('start_time')
-        
-        # Filter past slots
+        # Serve from the (game, date) availability snapshot; rebuilt on change or expiry
+        snapshot = get_day_snapshots(game, [selected_date])[selected_date]
         now = timezone.now()
-        available_slots = []
         
-        for slot in slots:
-            # Convert slot time to timezone-aware datetime in IST
-            slot_datetime = timezone.make_aware(
-                timezone.datetime.combine(slot.date, slot.start_time),
-                timezone=timezone.get_current_timezone()
-            )
-            
-            # Skip past slots
-            if slot_datetime < now:
-                continue
-            
-            # Check availability
-            try:
-                availability = slot.availability
-                if availability.can_book_private or availability.can_book_shared:
-                    available_slots.append(slot)
-            except SlotAvailability.DoesNotExist:
-                # Create availability if missing
-                SlotAvailability.objects.create(
-                    game_slot=slot,
-                    total_capacity=game.capacity
-                )
-                available_slots.append(slot)
+        etag = make_etag(game.id, game.updated_at, selected_date, snapshot_token(snapshot, now))
+        cached_response = not_modified(request, etag)
+        if cached_response is not None:
+            return cached_response
         
-        # Serialize
-        serializer = GameSlotSerializer(
-            available_slots, 
-            many=True,
-            context={'request': request}
-        )
+        available_slots = render_slots(snapshot, now)
         
         response_data = {
             'date': selected_date.isoformat(),
             'game_id': str(game.id),
             'game_name': game.name,
             'total_slots': len(available_slots),
-            'slots': serializer.data
+            'slots': available_slots
         }
         
-        # Create response with no-cache headers to prevent browser caching
-        response = Response(response_data)
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        return response
+        # no-cache (not no-store) so browsers revalidate with If-None-Match
+        return with_etag(Response(response_data), etag)
 
 
 class GameSlotsWeekAPI(APIView):
     """
     GET /api/games/{game_id}/slots/week/
     Returns slots grouped by date for the next 7 days
+    
+    Supports If-None-Match: unchanged polls get an empty 304
     """
     
     def get(self, request, game_id):
@@ -170,63 +101,35 @@ class GameSlotsWeekAPI(APIView):
         
         # Get date range
         start_date = timezone.now().date()
-        end_date = start_date + timedelta(days=6)
+        dates = [start_date + timedelta(days=offset) for offset in range(7)]
         
-        # Get slots with optimized queries
-        slots = GameSlot.objects.filter(
-            game=game,
-            date__gte=start_date,
-            date__lte=end_date,
-            is_active=True
-        ).select_related(
-            'game',
-            'availability'
-        ).prefetch_related(
-            Prefetch(
-                'bookings',
-                queryset=Booking.objects.filter(
-                    status__in=['CONFIRMED', 'COMPLETED', 'PENDING']
-                )
-            )
-        ).order_by('date', 'start_time')
+        # One availability snapshot per day, rebuilt together when missing
+        snapshots = get_day_snapshots(game, dates)
         
-        # Group by date and filter past slots
         now = timezone.now()
-        slots_by_date = {}
+        now_ts = now.timestamp()
+        
+        etag = make_etag(
+            game.id,
+            game.updated_at,
+            [(slot_date, snapshot_token(snapshots[slot_date], now)) for slot_date in dates]
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response is not None:
+            return cached_response
+        grouped_data = []
         
-        for slot in slots:
-            # Convert slot time to timezone-aware datetime in IST
-            slot_datetime = timezone.make_aware(
-                timezone.datetime.combine(slot.date, slot.start_time),
-                timezone=timezone.get_current_timezone()
-            )
+        for slot_date in dates:
+            snapshot = snapshots[slot_date]
             
-            # Skip past slots
-            if slot_datetime < now:
+            # Skip dates with no upcoming slots
+            if not any(entry['start'] >= now_ts for entry in snapshot['slots']):
                 continue
             
-            date_key = slot.date.isoformat()
-            if date_key not in slots_by_date:
-                slots_by_date[date_key] = []
-            
-            # Check if available
-            try:
-                availability = slot.availability
-                if availability.can_book_private or availability.can_book_shared:
-                    slots_by_date[date_key].append(slot)
-            except SlotAvailability.DoesNotExist:
-                SlotAvailability.objects.create(
-                    game_slot=slot,
-                    total_capacity=game.capacity
-                )
-                slots_by_date[date_key].append(slot)
-        
-        # Serialize grouped data
-        grouped_data = []
-        for date_str, date_slots in slots_by_date.items():
+            date_slots = render_slots(snapshot, now)
             grouped_data.append({
-                'date': date_str,
-                'slots': GameSlotSerializer(date_slots, many=True, context={'request': request}).data,
+                'date': slot_date.isoformat(),
+                'slots': date_slots,
                 'total_slots': len(date_slots),
                 'available_slots': len(date_slots)
             })
@@ -237,13 +140,15 @@ class GameSlotsWeekAPI(APIView):
             'dates': grouped_data
         }
         
-        return Response(response_data)
+        return with_etag(Response(response_data), etag)
 
 
 class AvailableDatesAPI(APIView):
     """
     GET /api/games/{game_id}/available-dates/
     Returns list of dates that have available slots (for date picker)
+    
+    Supports If-None-Match: unchanged polls get an empty 304
     """
     
     def get(self, request, game_id):
@@ -263,8 +168,15 @@ class AvailableDatesAPI(APIView):
             is_active=True,
             availability__is_private_booked=False
         ).values_list('date', flat=True).distinct().order_by('date')
+        available_dates = [date.isoformat() for date in available_dates]
+        
+        # The date list is the version token; a match still skips the response body
+        etag = make_etag(game.id, available_dates)
+        cached_response = not_modified(request, etag)
+        if cached_response is not None:
+            return cached_response
         
-        return Response({
+        return with_etag(Response({
             'game_id': str(game.id),
-            'available_dates': [date.isoformat() for date in available_dates]
-        })
+            'available_dates': available_dates
+        }), etag)
@@ -1,117 +1,158 @@
 """
-Automatic slot generation without cron jobs
-Generates slots in the background without blocking users
+Automatic slot maintenance without cron jobs
+Keeps a rolling window of slots generated ahead for every active game.
+
+Normally driven by the `maintain_slots` management command (run once or as a
+long-lived scheduler loop). A lease row ensures only one node generates at a
+time, so the command can safely run on several hosts.
+
+Maintenance passes size each game's window from forecast demand
+(booking/forecasting.py): quiet games keep DAYS_TO_MAINTAIN days ahead, busier
+games up to four weeks so customers can book further out.
 """
 from datetime import date, timedelta
-from django.core.cache import cache
+import logging
+import os
+import socket
+
 from django.db.models import Max
-from .models import Game, GameSlot
+from .models import Game, GameSlot, WorkerLease
 from .slot_generator import SlotGenerator
-import logging
-import threading
 
 logger = logging.getLogger(__name__)
 
 
 class AutoSlotGenerator:
-    """Automatically generate slots in the background"""
+    """Automatically generate slots ahead of time"""
     
-    CACHE_KEY_PREFIX = 'last_slot_check_'
-    DAYS_TO_MAINTAIN = 7  # Always maintain 7 days of slots ahead
+    DAYS_TO_MAINTAIN = 7  # Always maintain at least 7 days of slots ahead
+    USE_DEMAND_FORECAST = True  # Extend the window for games with high forecast demand
     CHECK_INTERVAL = 3600  # Check once per hour (in seconds)
+    LEASE_NAME = 'slot_maintenance'
+    LEASE_TTL = 600  # Seconds a maintenance run may hold the lease
+    
+    @staticmethod
+    def default_holder():
+        """Identifier for this process when taking the maintenance lease"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+    
+    @classmethod
+    def run_maintenance(cls, holder=None, days_to_maintain=None, lease_ttl=None):
+        """
+        Run one maintenance pass under the slot-maintenance lease
+        
+        Args:
+            holder: Lease holder identifier (defaults to host:pid)
+            days_to_maintain: Fixed window for every game (defaults to the
+                forecast-based window, at least DAYS_TO_MAINTAIN)
+            lease_ttl: Override for LEASE_TTL (seconds)
+        
+        Returns:
+            dict: Summary of the pass, or None if another node holds the lease
+        """
+        holder = holder or cls.default_holder()
+        
+        if not WorkerLease.acquire(cls.LEASE_NAME, holder, lease_ttl or cls.LEASE_TTL):
+            logger.info(f"Slot maintenance lease held by another worker, skipping ({holder})")
+            return None
+        
+        try:
+            horizons = None
+            if days_to_maintain is None and cls.USE_DEMAND_FORECAST:
+                horizons = cls._forecast_horizons()
+            return cls._check_and_generate_slots(days_to_maintain=days_to_maintain, horizons=horizons)
+        finally:
+            WorkerLease.release(cls.LEASE_NAME, holder)
     
     @classmethod
-    def ensure_slots_available(cls, game=None, async_mode=True):
+    def ensure_slots_available(cls, game=None):
         """
-        Ensure slots are available for all active games or a specific game
+        Ensure slots are available for all active games or a specific game (synchronous)
         
         Args:
             game: Optional Game instance to check. If None, checks all active games.
-            async_mode: If True, runs in background thread (non-blocking)
         """
-        if async_mode:
-            # Run in background thread - doesn't block the request
-            thread = threading.Thread(
-                target=cls._check_and_generate_slots,
-                args=(game,),
-                daemon=True
-            )
-            thread.start()
-        else:
-            # Run synchronously (for testing or manual triggers)
-            cls._check_and_generate_slots(game)
+        return cls._check_and_generate_slots(game)
     
     @classmethod
-    def _check_and_generate_slots(cls, game=None):
+    def _forecast_horizons(cls):
+        """Per-game window from forecast demand, or None if the forecast fails"""
+        from .forecasting import forecast_horizons
+        
+        try:
+            return forecast_horizons(cls.DAYS_TO_MAINTAIN)
+        except Exception as e:
+            logger.error(f"Demand forecast failed, using {cls.DAYS_TO_MAINTAIN} days for every game: {e}")
+            return None
+    
+    @classmethod
+    def _check_and_generate_slots(cls, game=None, days_to_maintain=None, horizons=None):
         """Internal method to check and generate slots"""
         if game:
             games = [game]
         else:
-            games = Game.objects.filter(is_active=True)
+            games = list(Game.objects.filter(is_active=True))
+        
+        # Furthest generated date for every game in one grouped query
+        latest_dates = dict(
+            GameSlot.objects.filter(
+                game__in=games,
+                is_active=True
+            ).values('game').annotate(max_date=Max('date')).values_list('game', 'max_date')
+        )
+        
+        default_days = days_to_maintain or cls.DAYS_TO_MAINTAIN
+        horizons = horizons or {}
+        
+        summary = {
+            'games_checked': len(games),
+            'games_extended': 0,
+            'slots_created': 0,
+            'errors': []
+        }
         
         for game_instance in games:
-            cls._ensure_game_slots(game_instance)
+            created = cls._ensure_game_slots(
+                game_instance,
+                latest_dates.get(game_instance.id),
+                horizons.get(game_instance.id, default_days),
+                summary['errors']
+            )
+            if created:
+                summary['games_extended'] += 1
+                summary['slots_created'] += created
+        
+        return summary
     
     @classmethod
-    def _ensure_game_slots(cls, game):
+    def _ensure_game_slots(cls, game, latest_slot, days_to_maintain, errors):
         """
         Ensure a specific game has slots for the next N days
-        Uses caching ONLY to prevent slot generation overhead (once per hour)
-        NOTE: This cache does NOT affect real-time data display - it only controls
-        when new slots are generated in the background
-        """
-        cache_key = f"{cls.CACHE_KEY_PREFIX}{game.id}"
-        last_check = cache.get(cache_key)
-        
-        # Only check once per hour to avoid overhead (doesn't affect real-time updates)
-        if last_check:
-            return
         
+        Returns:
+            int: Number of slots created
+        """
         try:
-            # Find the furthest date we have slots for
-            latest_slot = GameSlot.objects.filter(
-                game=game,
-                is_active=True
-            ).aggregate(max_date=Max('date'))['max_date']
-            
-            target_date = date.today() + timedelta(days=cls.DAYS_TO_MAINTAIN)
+            target_date = date.today() + timedelta(days=days_to_maintain)
             
             # If we don't have slots far enough, generate them
-            if not latest_slot or latest_slot < target_date:
-                start_date = latest_slot + timedelta(days=1) if latest_slot else date.today()
-                end_date = target_date
-                
-                logger.info(f"🔄 Auto-generating slots for {game.name} from {start_date} to {end_date}")
-                
-                result = SlotGenerator.generate_slots_for_game(game, start_date, end_date)
-                logger.info(f"✅ Created {result['created']} slots for {game.name}")
+            if latest_slot and latest_slot >= target_date:
+                return 0
             
-            # Cache for specified interval
-            cache.set(cache_key, True, cls.CHECK_INTERVAL)
+            start_date = max(latest_slot + timedelta(days=1), date.today()) if latest_slot else date.today()
+            end_date = target_date
             
-        except Exception as e:
-            logger.error(f"❌ Error auto-generating slots for {game.name}: {str(e)}")
-    
-    @classmethod
-    def check_daily_generation(cls):
-        """
-        Check if we need to generate slots for today
-        Call this in middleware on first request of the day
-        NOTE: This cache does NOT affect real-time data display
-        """
-        today_key = f"daily_slot_check_{date.today()}"
-        
-        # Check if we've already run today (doesn't affect real-time updates)
-        if cache.get(today_key):
-            return False
-        
-        # Mark as checked for today (lasts 24 hours - doesn't affect real-time updates)
-        cache.set(today_key, True, 86400)
-        
-        # Generate slots in background
-        cls.ensure_slots_available(async_mode=True)
+            logger.info(f"🔄 Auto-generating slots for {game.name} from {start_date} to {end_date}")
+            
+            result = SlotGenerator.generate_slots_for_game(game, start_date, end_date)
+            logger.info(f"✅ Created {result['created']} slots for {game.name}")
+            return result['created']
         
-        return True
+        except Exception as e:
+            error_msg = f"Error auto-generating slots for {game.name}: {str(e)}"
+            errors.append(error_msg)
+            logger.error(f"❌ {error_msg}")
+            return 0
     
     @classmethod
     def force_generate_all(cls):
@@ -119,34 +160,20 @@ class AutoSlotGenerator:
         Force slot generation for all games (synchronous)
         Use for manual triggers or management commands
         """
-        cls.ensure_slots_available(game=None, async_mode=False)
+        return cls.ensure_slots_available(game=None)
 
 
 # Convenience functions
-def auto_generate_slots_for_game(game, async_mode=True):
+def auto_generate_slots_for_game(game):
     """
-    Auto-generate slots for a specific game
+    Auto-generate slots for a specific game (synchronous)
     
     Args:
         game: Game instance
-        async_mode: If True, runs in background (default)
     """
-    AutoSlotGenerator.ensure_slots_available(game, async_mode=async_mode)
+    return AutoSlotGenerator.ensure_slots_available(game)
 
 
-def auto_generate_slots_all_games(async_mode=True):
-    """
-    Auto-generate slots for all active games
-    
-    Args:
-        async_mode: If True, runs in background (default)
-    """
-    AutoSlotGenerator.ensure_slots_available(game=None, async_mode=async_mode)
-
-
-def check_and_generate_daily_slots():
-    """
-    Check and generate slots once per day
-    Call this in middleware or views
-    """
-    return AutoSlotGenerator.check_daily_generation()
+def auto_generate_slots_all_games():
+    """Auto-generate slots for all active games (synchronous)"""
+    return AutoSlotGenerator.ensure_slots_available(game=None)
@@ -0,0 +1,169 @@
+"""
+Coalesced availability broadcasts
+One booking lifecycle touches a slot's availability several times (create,
+status transition, signal handlers), and each touch used to re-query the slot
+and publish its own update. Callers now mark the slot dirty instead:
+
+- Inside a transaction, dirty slot ids are collected and broadcast once, after
+  commit, with one bulk query for all of them. Nothing is sent on rollback.
+- Inside coalesce_availability_broadcasts(), ids are collected until the block
+  exits (for loops that commit per row, such as bulk expiry).
+- Otherwise the slot is broadcast straight away.
+
+With AVAILABILITY_BROADCAST_DEBOUNCE > 0, flushed ids are held for that many
+seconds so a burst of commits becomes one broadcast per slot.
+
+Usage:
+    from .availability_broadcast import queue_availability_broadcast
+    queue_availability_broadcast(game_slot.id)
+"""
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = getattr(settings, 'AVAILABILITY_BROADCAST_DEBOUNCE', 0)
+
+_local = threading.local()
+
+
+class _Batch:
+    """Dirty slot ids waiting for one flush"""
+    
+    def __init__(self):
+        self.game_slot_ids = set()
+    
+    def flush(self):
+        if _current_batch() is self:
+            _local.batch = None
+        game_slot_ids, self.game_slot_ids = self.game_slot_ids, set()
+        _dispatch(game_slot_ids)
+
+
+def queue_availability_broadcast(game_slot_id):
+    """
+    Mark a slot's availability as changed
+    
+    Args:
+        game_slot_id: GameSlot id
+    """
+    queue_availability_broadcasts([game_slot_id])
+
+
+def queue_availability_broadcasts(game_slot_ids):
+    """
+    Mark several slots' availability as changed
+    
+    Args:
+        game_slot_ids: Iterable of GameSlot ids
+    """
+    game_slot_ids = {game_slot_id for game_slot_id in game_slot_ids if game_slot_id}
+    if not game_slot_ids:
+        return
+    
+    scope = getattr(_local, 'scope', None)
+    if scope is not None:
+        scope.game_slot_ids.update(game_slot_ids)
+        return
+    
+    if not connection.in_atomic_block:
+        _dispatch(game_slot_ids)
+        return
+    
+    batch = _transaction_batch()
+    batch.game_slot_ids.update(game_slot_ids)
+
+
+def _transaction_batch():
+    """The batch flushed when the current transaction commits, registering it if needed"""
+    batch = _current_batch()
+    if batch is None:
+        batch = _Batch()
+        transaction.on_commit(batch.flush)
+        # Only the registered callback keeps the batch alive: a rollback that discards
+        # the callback frees the batch too, so the next transaction starts a fresh one
+        _local.batch = weakref.ref(batch)
+    
+    return batch
+
+
+def _current_batch():
+    """The batch waiting for this thread's transaction to commit, if any"""
+    ref = getattr(_local, 'batch', None)
+    return ref() if ref is not None else None
+
+
+@contextmanager
+def coalesce_availability_broadcasts():
+    """
+    Collect every slot marked dirty in the block and broadcast them once at the end
+    
+    The broadcast waits for the surrounding transaction to commit, if any.
+    Nested blocks share the outermost block's batch.
+    """
+    if getattr(_local, 'scope', None) is not None:
+        yield
+        return
+    
+    scope = _Batch()
+    _local.scope = scope
+    try:
+        yield
+    finally:
+        _local.scope = None
+        if scope.game_slot_ids:
+            queue_availability_broadcasts(scope.game_slot_ids)
+
+
+class _Debouncer:
+    """Holds flushed slot ids for DEBOUNCE_SECONDS, then broadcasts them together"""
+    
+    def __init__(self, delay):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+    
+    def add(self, game_slot_ids):
+        with self._lock:
+            self._pending.update(game_slot_ids)
+            if self._timer is None:
+                # Not a daemon, so a command that just expired a batch still sends it before exiting
+                self._timer = threading.Timer(self.delay, self._fire)
+                self._timer.start()
+    
+    def _fire(self):
+        with self._lock:
+            game_slot_ids, self._pending = self._pending, set()
+            self._timer = None
+        
+        try:
+            _broadcast(game_slot_ids)
+        finally:
+            connection.close()
+
+
+_debouncer = _Debouncer(DEBOUNCE_SECONDS) if DEBOUNCE_SECONDS > 0 else None
+
+
+def _dispatch(game_slot_ids):
+    if not game_slot_ids:
+        return
+    if _debouncer is not None:
+        _debouncer.add(game_slot_ids)
+    else:
+        _broadcast(game_slot_ids)
+
+
+def _broadcast(game_slot_ids):
+    from .realtime_service import RealTimeService
+    
+    try:
+        RealTimeService.broadcast_availability_updates(game_slot_ids)
+    except Exception as e:
+        logger.error(f"Error broadcasting availability for {len(game_slot_ids)} slot(s): {e}")
@@ -0,0 +1,189 @@
+"""
+Availability snapshot cache
+Stores the serialized slot list for each (game, date) in Django's cache so the
+slot APIs can answer customer polls without rebuilding booking options.
+
+Snapshots live in the 'availability' cache namespace, versioned per
+(game, date). Anything that changes availability bumps the version
+(invalidate_availability). A short TTL and the earliest pending-reservation
+expiry bound how stale a snapshot can get.
+
+Each snapshot also carries a digest of its content, which the slot APIs use
+as their ETag (see booking/etags.py).
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .cache import CacheNamespace
+
+SNAPSHOT_TTL = getattr(settings, 'AVAILABILITY_SNAPSHOT_TTL', 30)  # Seconds, correctness backstop
+
+snapshots_cache = CacheNamespace('availability', timeout=SNAPSHOT_TTL)
+
+
+def invalidate_availability(game_id, slot_date):
+    """Invalidate the snapshot for one (game, date) once the current transaction commits"""
+    snapshots_cache.invalidate(game_id, slot_date.isoformat())
+
+
+def invalidate_availability_many(game_dates):
+    """Invalidate snapshots for an iterable of (game_id, date) pairs"""
+    for game_id, slot_date in set(game_dates):
+        invalidate_availability(game_id, slot_date)
+
+
+def get_day_snapshots(game, dates):
+    """
+    Get availability snapshots for a game on several dates
+    
+    Cached days are served as-is; missing or lapsed days are rebuilt together
+    with one slot query and stored under their current version.
+    
+    Args:
+        game: Game instance
+        dates: Iterable of dates
+    
+    Returns:
+        dict: {date: snapshot}, where snapshot is
+              {'slots': [{'start': timestamp, 'available': bool, 'data': dict}],
+               'valid_until': timestamp or None, 'digest': str}
+    """
+    scopes = {slot_date: (game.id, slot_date.isoformat()) for slot_date in dates}
+    cached, versions = snapshots_cache.get_many(scopes.values())
+    now_ts = timezone.now().timestamp()
+    
+    snapshots = {}
+    missing = []
+    for slot_date, scope in scopes.items():
+        snapshot = cached.get(scope)
+        # A pending reservation lapsing changes availability without a write
+        if snapshot is None or (snapshot['valid_until'] and snapshot['valid_until'] <= now_ts):
+            missing.append(slot_date)
+        else:
+            snapshots[slot_date] = snapshot
+    
+    if missing:
+        built = _build_snapshots(game, missing)
+        snapshots_cache.set_many(
+            {scopes[slot_date]: snapshot for slot_date, snapshot in built.items()},
+            versions
+        )
+        snapshots.update(built)
+    
+    return snapshots
+
+
+def render_slots(snapshot, now=None):
+    """
+    Turn a snapshot into the slot payload for the current moment
+    
+    Drops slots that have started or are unavailable and refreshes the
+    time-dependent fields.
+    
+    Returns:
+        list: Serialized slots (GameSlotSerializer format)
+    """
+    now = now or timezone.now()
+    now_ts = now.timestamp()
+    
+    slots = []
+    for entry in snapshot['slots']:
+        if entry['start'] < now_ts or not entry['available']:
+            continue
+        
+        data = entry['data']
+        data['is_past'] = False
+        for reservation in (data.get('availability') or {}).get('pending_reservations', []):
+            if reservation['expires_at']:
+                expires_at = datetime.fromisoformat(reservation['expires_at'])
+                reservation['time_remaining_seconds'] = max(0, int((expires_at - now).total_seconds()))
+        slots.append(data)
+    
+    return slots
+
+
+def snapshot_token(snapshot, now=None):
+    """
+    Version token for a snapshot as rendered at the given moment
+    
+    render_slots output only changes when the snapshot content does or when
+    another slot starts, so the token is the content digest plus the number
+    of slots that have already started.
+    
+    Returns:
+        tuple: (digest, started slot count)
+    """
+    now_ts = (now or timezone.now()).timestamp()
+    started = sum(1 for entry in snapshot['slots'] if entry['start'] < now_ts)
+    return snapshot.get('digest'), started
+
+
+def _snapshot_digest(entries):
+    """Hash a day's slot entries, ignoring the fields render_slots refreshes"""
+    volatile = {'is_past', 'time_remaining_seconds'}
+    
+    def stable(value):
+        if isinstance(value, dict):
+            return {key: stable(item) for key, item in value.items() if key not in volatile}
+        if isinstance(value, list):
+            return [stable(item) for item in value]
+        return value
+    
+    payload = json.dumps(stable(entries), sort_keys=True, default=str).encode()
+    return hashlib.md5(payload, usedforsecurity=False).hexdigest()
+
+
+def _build_snapshots(game, dates):
+    """Rebuild snapshots for the given dates from the database"""
+    from .models import GameSlot, SlotAvailability
+    from .serializers import GameSlotSerializer
+    
+    # Lapsed reservations are released (and snapshots invalidated) by the
+    # sweep_reservations worker, not on this read path
+    
+    # Slots with reservation totals annotated in one aggregate query
+    # plus a single prefetch of active pending reservations
+    slots = GameSlot.objects.filter(
+        game=game,
+        date__in=dates,
+        is_active=True
+    ).select_related(
+        'game',
+        'availability'
+    ).with_reservation_summary().order_by('date', 'start_time')
+    
+    snapshots = {slot_date: {'slots': [], 'valid_until': None} for slot_date in dates}
+    
+    for slot in slots:
+        try:
+            availability = slot.availability
+            available = availability.can_book_private or availability.can_book_shared
+        except SlotAvailability.DoesNotExist:
+            # Create availability if missing
+            slot.availability = SlotAvailability.objects.create(
+                game_slot=slot,
+                total_capacity=game.capacity
+            )
+            available = True
+        
+        snapshot = snapshots[slot.date]
+        snapshot['slots'].append({
+            'start': slot.start_datetime.timestamp(),
+            'available': available,
+            'data': GameSlotSerializer(slot).data,
+        })
+        
+        # The snapshot is only good until the first pending reservation lapses
+        for booking in getattr(slot, 'pending_reservations', []):
+            expires_ts = booking.reservation_expires_at.timestamp()
+            if snapshot['valid_until'] is None or expires_ts < snapshot['valid_until']:
+                snapshot['valid_until'] = expires_ts
+    
+    for snapshot in snapshots.values():
+        snapshot['digest'] = _snapshot_digest(snapshot['slots'])
+    
+    return snapshots
@@ -0,0 +1,381 @@
+"""
+Availability event stream
+Fans slot availability events out to Server-Sent Events subscribers on every
+web worker.
+
+Availability updates are appended to the shared RealtimeEvent log (see
+event_store.py) by whichever worker made the change. Each worker runs one
+AvailabilityHub thread that polls the log while it has subscribers and hands
+new availability events to the subscribers of that game. The event's sequence
+number is the SSE event id, so a reconnecting browser sends Last-Event-ID and
+gets the slots it missed replayed.
+
+Under ASGI the stream is an async generator (astream_availability), so an
+idle subscriber costs a coroutine instead of a worker thread; under WSGI the
+sync generator (stream_availability) blocks a thread per stream.
+
+Usage:
+    for frame in stream_availability(game_id, last_event_id):
+        ...  # see booking.api_realtime.availability_stream
+"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Min, Q
+
+from .event_store import EVENT_FIELDS, events_queryset, last_sequence
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = getattr(settings, 'AVAILABILITY_STREAM_POLL_INTERVAL', 0.5)  # Seconds
+HEARTBEAT_INTERVAL = getattr(settings, 'AVAILABILITY_STREAM_HEARTBEAT', 15)  # Seconds
+MAX_STREAM_SECONDS = getattr(settings, 'AVAILABILITY_STREAM_MAX_SECONDS', 300)
+
+EVENT_TYPE = 'availability_update'
+POLL_BATCH_SIZE = 500
+REPLAY_LIMIT = 1000
+SUBSCRIBER_QUEUE_SIZE = 1000
+RECONNECT_DELAY_MS = 3000
+
+# Sequence numbers can commit out of order; a skipped one is re-checked for
+# this long before it is treated as a rolled-back insert
+GAP_TIMEOUT = 5  # Seconds
+MAX_TRACKED_GAP = 1000
+
+
+def _stream_event(row):
+    """SSE payload for an availability event row: the published data plus its sequence number"""
+    return {**row['data'], 'id': row['id']}
+
+
+class Subscription:
+    """One stream's inbox on the hub"""
+    
+    def __init__(self, game_id):
+        self.game_id = str(game_id)
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def deliver(self, event):
+        """Called from the hub thread; never blocks"""
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # The stream closes and the browser resumes from its Last-Event-ID
+            self.overflowed = True
+
+
+class AsyncSubscription(Subscription):
+    """Subscription whose inbox is an asyncio.Queue on the subscriber's event loop"""
+    
+    def __init__(self, game_id):
+        self.game_id = str(game_id)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def deliver(self, event):
+        """Called from the hub thread; hands the event to the subscriber's loop"""
+        self.loop.call_soon_threadsafe(self._put, event)
+    
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class AvailabilityHub:
+    """
+    Per-process fan-out of availability events from the shared event log
+    
+    A daemon thread polls the event log while at least one subscription
+    is open and stops when the last one closes.
+    """
+    
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)  # game_id -> {Subscription}
+        self._thread = None
+        self._cursor = None
+        self._gaps = {}  # sequence -> monotonic time first missed
+    
+    def subscribe(self, subscription):
+        """
+        Start delivering one game's changes to a subscription
+        
+        Changes committed after this call returns are delivered; use
+        replay_changes for anything older. Queries the database the first
+        time, so async callers wrap it in sync_to_async.
+        
+        Args:
+            subscription: Subscription (or AsyncSubscription) for a game
+        
+        Returns:
+            Subscription
+        """
+        with self._lock:
+            if self._cursor is None:
+                # Start from the current end of the log (queried on the caller's connection)
+                self._cursor = last_sequence()
+                self._gaps = {}
+            
+            self._subscriptions[subscription.game_id].add(subscription)
+            
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='availability-hub', daemon=True)
+                self._thread.start()
+        
+        return subscription
+    
+    def unsubscribe(self, subscription):
+        """Close a subscription"""
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.game_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.game_id]
+    
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscriptions.values())
+    
+    def _run(self):
+        """Hub thread: poll until nobody is listening"""
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscriptions:
+                        # Next subscriber re-reads the cursor from the log
+                        self._thread = None
+                        self._cursor = None
+                        return
+                
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.error(f"Availability hub poll failed: {e}")
+                    close_old_connections()
+                
+                time.sleep(self.poll_interval)
+        finally:
+            connection.close()
+    
+    def poll(self):
+        """
+        Fetch new events from the log and deliver the availability ones
+        
+        Returns:
+            int: Number of events delivered
+        """
+        from .models import RealtimeEvent
+        
+        now = time.monotonic()
+        self._gaps = {
+            sequence: first_missed
+            for sequence, first_missed in self._gaps.items()
+            if now - first_missed < GAP_TIMEOUT
+        }
+        
+        # Every event type is read so gaps in the sequence can be told apart from filtered rows
+        condition = Q(id__gt=self._cursor)
+        if self._gaps:
+            condition |= Q(id__in=list(self._gaps))
+        
+        rows = list(
+            RealtimeEvent.objects.filter(condition)
+            .order_by('id')
+            .values(*EVENT_FIELDS)[:POLL_BATCH_SIZE]
+        )
+        
+        events = []
+        for row in rows:
+            sequence = row['id']
+            if sequence > self._cursor:
+                if sequence - self._cursor <= MAX_TRACKED_GAP:
+                    for missing in range(self._cursor + 1, sequence):
+                        self._gaps.setdefault(missing, now)
+                self._cursor = sequence
+            else:
+                self._gaps.pop(sequence, None)
+            
+            if row['event_type'] == EVENT_TYPE and row['game_id']:
+                events.append((str(row['game_id']), _stream_event(row)))
+        
+        if not events:
+            return 0
+        
+        with self._lock:
+            subscriptions = {game_id: list(subscribers) for game_id, subscribers in self._subscriptions.items()}
+        
+        delivered = 0
+        for game_id, event in events:
+            for subscription in subscriptions.get(game_id, []):
+                subscription.deliver(event)
+                delivered += 1
+        
+        return delivered
+
+
+availability_hub = AvailabilityHub()
+
+
+def replay_changes(game_id, last_event_id):
+    """
+    Availability events for a game after a client's last seen event
+    
+    Only the latest event per slot is returned.
+    
+    Args:
+        game_id: Game id
+        last_event_id: Last event id the client received
+    
+    Returns:
+        list or None: Events in sequence order, or None when the gap can't be
+                      replayed (pruned or too long) and the client must reload
+    """
+    from .models import RealtimeEvent
+    
+    # Events before the oldest retained one may have been pruned
+    oldest = RealtimeEvent.objects.aggregate(oldest=Min('id'))['oldest']
+    if _replay_gap_lost(oldest, last_event_id):
+        return None
+    
+    return _replay_events(list(_replay_rows(game_id, last_event_id)))
+
+
+async def areplay_changes(game_id, last_event_id):
+    """Async replay_changes"""
+    from .models import RealtimeEvent
+    
+    oldest = (await RealtimeEvent.objects.aaggregate(oldest=Min('id')))['oldest']
+    if _replay_gap_lost(oldest, last_event_id):
+        return None
+    
+    return _replay_events([row async for row in _replay_rows(game_id, last_event_id)])
+
+
+def _replay_gap_lost(oldest, last_event_id):
+    """Events between the client's last one and the oldest retained one may have been pruned"""
+    return oldest is not None and oldest > last_event_id + 1
+
+
+def _replay_rows(game_id, last_event_id):
+    return events_queryset(last_event_id, EVENT_TYPE, game_id)[:REPLAY_LIMIT + 1]
+
+
+def _replay_events(rows):
+    """Latest event per slot in sequence order, or None if the replay was truncated"""
+    if len(rows) > REPLAY_LIMIT:
+        return None
+    
+    latest_per_slot = {row['key']: row for row in rows}
+    return [_stream_event(row) for row in sorted(latest_per_slot.values(), key=lambda row: row['id'])]
+
+
+def sse_frame(event_type, data, event_id=None):
+    """Format one Server-Sent Events frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream_availability(game_id, last_event_id=None, hub=None):
+    """
+    Generator of SSE frames for one game's availability
+    
+    Sends the missed changes first when resuming, then live changes, with a
+    heartbeat comment whenever the stream is idle. Ends after
+    MAX_STREAM_SECONDS; the browser reconnects with Last-Event-ID.
+    
+    Args:
+        game_id: Game id
+        last_event_id: Value of the Last-Event-ID header, if any
+        hub: AvailabilityHub (defaults to the process-wide hub)
+    """
+    hub = hub or availability_hub
+    subscription = hub.subscribe(Subscription(game_id))
+    
+    try:
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+        
+        sent_through = 0
+        if last_event_id is not None:
+            replayed = replay_changes(game_id, last_event_id)
+            for frame, event_id in _replay_frames(game_id, replayed):
+                yield frame
+                sent_through = event_id or sent_through
+        
+        # Idle streams shouldn't hold a database connection
+        connection.close()
+        
+        deadline = time.monotonic() + MAX_STREAM_SECONDS
+        while time.monotonic() < deadline and not subscription.overflowed:
+            try:
+                event = subscription.queue.get(timeout=HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            
+            if event['id'] <= sent_through:
+                continue  # Already sent by the replay
+            yield sse_frame('availability', event, event['id'])
+    finally:
+        hub.unsubscribe(subscription)
+
+
+async def astream_availability(game_id, last_event_id=None, hub=None):
+    """
+    Async generator of SSE frames for one game's availability (ASGI)
+    
+    Same frames as stream_availability; waiting for changes is an await on
+    an asyncio.Queue fed by the hub thread, so no thread is held.
+    """
+    hub = hub or availability_hub
+    subscription = AsyncSubscription(game_id)
+    await sync_to_async(hub.subscribe)(subscription)
+    
+    try:
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+        
+        sent_through = 0
+        if last_event_id is not None:
+            replayed = await areplay_changes(game_id, last_event_id)
+            for frame, event_id in _replay_frames(game_id, replayed):
+                yield frame
+                sent_through = event_id or sent_through
+        
+        deadline = subscription.loop.time() + MAX_STREAM_SECONDS
+        while subscription.loop.time() < deadline and not subscription.overflowed:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+            
+            if event['id'] <= sent_through:
+                continue  # Already sent by the replay
+            yield sse_frame('availability', event, event['id'])
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def _replay_frames(game_id, replayed):
+    """(frame, event id) pairs for a replay result; a lost gap becomes one 'reset' frame"""
+    if replayed is None:
+        return [(sse_frame('reset', {'game_id': str(game_id)}), None)]
+    return [(sse_frame('availability', event, event['id']), event['id']) for event in replayed]
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from decimal import Decimal
 from .models import Booking, GameSlot, SlotAvailability, Game
+from .availability_cache import invalidate_availability_many
 from authentication.models import Customer
 
 
@@ -215,6 +216,17 @@ class BookingService:
         Raises:
             ValidationError: If booking cannot be created
         """
+        from django.conf import settings
+        
+        # Optimistic (lock-free) path for regular shared bookings when enabled
+        if (booking_type == 'SHARED' and
+                getattr(settings, 'SHARED_BOOKING_MODE', 'locking') == 'optimistic' and
+                spots_requested < game_slot.game.capacity):
+            booking = BookingService.create_shared_booking_optimistic(customer, game_slot, spots_requested)
+            if booking is not None:
+                return booking
+            # Too much contention for the last spots, fall back to the locking path
+        
         with transaction.atomic():
             # Validate booking time is in the future
             if game_slot.start_datetime <= timezone.now():
@@ -226,6 +238,9 @@ class BookingService:
             # Handle potential conflicts
             BookingService.handle_booking_conflict(game_slot, booking_type, spots_requested)
             
+            # Release lapsed reservations so the reserved_spots counter read below is current
+            expire_reservations_bulk(Booking.objects.filter(game_slot=game_slot))
+            
             # Get availability with lock to prevent race conditions
             try:
                 availability = SlotAvailability.objects.select_for_update().get(
@@ -255,6 +270,13 @@ class BookingService:
                     else:
                         raise ValidationError("Private booking not available - slot already has bookings")
                 
+                if availability.reserved_spots > 0:
+                    raise ValidationError(
+                        "Private booking not available right now. "
+                        f"{availability.reserved_spots} spot(s) are reserved by users completing payment. "
+                        "Please wait a few minutes or select a different time slot."
+                    )
+                
                 if game.booking_type not in ['SINGLE', 'HYBRID']:
                     raise ValidationError("This game does not support private bookings")
                 
@@ -281,30 +303,7 @@ class BookingService:
                 truly_available = availability.available_spots - reserved_spots
                 
                 if spots_requested > truly_available:
-                    if truly_available > 0:
-                        if reserved_spots > 0:
-                            raise ValidationError(
-                                f"Only {truly_available} spot(s) available now. "
-                                f"{reserved_spots} spot(s) are reserved by users completing payment. "
-                                f"Please select {truly_available} or fewer spots, or wait a few minutes."
-                            )
-                        else:
-                            raise ValidationError(
-                                f"Only {truly_available} spot(s) available now. "
-                                f"Another user just booked some spots. "
-                                f"Please select {truly_available} or fewer spots."
-                            )
-                    else:
-                        if reserved_spots > 0:
-                            raise ValidationError(
-                                f"All spots are currently reserved by users completing payment. "
-                                f"Please wait a few minutes or select a different time slot."
-                            )
-                        else:
-                            raise ValidationError(
-                                "This time slot just became fully booked by another user. "
-                                "Please select a different time slot."
-                            )
+                    raise BookingService._shared_capacity_error(truly_available, reserved_spots)
                 
                 if spots_requested < 1:
                     raise ValidationError("Must book at least 1 spot")
@@ -332,19 +331,7 @@ class BookingService:
             # Don't save availability here - Booking.save() will handle it based on status
             
             # Get platform fee from TapNex superuser settings
-            from authentication.models import TapNexSuperuser
-            try:
-                tapnex_user = TapNexSuperuser.objects.first()
-                if tapnex_user:
-                    # Calculate platform fee based on type
-                    if tapnex_user.platform_fee_type == 'PERCENT':
-                        platform_fee = (total_price * tapnex_user.platform_fee) / 100
-                    else:  # FIXED
-                        platform_fee = tapnex_user.platform_fee
-                else:
-                    platform_fee = Decimal('0.00')
-            except:
-                platform_fee = Decimal('0.00')
+            platform_fee = BookingService.calculate_platform_fee(total_price)
             
             # Calculate final total with platform fee
             final_total = total_price + platform_fee
@@ -363,9 +350,9 @@ class BookingService:
                 status='PENDING'
             )
             
-            # Broadcast real-time update
-            from .realtime_service import RealTimeService
-            RealTimeService.broadcast_availability_update(game_slot.id)
+            # Broadcast real-time update once the booking commits
+            from .availability_broadcast import queue_availability_broadcast
+            queue_availability_broadcast(game_slot.id)
             
             return booking
     
@@ -381,26 +368,8 @@ class BookingService:
             if booking.status in ['CANCELLED', 'COMPLETED']:
                 raise ValidationError("Booking cannot be cancelled")
             
-            # Update availability - ONLY if booking was CONFIRMED/IN_PROGRESS
-            # PENDING bookings don't affect booked_spots (they're tracked via get_reserved_spots_count)
-            if booking.status in ['CONFIRMED', 'IN_PROGRESS']:
-                try:
-                    availability = SlotAvailability.objects.select_for_update().get(
-                        game_slot=booking.game_slot
-                    )
-                    
-                    if booking.booking_type == 'PRIVATE':
-                        availability.is_private_booked = False
-                        availability.booked_spots = 0
-                    else:  # SHARED
-                        availability.booked_spots = max(0, availability.booked_spots - booking.spots_booked)
-                    
-                    availability.save()
-                    
-                except SlotAvailability.DoesNotExist:
-                    pass  # Availability doesn't exist, nothing to update
-            
-            # Update booking status
+            # Update booking status - Booking.save() releases booked spots (CONFIRMED/IN_PROGRESS)
+            # or reserved spots (PENDING) via update_slot_availability
             old_status = booking.status
             booking.status = 'CANCELLED'
             booking.save()
@@ -426,8 +395,8 @@ class BookingService:
                 # Don't fail the cancellation if notification fails
             
             # Broadcast real-time update
-            from .realtime_service import RealTimeService
-            RealTimeService.broadcast_availability_update(booking.game_slot.id)
+            from .availability_broadcast import queue_availability_broadcast
+            queue_availability_broadcast(booking.game_slot_id)
     
     @staticmethod
     def confirm_booking_payment(booking, payment_id=None, razorpay_payment_id=None, razorpay_order_id=None):
@@ -471,7 +440,7 @@ class BookingService:
             
             # Send confirmation notification
             from .notifications import NotificationService
-            NotificationService.send_booking_confirmation(booking)
+            NotificationService.send_booking_confirmation_email(booking)
     
     @staticmethod
     def get_available_slots(game, date_from=None, date_to=None):
@@ -526,6 +495,151 @@ class BookingService:
         
         return available_slots
     
+    @staticmethod
+    def calculate_platform_fee(total_price):
+        """
+        Platform fee for a booking subtotal from TapNex superuser settings
+        
+        Args:
+            total_price: Booking subtotal (Decimal)
+            
+        Returns:
+            Decimal: Platform fee (0.00 if not configured)
+        """
+        from authentication.platform_settings import get_platform_settings
+        return get_platform_settings().calculate_platform_fee(total_price)
+    
+    @staticmethod
+    def _shared_capacity_error(truly_available, reserved_spots):
+        """ValidationError explaining why a shared request doesn't fit the slot"""
+        if truly_available > 0:
+            if reserved_spots > 0:
+                return ValidationError(
+                    f"Only {truly_available} spot(s) available now. "
+                    f"{reserved_spots} spot(s) are reserved by users completing payment. "
+                    f"Please select {truly_available} or fewer spots, or wait a few minutes."
+                )
+            return ValidationError(
+                f"Only {truly_available} spot(s) available now. "
+                f"Another user just booked some spots. "
+                f"Please select {truly_available} or fewer spots."
+            )
+        if reserved_spots > 0:
+            return ValidationError(
+                f"All spots are currently reserved by users completing payment. "
+                f"Please wait a few minutes or select a different time slot."
+            )
+        return ValidationError(
+            "This time slot just became fully booked by another user. "
+            "Please select a different time slot."
+        )
+    
+    @staticmethod
+    def create_shared_booking_optimistic(customer, game_slot, spots_requested):
+        """
+        Create a SHARED booking without holding a row lock (SHARED_BOOKING_MODE = 'optimistic')
+        
+        Claims spots with a conditional UPDATE that only succeeds if the
+        spots still fit, so concurrent requests that all fit succeed together:
+        
+            UPDATE slotavailability SET reserved_spots = reserved_spots + n, version = version + 1
+            WHERE id = ? AND NOT is_private_booked
+              AND reserved_spots + booked_spots + n <= total_capacity
+        
+        The request is validated like the locking path (booking type lock,
+        conflict check, lapsed reservations released) before the write; the
+        fee lookup also runs outside the claim.
+        
+        Args:
+            customer: Customer instance
+            game_slot: GameSlot instance
+            spots_requested: Number of spots to book
+            
+        Returns:
+            Booking instance, or None if every retry lost a race for the last spots
+            
+        Raises:
+            ValidationError: If the booking cannot fit
+        """
+        import random
+        import time
+        from django.conf import settings
+        from django.db.models import F
+        
+        max_retries = getattr(settings, 'OPTIMISTIC_BOOKING_RETRIES', 5)
+        game = game_slot.game
+        
+        if game_slot.start_datetime <= timezone.now():
+            raise ValidationError("Cannot book slots in the past")
+        if game.booking_type != 'HYBRID':
+            raise ValidationError("This game does not support shared bookings")
+        if spots_requested < 1:
+            raise ValidationError("Must book at least 1 spot")
+        
+        # Same checks as create_booking's locking path, so both modes accept the same requests
+        BookingService.validate_booking_type_lock(game_slot, 'SHARED')
+        BookingService.handle_booking_conflict(game_slot, 'SHARED', spots_requested)
+        
+        # Release lapsed reservations so they don't hold spots the claim below needs
+        expire_reservations_bulk(Booking.objects.filter(game_slot=game_slot))
+        
+        price_per_spot = game.shared_price
+        total_price = price_per_spot * spots_requested
+        platform_fee = BookingService.calculate_platform_fee(total_price)
+        
+        availability, _ = SlotAvailability.objects.get_or_create(
+            game_slot=game_slot,
+            defaults={'total_capacity': game.capacity}
+        )
+        
+        for attempt in range(max_retries):
+            if attempt:
+                availability.refresh_from_db()
+            
+            if availability.is_private_booked:
+                raise ValidationError(
+                    "Cannot book shared - slot is privately booked. "
+                    "The entire slot is reserved for a private group."
+                )
+            
+            truly_available = availability.get_truly_available_spots()
+            if spots_requested > truly_available:
+                raise BookingService._shared_capacity_error(truly_available, availability.reserved_spots)
+            
+            with transaction.atomic():
+                # The capacity condition alone keeps the slot from being oversold
+                claimed = SlotAvailability.objects.filter(
+                    pk=availability.pk,
+                    is_private_booked=False,
+                    total_capacity__gte=F('reserved_spots') + F('booked_spots') + spots_requested
+                ).update(
+                    reserved_spots=F('reserved_spots') + spots_requested,
+                    version=F('version') + 1
+                )
+                
+                if claimed:
+                    booking = Booking(
+                        customer=customer,
+                        game=game,
+                        game_slot=game_slot,
+                        booking_type='SHARED',
+                        spots_booked=spots_requested,
+                        price_per_spot=price_per_spot,
+                        subtotal=total_price,
+                        platform_fee=platform_fee,
+                        total_amount=total_price + platform_fee,
+                        status='PENDING'
+                    )
+                    # Spots were claimed above; Booking.save must not count them again
+                    booking._reservation_claimed = True
+                    booking.save()
+                    return booking
+            
+            # Concurrent bookings took the spots; back off briefly and re-check
+            time.sleep(random.uniform(0, 0.01 * (attempt + 1)))
+        
+        return None
+    
     @staticmethod
     def handle_booking_conflict(game_slot, booking_type, spots_requested):
         """
@@ -538,6 +652,7 @@ class BookingService:
             
         Returns:
             True if booking can proceed, raises ValidationError otherwise
+            (availability is unchanged then, so nothing is broadcast)
         """
         try:
             with transaction.atomic():
@@ -564,11 +679,6 @@ class BookingService:
                 total_capacity=game_slot.game.capacity
             )
             return True
-        except ValidationError as e:
-            # Broadcast updated availability to all clients
-            from .realtime_service import RealTimeService
-            RealTimeService.broadcast_availability_update(game_slot.id)
-            raise e
     
     @staticmethod
     def validate_booking_type_lock(game_slot, booking_type):
@@ -618,21 +728,27 @@ class BookingService:
         reserved_spots = availability.get_reserved_spots_count()
         truly_available = availability.get_truly_available_spots()
         
-        # Check if there are any pending private bookings (use prefetched data)
-        has_pending_private = any(
-            b.status == 'PENDING' and 
-            b.booking_type == 'PRIVATE' and 
-            b.reservation_expires_at > timezone.now()
-            for b in game_slot.bookings.all()
-        )
-        
-        # Check if there are any pending shared bookings (use prefetched data)
-        has_pending_shared = any(
-            b.status == 'PENDING' and 
-            b.booking_type == 'SHARED' and 
-            b.reservation_expires_at > timezone.now()
-            for b in game_slot.bookings.all()
-        )
+        pending_private_count = getattr(game_slot, 'pending_private_count', None)
+        if pending_private_count is not None:
+            # Counts annotated by GameSlot.objects.with_reservation_summary()
+            has_pending_private = pending_private_count > 0
+            has_pending_shared = game_slot.pending_shared_count > 0
+        else:
+            # Check if there are any pending private bookings (use prefetched data)
+            has_pending_private = any(
+                b.status == 'PENDING' and 
+                b.booking_type == 'PRIVATE' and 
+                b.reservation_expires_at > timezone.now()
+                for b in game_slot.bookings.all()
+            )
+            
+            # Check if there are any pending shared bookings (use prefetched data)
+            has_pending_shared = any(
+                b.status == 'PENDING' and 
+                b.booking_type == 'SHARED' and 
+                b.reservation_expires_at > timezone.now()
+                for b in game_slot.bookings.all()
+            )
         
         # Private booking is blocked if there are any pending private OR shared bookings
         can_book_private = availability.can_book_private and not has_pending_private and not has_pending_shared
@@ -692,8 +808,7 @@ class BookingService:
         try:
             availability = SlotAvailability.objects.get(game_slot=game_slot)
             
-            # Expire old pending reservations first
-            BookingService.expire_old_reservations(game_slot)
+            # Lapsed reservations are released by the sweep_reservations worker
             
             # Get pending reservations count
             reserved_spots = availability.get_reserved_spots_count()
@@ -778,15 +893,127 @@ class BookingService:
     @staticmethod
     def expire_old_reservations(game_slot):
         """Expire old pending reservations for a slot"""
-        from django.utils import timezone
+        return expire_reservations_bulk(game_slot.bookings.all())
+
+RESERVATION_SWEEP_BATCH_SIZE = 500
+
+
+def _expire_reservations(bookings_queryset, now):
+    """
+    Expire lapsed PENDING reservations and release their reserved spots
+    
+    Returns:
+        tuple: (number of bookings expired, set of affected game_slot ids)
+    """
+    from collections import Counter
+    from django.db.models import F
+    from django.db.models.functions import Greatest
+    
+    with transaction.atomic():
+        due = list(
+            bookings_queryset.filter(
+                status='PENDING',
+                reservation_expires_at__lte=now
+            ).select_for_update(of=('self',)).values_list(
+                'id', 'game_slot_id', 'spots_booked', 'game_slot__game_id', 'game_slot__date'
+            )
+        )
         
-        expired_bookings = game_slot.bookings.filter(
-            status='PENDING',
-            reservation_expires_at__lte=timezone.now()
+        if not due:
+            return 0, set()
+        
+        expired_count = Booking.objects.filter(
+            id__in=[row[0] for row in due],
+            status='PENDING'
+        ).update(status='EXPIRED', is_reservation_expired=True)
+        
+        released = Counter()
+        for _, game_slot_id, spots_booked, _, _ in due:
+            if game_slot_id:
+                released[game_slot_id] += spots_booked or 0
+        
+        for game_slot_id, spots in released.items():
+            SlotAvailability.objects.filter(game_slot_id=game_slot_id).update(
+                reserved_spots=Greatest(F('reserved_spots') - spots, 0),
+                version=F('version') + 1
+            )
+        
+        invalidate_availability_many(
+            (game_id, slot_date) for _, game_slot_id, _, game_id, slot_date in due if game_slot_id
         )
+    
+    return expired_count, set(released)
+
+
+def _broadcast_slots(game_slot_ids):
+    """Send one availability broadcast per slot (batched, after commit)"""
+    from .availability_broadcast import queue_availability_broadcasts
+    
+    queue_availability_broadcasts(game_slot_ids)
+
+
+def expire_reservations_bulk(bookings_queryset, now=None):
+    """
+    Expire lapsed PENDING reservations in bulk and release their reserved spots
+    
+    Issues one UPDATE for the bookings and one counter UPDATE per affected slot,
+    instead of a save() per booking, then broadcasts each affected slot once.
+    
+    Args:
+        bookings_queryset: QuerySet of bookings to consider
+        now: Reference time (defaults to timezone.now())
         
-        for booking in expired_bookings:
-            booking.check_and_expire_reservation()
+    Returns:
+        int: Number of bookings expired
+    """
+    expired_count, affected_slots = _expire_reservations(bookings_queryset, now or timezone.now())
+    _broadcast_slots(affected_slots)
+    return expired_count
+
+
+def sweep_expired_reservations(batch_size=RESERVATION_SWEEP_BATCH_SIZE, now=None):
+    """
+    Expire every lapsed reservation in the system, in batches
+    
+    Walks PENDING bookings in reservation_expires_at order (served by
+    booking_status_expires_idx), one transaction per batch, and broadcasts
+    each affected slot once at the end.
+    
+    Args:
+        batch_size: Bookings expired per transaction
+        now: Reference time (defaults to timezone.now())
+        
+    Returns:
+        dict: {'expired': int, 'batches': int, 'slots': int}
+    """
+    now = now or timezone.now()
+    summary = {'expired': 0, 'batches': 0, 'slots': 0}
+    affected_slots = set()
+    
+    while True:
+        batch_ids = list(
+            Booking.objects.filter(
+                status='PENDING',
+                reservation_expires_at__lte=now
+            ).order_by('reservation_expires_at').values_list('id', flat=True)[:batch_size]
+        )
+        
+        if not batch_ids:
+            break
+        
+        expired_count, slots = _expire_reservations(Booking.objects.filter(id__in=batch_ids), now)
+        summary['expired'] += expired_count
+        summary['batches'] += 1
+        affected_slots |= slots
+        
+        if len(batch_ids) < batch_size:
+            break
+    
+    summary['slots'] = len(affected_slots)
+    _broadcast_slots(affected_slots)
+    
+    return summary
+
 
 def auto_update_booking_status(booking):
     """
@@ -848,12 +1075,170 @@ def auto_update_booking_status(booking):
     return status_changed, old_status, booking.status
 
 
-def auto_update_bookings_status(bookings_queryset=None):
+# Time-driven transitions applied by auto_update_bookings_status, in order:
+# (summary key, from status, to status, condition builder name)
+STATUS_TRANSITIONS = [
+    ('expired', 'PENDING', 'EXPIRED', 'reservation_lapsed'),
+    ('completed', 'IN_PROGRESS', 'COMPLETED', 'ended_verified'),
+    ('no_show', 'IN_PROGRESS', 'NO_SHOW', 'ended_unverified'),
+    ('no_show', 'CONFIRMED', 'NO_SHOW', 'ended_unverified'),
+    ('started', 'CONFIRMED', 'IN_PROGRESS', 'running'),
+]
+
+STATUS_TRANSITION_BATCH_SIZE = 500
+
+
+def _status_transition_conditions(now):
+    """
+    Build the time conditions for STATUS_TRANSITIONS as database filters
+    
+    Slot times are stored as local date + time, so they are compared against the
+    local wall clock; legacy bookings without a slot use their own datetimes.
+    """
+    from django.db.models import Q
+    
+    local_now = timezone.localtime(now)
+    today = local_now.date()
+    now_time = local_now.time()
+    
+    started = (
+        Q(game_slot__date__lt=today) |
+        Q(game_slot__date=today, game_slot__start_time__lte=now_time) |
+        Q(game_slot__isnull=True, start_time__lte=now, end_time__isnull=False)
+    )
+    ended = (
+        Q(game_slot__date__lt=today) |
+        Q(game_slot__date=today, game_slot__end_time__lte=now_time) |
+        Q(game_slot__isnull=True, start_time__isnull=False, end_time__lte=now)
+    )
+    not_ended = (
+        Q(game_slot__date__gt=today) |
+        Q(game_slot__date=today, game_slot__end_time__gt=now_time) |
+        Q(game_slot__isnull=True, end_time__gt=now)
+    )
+    
+    return {
+        'reservation_lapsed': Q(reservation_expires_at__lte=now, is_reservation_expired=False),
+        'ended_verified': ended & Q(is_verified=True),
+        'ended_unverified': ended & Q(is_verified=False),
+        'running': started & not_ended,
+    }
+
+
+def _apply_status_transition(bookings_queryset, from_status, to_status, condition):
+    """
+    Move every matching booking from one status to another with set-based queries
+    
+    Locks the candidate rows, updates them with one UPDATE per batch, records
+    BookingHistory with bulk_create and applies the resulting availability
+    changes once per slot.
+    
+    Returns:
+        tuple: (number of bookings moved, set of affected game_slot ids)
     """
-    Helper function to automatically update multiple bookings' statuses.
+    from collections import defaultdict
+    from django.db.models import F
+    from django.db.models.functions import Greatest
+    from .models import BookingHistory
+    
+    with transaction.atomic():
+        rows = list(
+            bookings_queryset.filter(condition, status=from_status)
+            .select_for_update(of=('self',))
+            .values_list('id', 'game_slot_id', 'booking_type', 'spots_booked', 'game_slot__game_id', 'game_slot__date')
+        )
+        
+        if not rows:
+            return 0, set()
+        
+        update_fields = {'status': to_status}
+        if to_status == 'EXPIRED':
+            update_fields['is_reservation_expired'] = True
+        
+        moved = 0
+        for offset in range(0, len(rows), STATUS_TRANSITION_BATCH_SIZE):
+            batch_ids = [row[0] for row in rows[offset:offset + STATUS_TRANSITION_BATCH_SIZE]]
+            moved += Booking.objects.filter(id__in=batch_ids, status=from_status).update(**update_fields)
+        
+        BookingHistory.objects.bulk_create(
+            [
+                BookingHistory(
+                    booking_id=booking_id,
+                    previous_status=from_status,
+                    new_status=to_status,
+                    reason="Status changed automatically"
+                )
+                for booking_id, _, _, _, _, _ in rows
+            ],
+            batch_size=STATUS_TRANSITION_BATCH_SIZE
+        )
+        
+        # Aggregate the availability effect per slot (mirrors Booking._apply_availability_change)
+        released_reserved = defaultdict(int)
+        released_booked = defaultdict(int)
+        released_private = set()
+        
+        changed_days = set()
+        changed_slots = set()
+        for _, game_slot_id, booking_type, spots_booked, game_id, slot_date in rows:
+            if not game_slot_id:
+                continue
+            changed_days.add((game_id, slot_date))
+            changed_slots.add(game_slot_id)
+            if from_status == 'PENDING':
+                released_reserved[game_slot_id] += spots_booked or 0
+            elif to_status == 'NO_SHOW':
+                if booking_type == 'PRIVATE':
+                    released_private.add(game_slot_id)
+                else:
+                    released_booked[game_slot_id] += spots_booked or 0
+        
+        for game_slot_id, spots in released_reserved.items():
+            SlotAvailability.objects.filter(game_slot_id=game_slot_id).update(
+                reserved_spots=Greatest(F('reserved_spots') - spots, 0),
+                version=F('version') + 1
+            )
+        
+        for game_slot_id, spots in released_booked.items():
+            SlotAvailability.objects.filter(game_slot_id=game_slot_id).update(
+                booked_spots=Greatest(F('booked_spots') - spots, 0),
+                version=F('version') + 1
+            )
+        
+        if released_private:
+            SlotAvailability.objects.filter(game_slot_id__in=released_private).update(
+                is_private_booked=False,
+                booked_spots=0,
+                version=F('version') + 1
+            )
+        
+        affected_slots = set(released_reserved) | set(released_booked) | released_private
+        
+        # Statuses are part of the slot payloads, so bump the version (ETag) of
+        # slots whose counters didn't change too
+        unchanged_slots = changed_slots - affected_slots
+        if unchanged_slots:
+            SlotAvailability.objects.filter(game_slot_id__in=unchanged_slots).update(
+                version=F('version') + 1
+            )
+        
+        # Status appears in cached slot payloads (pending reservations), so every changed day is stale
+        invalidate_availability_many(changed_days)
+    
+    return moved, affected_slots
+
+
+def auto_update_bookings_status(bookings_queryset=None, now=None):
+    """
+    Automatically update multiple bookings' statuses with set-based queries.
+    
+    Applies STATUS_TRANSITIONS with one UPDATE per transition instead of a
+    save() per booking, so signals do not fire; history rows, availability
+    changes and one availability broadcast per affected slot are handled here.
     
     Args:
         bookings_queryset: QuerySet of bookings to update. If None, updates all active bookings.
+        now: Reference time (defaults to timezone.now())
         
     Returns:
         dict: Summary of status changes
@@ -862,32 +1247,29 @@ def auto_update_bookings_status(bookings_queryset=None):
         # Default: check all bookings that might need status updates
         bookings_queryset = Booking.objects.filter(
             status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
-        ).select_related('game_slot')
+        )
+    
+    now = now or timezone.now()
+    conditions = _status_transition_conditions(now)
     
     summary = {
         'expired': 0,
         'started': 0,
         'completed': 0,
         'no_show': 0,
-        'total_checked': 0,
+        'total_checked': bookings_queryset.count(),
         'total_updated': 0
     }
     
-    for booking in bookings_queryset:
-        summary['total_checked'] += 1
-        status_changed, old_status, new_status = auto_update_booking_status(booking)
-        
-        if status_changed:
-            summary['total_updated'] += 1
-            
-            # Track specific transitions
-            if new_status == 'EXPIRED':
-                summary['expired'] += 1
-            elif new_status == 'IN_PROGRESS':
-                summary['started'] += 1
-            elif new_status == 'COMPLETED':
-                summary['completed'] += 1
-            elif new_status == 'NO_SHOW':
-                summary['no_show'] += 1
+    affected_slots = set()
+    for summary_key, from_status, to_status, condition_name in STATUS_TRANSITIONS:
+        moved, slots = _apply_status_transition(
+            bookings_queryset, from_status, to_status, conditions[condition_name]
+        )
+        summary[summary_key] += moved
+        summary['total_updated'] += moved
+        affected_slots |= slots
+    
+    _broadcast_slots(affected_slots)
     
     return summary
@@ -0,0 +1,94 @@
+"""
+Shared cache helpers
+Namespaced, versioned keys on top of Django's configured cache (see CACHES in
+settings), so slot generation, availability APIs and dashboards use one
+key scheme across all workers.
+
+A namespace keeps a version counter per scope (e.g. a (game, date) pair).
+Invalidating a scope bumps its counter, which orphans every entry written
+under the old version; nothing has to be deleted.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+VERSION_TTL = 60 * 60 * 24 * 2  # Version counters outlive any entry that uses them
+
+
+class CacheNamespace:
+    """A group of cache entries sharing a key prefix and per-scope versions"""
+    
+    def __init__(self, name, timeout=None):
+        """
+        Args:
+            name: Key prefix for this namespace (e.g. 'availability')
+            timeout: Default entry TTL in seconds (None uses the CACHES default)
+        """
+        self.name = name
+        self.timeout = timeout
+    
+    def key(self, *parts):
+        """Plain (unversioned) key within this namespace"""
+        return ':'.join([self.name, *(str(part) for part in parts)])
+    
+    def _version_key(self, scope):
+        return self.key('version', *scope)
+    
+    def _entry_key(self, scope, version):
+        return self.key(*scope, f'v{version}')
+    
+    def get_versions(self, scopes):
+        """
+        Current version of each scope (0 if never invalidated)
+        
+        Read versions BEFORE loading the data you are about to cache, so a write
+        landing in between leaves your entry under an already-stale version.
+        """
+        version_keys = {scope: self._version_key(scope) for scope in scopes}
+        stored = cache.get_many(version_keys.values())
+        return {scope: stored.get(key, 0) for scope, key in version_keys.items()}
+    
+    def get_many(self, scopes):
+        """
+        Look up current entries for several scopes
+        
+        Args:
+            scopes: Iterable of tuples identifying entries
+        
+        Returns:
+            tuple: ({scope: value} for hits, {scope: version} to pass to set_many)
+        """
+        versions = self.get_versions(scopes)
+        entry_keys = {scope: self._entry_key(scope, version) for scope, version in versions.items()}
+        stored = cache.get_many(entry_keys.values())
+        hits = {scope: stored[key] for scope, key in entry_keys.items() if key in stored}
+        return hits, versions
+    
+    def set_many(self, values, versions, timeout=None):
+        """Store {scope: value} under the versions returned by get_many"""
+        cache.set_many(
+            {self._entry_key(scope, versions[scope]): value for scope, value in values.items()},
+            timeout if timeout is not None else self.timeout
+        )
+    
+    def get(self, *scope, default=None):
+        """Current entry for one scope"""
+        hits, _ = self.get_many([scope])
+        return hits.get(scope, default)
+    
+    def invalidate(self, *scope):
+        """
+        Orphan the current entry for a scope
+        
+        Deferred until the surrounding transaction commits, so a concurrent reader
+        can't cache the new version from uncommitted data.
+        """
+        def bump():
+            key = self._version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # No version yet (or evicted): any fresh value orphans old entries
+                cache.set(key, int(timezone.now().timestamp() * 1000), VERSION_TTL)
+        
+        transaction.on_commit(bump)
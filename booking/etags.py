@@ -0,0 +1,50 @@
+"""
+Conditional GET helpers for the slot availability APIs
+The booking page polls these endpoints constantly. Each response carries an
+ETag built from cheap version tokens (availability versions, snapshot digests,
+updated_at), so an unchanged poll is answered with an empty 304.
+
+Responses use 'no-cache' rather than 'no-store': the browser keeps the body
+but must revalidate it on every request, so freshness is still guaranteed.
+"""
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response, quote_etag
+
+REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from version tokens
+    
+    Args:
+        *parts: JSON-serializable values (dates, datetimes and UUIDs are stringified)
+    
+    Returns:
+        str: Quoted ETag
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return quote_etag(hashlib.md5(payload, usedforsecurity=False).hexdigest())
+
+
+def not_modified(request, etag):
+    """
+    Answer a conditional request without building the payload
+    
+    Returns:
+        HttpResponse: 304 (or 412 for a failed If-Match) if the client's copy
+                      is current, otherwise None
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return with_etag(response, etag)
+    return None
+
+
+def with_etag(response, etag):
+    """Attach the ETag and the revalidation headers to a response"""
+    response['ETag'] = etag
+    response['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    return response
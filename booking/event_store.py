@@ -0,0 +1,142 @@
+"""
+Realtime event store
+Bounded, append-only log of realtime events in the RealtimeEvent table, shared
+by every worker. Replaces the per-process list SupabaseRealTimeClient used to
+keep, so conflict resolution and the availability stream see the same events
+whichever worker published them.
+
+- Append: one INSERT, written when the publishing transaction commits
+- Read: by sequence number (id), optionally filtered by type or game
+- Retention: rows older than REALTIME_EVENT_RETENTION seconds are pruned
+  (python manage.py prune_realtime_events)
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EVENT_RETENTION = getattr(settings, 'REALTIME_EVENT_RETENTION', 3600)  # Seconds
+READ_BATCH_SIZE = 500
+
+EVENT_FIELDS = ('id', 'event_type', 'game_id', 'key', 'data', 'created_at')
+
+
+def append_event(event_type, data, game_id=None, key=''):
+    """
+    Append an event once the current transaction commits
+    
+    Events from rolled-back transactions are never written, and readers
+    never see an event before the change it describes.
+    
+    Args:
+        event_type: Event type (e.g. 'availability_update')
+        data: JSON-serializable payload (Decimals and datetimes are allowed)
+        game_id: Game the event belongs to, if any
+        key: Id of the slot, game or booking the event is about
+    """
+    from .models import RealtimeEvent
+    
+    def write():
+        try:
+            RealtimeEvent.objects.create(
+                event_type=event_type,
+                game_id=game_id,
+                key=str(key),
+                data=data
+            )
+        except Exception as e:
+            logger.error(f"Failed to store {event_type} event for {key}: {e}")
+    
+    transaction.on_commit(write)
+
+
+def events_queryset(after=0, event_type=None, game_id=None):
+    """Events with a sequence number above `after`, oldest first, as EVENT_FIELDS dicts"""
+    from .models import RealtimeEvent
+    
+    events = RealtimeEvent.objects.filter(id__gt=after)
+    if event_type:
+        events = events.filter(event_type=event_type)
+    if game_id:
+        events = events.filter(game_id=game_id)
+    return events.order_by('id').values(*EVENT_FIELDS)
+
+
+def read_events(after=0, event_type=None, game_id=None, limit=READ_BATCH_SIZE):
+    """
+    Read a range of events by sequence number
+    
+    Args:
+        after: Return events with a sequence number above this
+        event_type: Only this type
+        game_id: Only this game's events
+        limit: Maximum number of events
+    
+    Returns:
+        list: Event dicts (see as_event), oldest first
+    """
+    return [as_event(row) for row in events_queryset(after, event_type, game_id)[:limit]]
+
+
+def recent_events(event_type=None, limit=50):
+    """
+    The newest events
+    
+    Returns:
+        list: Event dicts, oldest first
+    """
+    from .models import RealtimeEvent
+    
+    events = RealtimeEvent.objects.all()
+    if event_type:
+        events = events.filter(event_type=event_type)
+    rows = list(events.order_by('-id').values(*EVENT_FIELDS)[:limit])
+    return [as_event(row) for row in reversed(rows)]
+
+
+def last_sequence():
+    """Sequence number of the newest stored event (0 if empty)"""
+    from .models import RealtimeEvent
+    
+    return RealtimeEvent.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def oldest_sequence():
+    """Sequence number of the oldest retained event, or None if empty"""
+    from .models import RealtimeEvent
+    
+    return RealtimeEvent.objects.aggregate(oldest=Min('id'))['oldest']
+
+
+def prune_events(retention_seconds=EVENT_RETENTION):
+    """
+    Delete events older than the retention window
+    
+    Returns:
+        int: Number of events deleted
+    """
+    from .models import RealtimeEvent
+    
+    cutoff = timezone.now() - timedelta(seconds=retention_seconds)
+    deleted, _ = RealtimeEvent.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def as_event(row):
+    """Event dict in the shape SupabaseRealTimeClient has always published"""
+    event = {
+        'sequence': row['id'],
+        'type': row['event_type'],
+        'data': row['data'],
+        'timestamp': row['created_at'].isoformat(),
+    }
+    if row['event_type'] == 'availability_update':
+        event['game_slot_id'] = row['key']
+    elif row['event_type'] == 'game_update':
+        event['game_id'] = row['key']
+    return event
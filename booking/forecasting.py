@@ -0,0 +1,322 @@
+"""
+Demand forecasting
+Predicts how full each upcoming slot will be from the game's own history.
+
+- Fit: for every game x weekday x hour cell, the daily fill rate (booked over
+  offered seat-minutes, from the occupancy engine in booking/occupancy.py) is
+  smoothed with an exponentially weighted moving average, oldest day first,
+  so recent weeks count more than older ones
+- Predict: an upcoming slot gets its cell's smoothed rate; cells without
+  history fall back to the game's rate for that hour, then the game's overall rate
+- Use: schedule optimization suggestions (expected sellouts / quiet slots)
+  and the slot generation horizon (busier games get slots further ahead)
+- Backtest: backtest() replays past weeks, fitting only on what was known
+  before each week (python manage.py backtest_forecast)
+
+Fitting is one pass over array columns and takes a few milliseconds per game.
+
+Usage:
+    forecast = fit_forecast([game.id])
+    forecast.predict(game.id, slot.date.weekday(), slot.start_time.hour)
+"""
+import math
+import time as time_module
+from array import array
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .occupancy import CELLS_PER_GAME, HOURS, OccupancyFrame
+
+# Weight of the newest observation (each cell sees one observation per week)
+DEFAULT_ALPHA = 0.3
+
+# History used for fitting: twelve observations per weekday/hour cell
+HISTORY_DAYS = 84
+
+# (expected fill at least, days of slots to keep ahead), busiest first
+HORIZON_STEPS = (
+    (0.6, 28),
+    (0.3, 14),
+)
+
+# Upcoming slots at or above / at or below these fills are called out in suggestions
+HIGH_FILL = 0.85
+LOW_FILL = 0.15
+
+
+class DemandForecast:
+    """
+    Smoothed fill rate per (game, weekday, hour) cell
+    
+    alpha=None fits a plain running mean instead of an EWMA (the backtest baseline).
+    """
+    
+    def __init__(self, game_ids, alpha=DEFAULT_ALPHA):
+        self.game_ids = list(game_ids)
+        self.alpha = alpha
+        self._game_index = {game_id: index for index, game_id in enumerate(self.game_ids)}
+        
+        cells = len(self.game_ids) * CELLS_PER_GAME
+        self.level = array('d', bytes(8 * cells))
+        self.observations = array('I', bytes(array('I').itemsize * cells))
+        self.weight = array('d', bytes(8 * cells))
+    
+    @classmethod
+    def fit(cls, frame, alpha=DEFAULT_ALPHA, since_day=None, until_day=None):
+        """
+        Fit from an OccupancyFrame
+        
+        Args:
+            frame: OccupancyFrame (past slots)
+            alpha: EWMA weight of the newest observation, or None for a running mean
+            since_day: Ignore slots before this frame day
+            until_day: Ignore slots on or after this frame day
+        
+        Returns:
+            DemandForecast
+        """
+        forecast = cls(frame.game_ids, alpha)
+        daily = daily_cells(frame, since_day, until_day)
+        
+        # Keys sort by cell, then day, so each cell is smoothed oldest first
+        for cell, day in sorted(daily):
+            offered, booked = daily[(cell, day)]
+            forecast._observe(cell, booked / offered, offered)
+        
+        return forecast
+    
+    def _observe(self, cell, fill, offered):
+        count = self.observations[cell] + 1
+        if count == 1:
+            self.level[cell] = fill
+        else:
+            weight = self.alpha if self.alpha is not None else 1 / count
+            self.level[cell] += weight * (fill - self.level[cell])
+        self.observations[cell] = count
+        self.weight[cell] += offered
+    
+    def predict(self, game_id, weekday, hour):
+        """
+        Expected fill rate (0..1) for a slot
+        
+        Args:
+            game_id: Game id
+            weekday: 0 (Monday) .. 6 (Sunday)
+            hour: Slot start hour
+        
+        Returns:
+            float: Predicted share of seats booked (0.0 for games without history)
+        """
+        game = self._game_index.get(game_id)
+        if game is None:
+            return 0.0
+        return self._predict_cell((game * 7 + weekday) * HOURS + hour)
+    
+    def _predict_cell(self, cell):
+        if self.observations[cell]:
+            return self.level[cell]
+        
+        game, offset = divmod(cell, CELLS_PER_GAME)
+        base = game * CELLS_PER_GAME
+        
+        # Same hour on other weekdays, then the whole game
+        same_hour = range(base + offset % HOURS, base + CELLS_PER_GAME, HOURS)
+        fill = self._weighted_level(same_hour)
+        if fill is None:
+            fill = self._weighted_level(range(base, base + CELLS_PER_GAME))
+        return fill or 0.0
+    
+    def _weighted_level(self, cells):
+        total = 0.0
+        weight = 0.0
+        for cell in cells:
+            if self.observations[cell]:
+                total += self.level[cell] * self.weight[cell]
+                weight += self.weight[cell]
+        return total / weight if weight else None
+    
+    def expected_fill(self, game_id):
+        """
+        Game-wide expected fill rate (cells weighted by the seats they offered)
+        
+        Returns:
+            float: Expected fill, or None without history
+        """
+        game = self._game_index.get(game_id)
+        if game is None:
+            return None
+        base = game * CELLS_PER_GAME
+        return self._weighted_level(range(base, base + CELLS_PER_GAME))
+    
+    def horizon_days(self, game_id, minimum):
+        """
+        Days of slots to keep generated ahead for a game
+        
+        Args:
+            game_id: Game id
+            minimum: Horizon for games with little or no demand
+        
+        Returns:
+            int: At least `minimum`; longer (HORIZON_STEPS) for busier games
+        """
+        fill = self.expected_fill(game_id) or 0.0
+        for threshold, days in HORIZON_STEPS:
+            if fill >= threshold:
+                return max(days, minimum)
+        return minimum
+
+
+def daily_cells(frame, since_day=None, until_day=None):
+    """
+    Offered and booked seat-minutes per (cell, day)
+    
+    Returns:
+        dict: {(cell, day): (offered, booked)} for cells with offered seats
+    """
+    offered = {}
+    booked = {}
+    for game, day, weekday, hour, minutes, capacity, seats in zip(
+        frame.game, frame.day, frame.weekday, frame.hour, frame.minutes, frame.capacity, frame.booked
+    ):
+        if since_day is not None and day < since_day:
+            continue
+        if until_day is not None and day >= until_day:
+            continue
+        key = ((game * 7 + weekday) * HOURS + hour, day)
+        offered[key] = offered.get(key, 0) + capacity * minutes
+        booked[key] = booked.get(key, 0) + seats * minutes
+    return {key: (offered[key], booked[key]) for key in offered if offered[key]}
+
+
+def fit_forecast(game_ids=None, end_date=None, history_days=HISTORY_DAYS, alpha=DEFAULT_ALPHA):
+    """
+    Fit a forecast from recent history
+    
+    Args:
+        game_ids: Limit to these games (defaults to every active game)
+        end_date: Last day of history (defaults to yesterday; today's slots are still filling)
+        history_days: Days of history to fit on
+        alpha: EWMA weight of the newest observation
+    
+    Returns:
+        DemandForecast
+    """
+    end_date = end_date or timezone.localdate() - timedelta(days=1)
+    start_date = end_date - timedelta(days=history_days - 1)
+    return DemandForecast.fit(OccupancyFrame.load(start_date, end_date, game_ids), alpha)
+
+
+def upcoming_fill(game, forecast, days=7):
+    """
+    Predicted fill for a game's generated slots from today on
+    
+    Args:
+        game: Game instance
+        forecast: DemandForecast including the game
+        days: Days ahead to cover (today included)
+    
+    Returns:
+        list: [{'date', 'start_time', 'fill'}] in slot order
+    """
+    from .models import GameSlot
+    
+    today = timezone.localdate()
+    slots = GameSlot.objects.filter(
+        game=game,
+        date__range=[today, today + timedelta(days=days - 1)],
+        is_active=True
+    ).order_by('date', 'start_time').values_list('date', 'start_time')
+    
+    return [
+        {
+            'date': slot_date,
+            'start_time': start_time,
+            'fill': forecast.predict(game.id, slot_date.weekday(), start_time.hour),
+        }
+        for slot_date, start_time in slots
+    ]
+
+
+def forecast_horizons(minimum, game_ids=None):
+    """
+    Slot generation horizon per game from forecast demand
+    
+    Args:
+        minimum: Horizon for quiet games (AutoSlotGenerator.DAYS_TO_MAINTAIN)
+        game_ids: Limit to these games (defaults to every active game)
+    
+    Returns:
+        dict: {game_id: days}
+    """
+    forecast = fit_forecast(game_ids)
+    return {game_id: forecast.horizon_days(game_id, minimum) for game_id in forecast.game_ids}
+
+
+def backtest(game_ids=None, end_date=None, weeks=4, history_days=HISTORY_DAYS, alphas=(DEFAULT_ALPHA,)):
+    """
+    Replay past weeks: fit on the history before each week, predict the week
+    
+    Every (game, weekday/hour cell, day) with offered seats in a test week is
+    one prediction, scored against its actual fill. The running mean
+    (alpha=None) is always included as the baseline.
+    
+    Args:
+        game_ids: Limit to these games (defaults to every active game)
+        end_date: Last test day (defaults to yesterday)
+        weeks: Number of test weeks, ending on end_date
+        history_days: Days of history each fit sees
+        alphas: EWMA weights to compare
+    
+    Returns:
+        dict: {'start_date', 'end_date', 'games', 'predictions',
+               'models': {label: {'mae', 'rmse', 'bias', 'fit_ms_per_game'}}}
+    """
+    end_date = end_date or timezone.localdate() - timedelta(days=1)
+    test_start = end_date - timedelta(days=weeks * 7 - 1)
+    start_date = test_start - timedelta(days=history_days)
+    frame = OccupancyFrame.load(start_date, end_date, game_ids)
+    
+    # Actual fill per test week, shared by every model
+    test_weeks = []
+    for week in range(weeks):
+        first_day = history_days + week * 7
+        actual = daily_cells(frame, first_day, first_day + 7)
+        test_weeks.append((first_day, actual))
+    
+    models = {}
+    for alpha in (None,) + tuple(alphas):
+        label = 'mean' if alpha is None else f'ewma({alpha})'
+        errors = []
+        fit_seconds = 0.0
+        
+        for first_day, actual in test_weeks:
+            started = time_module.perf_counter()
+            forecast = DemandForecast.fit(frame, alpha, first_day - history_days, first_day)
+            fit_seconds += time_module.perf_counter() - started
+            
+            for (cell, _day), (offered, booked) in actual.items():
+                errors.append(forecast._predict_cell(cell) - booked / offered)
+        
+        models[label] = {
+            **_error_stats(errors),
+            'fit_ms_per_game': (fit_seconds / max(1, weeks * len(frame.game_ids))) * 1000,
+        }
+    
+    return {
+        'start_date': test_start,
+        'end_date': end_date,
+        'games': len(frame.game_ids),
+        'predictions': sum(len(actual) for _, actual in test_weeks),
+        'models': models,
+    }
+
+
+def _error_stats(errors):
+    if not errors:
+        return {'mae': 0.0, 'rmse': 0.0, 'bias': 0.0}
+    return {
+        'mae': sum(abs(error) for error in errors) / len(errors),
+        'rmse': math.sqrt(sum(error * error for error in errors) / len(errors)),
+        'bias': sum(errors) / len(errors),
+    }
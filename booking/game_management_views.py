@@ -10,23 +10,37 @@ from django.core.exceptions import ValidationError
 from datetime import datetime, timedelta, date
 from authentication.decorators import cafe_owner_required
 from .models import Game, GameSlot, SlotAvailability, Booking
+from .analytics import (
+    booking_summary, daily_breakdown, game_bookings, hourly_breakdown, weekday_breakdown, weekly_breakdown,
+)
+from .auto_slot_generator import AutoSlotGenerator
+from .forecasting import HIGH_FILL, LOW_FILL, fit_forecast, upcoming_fill
+from .occupancy import occupancy_report
 from .forms import GameCreationForm, GameUpdateForm, CustomSlotForm, BulkScheduleUpdateForm
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default look-back of the schedule analysis views (?days= overrides, up to MAX_ANALYSIS_DAYS)
+ANALYSIS_DAYS = 30
+MAX_ANALYSIS_DAYS = 365
+
+
+def _analysis_days(request):
+    """Look-back window in days from ?days=, clamped to 1..MAX_ANALYSIS_DAYS"""
+    try:
+        days = int(request.GET.get('days', ANALYSIS_DAYS))
+    except ValueError:
+        return ANALYSIS_DAYS
+    return min(max(days, 1), MAX_ANALYSIS_DAYS)
+
 
 @cafe_owner_required
 def game_management_dashboard(request):
     """Main game management dashboard for cafe owners - REAL-TIME NO CACHE"""
     
-    # Auto-update booking statuses for real-time accuracy
-    from booking.booking_service import auto_update_bookings_status
-    bookings_to_check = Booking.objects.filter(
-        status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
-    ).select_related('game_slot')
-    auto_update_bookings_status(bookings_to_check)
+    # Booking statuses are advanced by the update_booking_statuses worker command
     
     # Get all games with statistics (single query with annotations) - NO CACHE
     games = Game.objects.annotate(
@@ -581,55 +595,29 @@ def game_analytics(request, game_id):
     if date_to:
         end_date = datetime.strptime(date_to, '%Y-%m-%d').date()
     
-    # Get bookings in date range
-    bookings = game.bookings.filter(
-        game_slot__date__range=[start_date, end_date]
-    ).select_related('game_slot')
+    # Get bookings in date range (each breakdown below is one grouped query)
+    bookings = game_bookings(game, start_date, end_date)
     
-    # Calculate statistics
-    total_bookings = bookings.count()
-    confirmed_bookings = bookings.filter(status='CONFIRMED').count()
-    cancelled_bookings = bookings.filter(status='CANCELLED').count()
-    total_revenue = bookings.filter(status='CONFIRMED').aggregate(
-        total=Sum('total_amount')
-    )['total'] or 0
-    
-    # Booking type breakdown (for hybrid games)
-    private_bookings = bookings.filter(booking_type='PRIVATE').count()
-    shared_bookings = bookings.filter(booking_type='SHARED').count()
+    # Calculate statistics, including the booking type breakdown (for hybrid games)
+    summary = booking_summary(bookings)
     
     # Daily statistics
-    daily_stats = []
-    current_date = start_date
-    while current_date <= end_date:
-        day_bookings = bookings.filter(game_slot__date=current_date)
-        day_revenue = day_bookings.filter(status='CONFIRMED').aggregate(
-            total=Sum('total_amount')
-        )['total'] or 0
-        
-        daily_stats.append({
-            'date': current_date,
-            'bookings': day_bookings.count(),
-            'revenue': float(day_revenue),
-            'confirmed': day_bookings.filter(status='CONFIRMED').count()
-        })
-        current_date += timedelta(days=1)
+    daily_stats = daily_breakdown(bookings, start_date, end_date)
     
     # Peak hours analysis
-    hour_stats = {}
-    for booking in bookings.filter(status='CONFIRMED'):
-        hour = booking.game_slot.start_time.hour
-        if hour not in hour_stats:
-            hour_stats[hour] = {'count': 0, 'revenue': 0}
-        hour_stats[hour]['count'] += 1
-        hour_stats[hour]['revenue'] += float(booking.total_amount)
+    hour_stats = hourly_breakdown(bookings.filter(status='CONFIRMED'))
+    
+    # Seat-hour utilization (overall and per start hour) from the occupancy engine
+    occupancy = occupancy_report(start_date, end_date, [game.id])
+    hour_utilization = occupancy.by_hour(game.id)
     
     # Convert to list for template
     peak_hours = [
         {
             'hour': f"{hour:02d}:00",
             'count': stats['count'],
-            'revenue': stats['revenue']
+            'revenue': stats['revenue'],
+            'utilization': hour_utilization.get(hour, {}).get('utilization', 0) * 100
         }
         for hour, stats in sorted(hour_stats.items())
     ]
@@ -638,14 +626,15 @@ def game_analytics(request, game_id):
         'game': game,
         'start_date': start_date,
         'end_date': end_date,
-        'total_bookings': total_bookings,
-        'confirmed_bookings': confirmed_bookings,
-        'cancelled_bookings': cancelled_bookings,
-        'total_revenue': total_revenue,
-        'private_bookings': private_bookings,
-        'shared_bookings': shared_bookings,
+        'total_bookings': summary['total'],
+        'confirmed_bookings': summary['confirmed'],
+        'cancelled_bookings': summary['cancelled'],
+        'total_revenue': summary['confirmed_revenue'],
+        'private_bookings': summary['private'],
+        'shared_bookings': summary['shared'],
         'daily_stats': daily_stats,
         'peak_hours': peak_hours,
+        'utilization_rate': occupancy.overall()['utilization'] * 100,
         'date_range_days': (end_date - start_date).days + 1,
     }
     
@@ -964,32 +953,16 @@ def schedule_optimization_suggestions(request, game_id):
             from datetime import datetime, timedelta
             from django.db.models import Count, Avg, Sum
             
-            # Get last 30 days of data
+            # Get the last 30 days of data (or ?days=)
+            analysis_days = _analysis_days(request)
             end_date = timezone.now().date()
-            start_date = end_date - timedelta(days=30)
+            start_date = end_date - timedelta(days=analysis_days)
             
-            # Analyze booking patterns by hour
-            hourly_bookings = {}
-            bookings = game.bookings.filter(
-                game_slot__date__range=[start_date, end_date],
-                status='CONFIRMED'
-            ).select_related('game_slot')
-            
-            for booking in bookings:
-                hour = booking.game_slot.start_time.hour
-                if hour not in hourly_bookings:
-                    hourly_bookings[hour] = {'count': 0, 'revenue': 0}
-                hourly_bookings[hour]['count'] += 1
-                hourly_bookings[hour]['revenue'] += float(booking.total_amount)
-            
-            # Analyze booking patterns by day of week
-            daily_bookings = {}
-            for booking in bookings:
-                day = booking.game_slot.date.strftime('%A').lower()
-                if day not in daily_bookings:
-                    daily_bookings[day] = {'count': 0, 'revenue': 0}
-                daily_bookings[day]['count'] += 1
-                daily_bookings[day]['revenue'] += float(booking.total_amount)
+            # Booking patterns by hour and by day of week (one grouped query each)
+            bookings = game_bookings(game, start_date, end_date, status='CONFIRMED')
+            summary = booking_summary(bookings)
+            hourly_bookings = hourly_breakdown(bookings)
+            daily_bookings = weekday_breakdown(bookings)
             
             # Generate suggestions
             suggestions = []
@@ -1035,12 +1008,45 @@ def schedule_optimization_suggestions(request, game_id):
                         'action': 'Extend operating hours or reduce slot duration on busy days'
                     })
             
+            # Demand forecast for the coming week (EWMA of past fill rates per weekday/hour)
+            forecast = fit_forecast([game.id])
+            upcoming = upcoming_fill(game, forecast, days=7)
+            expected_fill = forecast.expected_fill(game.id)
+            
+            if upcoming and expected_fill is not None:
+                busy_slots = sorted(
+                    (slot for slot in upcoming if slot['fill'] >= HIGH_FILL),
+                    key=lambda slot: slot['fill'], reverse=True
+                )
+                quiet_slots = [slot for slot in upcoming if slot['fill'] <= LOW_FILL]
+                
+                if busy_slots:
+                    busy_list = [
+                        f"{slot['date'].strftime('%a')} {slot['start_time'].strftime('%H:%M')}" for slot in busy_slots[:3]
+                    ]
+                    suggestions.append({
+                        'type': 'forecast_high_demand',
+                        'title': 'Expected Sell-outs This Week',
+                        'description': f'{len(busy_slots)} upcoming slot(s) are expected to be at least {HIGH_FILL:.0%} full (e.g. {", ".join(busy_list)}).',
+                        'impact': 'high',
+                        'action': 'Raise prices or add capacity for these slots before they fill'
+                    })
+                
+                if len(quiet_slots) > len(upcoming) / 2:
+                    suggestions.append({
+                        'type': 'forecast_low_demand',
+                        'title': 'Quiet Week Ahead',
+                        'description': f'{len(quiet_slots)} of {len(upcoming)} upcoming slots are expected to be under {LOW_FILL:.0%} full.',
+                        'impact': 'medium',
+                        'action': 'Run a promotion for the coming week or close the quietest slots'
+                    })
+            
             # Slot duration optimization
             avg_booking_duration = game.slot_duration_minutes
             if game.booking_type == 'HYBRID':
                 # Analyze private vs shared booking patterns
-                private_bookings = bookings.filter(booking_type='PRIVATE').count()
-                shared_bookings = bookings.filter(booking_type='SHARED').count()
+                private_bookings = summary['private']
+                shared_bookings = summary['shared']
                 
                 if private_bookings > shared_bookings * 2:
                     suggestions.append({
@@ -1060,21 +1066,20 @@ def schedule_optimization_suggestions(request, game_id):
                     })
             
             # Revenue optimization
-            total_revenue = sum(booking.total_amount for booking in bookings)
-            total_slots_available = game.slots.filter(
-                date__range=[start_date, end_date],
-                is_active=True
-            ).count()
+            total_revenue = summary['confirmed_revenue']
+            occupancy = occupancy_report(start_date, end_date, [game.id])
+            occupancy_totals = occupancy.overall()
             
             utilization_rate = 0
-            if total_slots_available > 0:
-                utilization_rate = len(bookings) / total_slots_available
+            if occupancy_totals['offered_seat_hours'] > 0:
+                # Booked seat-hours over offered seat-hours (slot durations and capacity included)
+                utilization_rate = occupancy_totals['utilization']
                 
                 if utilization_rate < 0.3:
                     suggestions.append({
                         'type': 'low_utilization',
                         'title': 'Low Slot Utilization',
-                        'description': f'Only {utilization_rate:.1%} of slots are booked. Consider reducing operating hours or adjusting pricing.',
+                        'description': f'Only {utilization_rate:.1%} of seats are booked. Consider reducing operating hours or adjusting pricing.',
                         'impact': 'high',
                         'action': 'Reduce operating hours during low-demand periods or offer promotional pricing'
                     })
@@ -1082,20 +1087,15 @@ def schedule_optimization_suggestions(request, game_id):
                     suggestions.append({
                         'type': 'high_utilization',
                         'title': 'High Demand Detected',
-                        'description': f'{utilization_rate:.1%} of slots are booked. Consider extending hours or increasing prices.',
+                        'description': f'{utilization_rate:.1%} of seats are booked. Consider extending hours or increasing prices.',
                         'impact': 'high',
                         'action': 'Extend operating hours or implement dynamic pricing'
                     })
             
             # Seasonal patterns (if enough data)
-            if len(bookings) > 50:
+            if summary['total'] > 50:
                 # Group by week to identify trends
-                weekly_bookings = {}
-                for booking in bookings:
-                    week = booking.game_slot.date.isocalendar()[1]
-                    if week not in weekly_bookings:
-                        weekly_bookings[week] = 0
-                    weekly_bookings[week] += 1
+                weekly_bookings = weekly_breakdown(bookings)
                 
                 if len(weekly_bookings) >= 4:
                     weeks = list(weekly_bookings.keys())
@@ -1126,15 +1126,30 @@ def schedule_optimization_suggestions(request, game_id):
                 'success': True,
                 'suggestions': suggestions,
                 'analytics': {
-                    'total_bookings': len(bookings),
+                    'total_bookings': summary['total'],
                     'total_revenue': float(total_revenue),
                     'utilization_rate': utilization_rate,
+                    'hourly_utilization': {
+                        hour: round(stats['utilization'], 4) for hour, stats in occupancy.by_hour(game.id).items()
+                    },
                     'peak_hours': dict(peak_hours[:3]) if 'peak_hours' in locals() else {},
+                    'forecast': {
+                        'expected_fill': expected_fill,
+                        'busiest_upcoming': [
+                            {
+                                'date': slot['date'].isoformat(),
+                                'start_time': slot['start_time'].strftime('%H:%M'),
+                                'fill': round(slot['fill'], 4)
+                            }
+                            for slot in sorted(upcoming, key=lambda slot: slot['fill'], reverse=True)[:5]
+                        ],
+                        'horizon_days': forecast.horizon_days(game.id, AutoSlotGenerator.DAYS_TO_MAINTAIN)
+                    },
                     'daily_patterns': daily_bookings,
                     'analysis_period': {
                         'start_date': start_date.isoformat(),
                         'end_date': end_date.isoformat(),
-                        'days': 30
+                        'days': analysis_days
                     }
                 }
             })
@@ -1157,44 +1172,36 @@ def advanced_schedule_management(request, game_id):
     from datetime import datetime, timedelta
     from django.db.models import Count, Sum, Avg
     
-    # Calculate statistics for the last 30 days
+    # Calculate statistics for the last 30 days (or ?days=)
+    analysis_days = _analysis_days(request)
     end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=30)
-    
-    # Booking statistics
-    bookings = game.bookings.filter(
-        game_slot__date__range=[start_date, end_date],
-        status='CONFIRMED'
-    )
+    start_date = end_date - timedelta(days=analysis_days)
     
-    total_bookings = bookings.count()
-    total_revenue = bookings.aggregate(Sum('total_amount'))['total_amount__sum'] or 0
+    # Booking statistics (each breakdown below is one grouped query)
+    bookings = game_bookings(game, start_date, end_date, status='CONFIRMED')
+    summary = booking_summary(bookings)
+    total_bookings = summary['total']
+    total_revenue = summary['confirmed_revenue']
     
-    # Slot utilization
+    # Slot utilization (booked seat-hours over offered seat-hours)
     total_slots = game.slots.filter(
         date__range=[start_date, end_date],
         is_active=True
     ).count()
     
-    utilization_rate = (total_bookings / total_slots * 100) if total_slots > 0 else 0
+    utilization_rate = occupancy_report(start_date, end_date, [game.id]).overall()['utilization'] * 100
     
     # Peak hours analysis
-    hourly_stats = {}
-    for booking in bookings:
-        hour = booking.game_slot.start_time.hour
-        if hour not in hourly_stats:
-            hourly_stats[hour] = {'bookings': 0, 'revenue': 0}
-        hourly_stats[hour]['bookings'] += 1
-        hourly_stats[hour]['revenue'] += float(booking.total_amount)
+    hourly_stats = {
+        hour: {'bookings': stats['count'], 'revenue': stats['revenue']}
+        for hour, stats in hourly_breakdown(bookings).items()
+    }
     
     # Day of week analysis
-    daily_stats = {}
-    for booking in bookings:
-        day = booking.game_slot.date.strftime('%A')
-        if day not in daily_stats:
-            daily_stats[day] = {'bookings': 0, 'revenue': 0}
-        daily_stats[day]['bookings'] += 1
-        daily_stats[day]['revenue'] += float(booking.total_amount)
+    daily_stats = {
+        day.title(): {'bookings': stats['count'], 'revenue': stats['revenue']}
+        for day, stats in weekday_breakdown(bookings).items()
+    }
     
     # Upcoming bookings
     upcoming_bookings = game.bookings.filter(
@@ -1210,7 +1217,7 @@ def advanced_schedule_management(request, game_id):
             'utilization_rate': round(utilization_rate, 1),
             'upcoming_bookings': upcoming_bookings,
             'total_slots': total_slots,
-            'analysis_period_days': 30
+            'analysis_period_days': analysis_days
         },
         'hourly_stats': hourly_stats,
         'daily_stats': daily_stats,
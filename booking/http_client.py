@@ -0,0 +1,298 @@
+"""
+Shared outbound HTTP client
+One pooled, keep-alive requests.Session per external service (Razorpay,
+Telegram), so calls reuse TLS connections instead of opening one per request.
+
+Each session adds:
+- Default timeouts: OUTBOUND_HTTP_CONNECT_TIMEOUT / OUTBOUND_HTTP_READ_TIMEOUT, unless the caller passes one
+- Retries: idempotent requests (GET/HEAD/OPTIONS) are retried on connection
+  errors, timeouts and 502/503/504, with backoff, limited by a retry budget so
+  retries can't multiply load on a struggling service
+- Circuit breaker: after OUTBOUND_HTTP_BREAKER_THRESHOLD consecutive failures
+  to a host, calls fail fast with CircuitOpenError for
+  OUTBOUND_HTTP_BREAKER_RESET seconds, then one trial call is let through
+- Counters: requests, failures, retries, short-circuits and latency per service
+  (see http_stats())
+
+Usage:
+    from .http_client import get_session
+    response = get_session('telegram').post(url, json=payload)
+"""
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT = (
+    getattr(settings, 'OUTBOUND_HTTP_CONNECT_TIMEOUT', 5),
+    getattr(settings, 'OUTBOUND_HTTP_READ_TIMEOUT', 15),
+)  # Seconds
+POOL_SIZE = getattr(settings, 'OUTBOUND_HTTP_POOL_SIZE', 10)  # Connections kept per host
+MAX_RETRIES = getattr(settings, 'OUTBOUND_HTTP_MAX_RETRIES', 2)
+BREAKER_THRESHOLD = getattr(settings, 'OUTBOUND_HTTP_BREAKER_THRESHOLD', 5)
+BREAKER_RESET_SECONDS = getattr(settings, 'OUTBOUND_HTTP_BREAKER_RESET', 30)
+
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_BACKOFF = 0.2  # Seconds, doubled per retry
+LATENCY_SAMPLES = 500
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The host has been failing; the call was not attempted"""
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent requests
+    
+    Every request deposits `ratio` tokens (up to `max_tokens`); a retry spends
+    one. With the default 0.2, retries add at most ~20% extra load once the
+    initial allowance is used up.
+    """
+    
+    def __init__(self, ratio=0.2, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+    
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+    
+    def withdraw(self):
+        """Take one retry token; False if the budget is spent"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host"""
+    
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+    
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+    
+    def allow(self):
+        """Whether a call may go out now (in half-open state, only one trial call)"""
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                # A failed trial re-opens the circuit for another full period
+                self._opened_at = time.monotonic()
+
+
+class ServiceStats:
+    """Per-service counters and recent latencies"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.server_errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+    
+    def record(self, seconds, failed=False, server_error=False):
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(seconds)
+            if failed:
+                self.failures += 1
+            if server_error:
+                self.server_errors += 1
+    
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                'requests': self.requests,
+                'failures': self.failures,
+                'server_errors': self.server_errors,
+                'retries': self.retries,
+                'short_circuited': self.short_circuited,
+                'latency_ms': {
+                    'p50': _percentile_ms(latencies, 0.5),
+                    'p95': _percentile_ms(latencies, 0.95),
+                    'max': _percentile_ms(latencies, 1.0),
+                },
+            }
+
+
+def _percentile_ms(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return round(sorted_values[index] * 1000, 1)
+
+
+class ResilientSession(requests.Session):
+    """
+    requests.Session with pooled keep-alive adapters, default timeouts,
+    budgeted retries, per-host circuit breakers and counters
+    
+    A drop-in Session, so SDKs that accept one (razorpay.Client(session=...))
+    get the same behaviour.
+    """
+    
+    def __init__(self, name, timeout=TIMEOUT, max_retries=MAX_RETRIES, pool_size=POOL_SIZE):
+        super().__init__()
+        self.name = name
+        self.default_timeout = timeout
+        self.max_retries = max_retries
+        self.stats = ServiceStats()
+        self.retry_budget = RetryBudget()
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+        
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=False)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+    
+    def breaker_for(self, url):
+        """The circuit breaker for a URL's host"""
+        host = urlsplit(url).netloc
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+    
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        breaker = self.breaker_for(url)
+        retryable = method.upper() in RETRY_METHODS
+        self.retry_budget.deposit()
+        
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.stats.increment('short_circuited')
+                raise CircuitOpenError(f"{self.name}: circuit open for {urlsplit(url).netloc}")
+            
+            started = time.perf_counter()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.stats.record(time.perf_counter() - started, failed=True)
+                breaker.record_failure()
+                if not self._should_retry(retryable, attempt):
+                    raise
+                logger.warning(f"{self.name}: {method} {url} failed ({type(e).__name__}), retrying")
+            except Exception:
+                # Anything else (ChunkedEncodingError, InvalidURL, ...) still ends a
+                # half-open trial; not retried
+                self.stats.record(time.perf_counter() - started, failed=True)
+                breaker.record_failure()
+                raise
+            else:
+                server_error = response.status_code >= 500
+                self.stats.record(time.perf_counter() - started, failed=server_error, server_error=server_error)
+                if server_error:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                
+                if response.status_code not in RETRY_STATUSES or not self._should_retry(retryable, attempt):
+                    return response
+                logger.warning(f"{self.name}: {method} {url} returned {response.status_code}, retrying")
+                response.close()
+            
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+            attempt += 1
+    
+    def _should_retry(self, retryable, attempt):
+        if not retryable or attempt >= self.max_retries:
+            return False
+        if not self.retry_budget.withdraw():
+            return False
+        self.stats.increment('retries')
+        return True
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name):
+    """
+    The process-wide session for an external service
+    
+    Args:
+        name: Service name (e.g. 'razorpay', 'telegram')
+    
+    Returns:
+        ResilientSession
+    """
+    with _sessions_lock:
+        if name not in _sessions:
+            _sessions[name] = ResilientSession(name)
+        return _sessions[name]
+
+
+def http_stats():
+    """
+    Counters for every service used by this process
+    
+    Returns:
+        dict: {service: {'requests', 'failures', 'server_errors', 'retries',
+               'short_circuited', 'latency_ms': {...}, 'circuits': {host: state}}}
+    """
+    with _sessions_lock:
+        sessions = dict(_sessions)
+    
+    stats = {}
+    for name, session in sessions.items():
+        stats[name] = session.stats.snapshot()
+        with session._breakers_lock:
+            breakers = dict(session._breakers)
+        stats[name]['circuits'] = {host: breaker.state for host, breaker in breakers.items()}
+    return stats
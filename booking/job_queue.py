@@ -0,0 +1,220 @@
+"""
+Notification job queue
+Database-backed queue that keeps Telegram and email delivery off the request
+path. Services call enqueue() and return at once; the process_notification_jobs
+worker claims due jobs and runs their handler.
+
+- Idempotency: each job has a unique key (e.g. 'telegram:new_booking:<booking id>'),
+  so a notification enqueued by several payment paths is sent once
+- Retries: a failed job runs again after NOTIFICATION_JOB_BACKOFF_BASE * 2^(attempt - 1)
+  seconds (capped at NOTIFICATION_JOB_BACKOFF_MAX, with jitter)
+- Dead letters: after max_attempts failures the job is marked DEAD and kept for
+  inspection (python manage.py process_notification_jobs --requeue-dead)
+- Leases: a job is claimed just before it runs and holds a LEASE_SECONDS lease;
+  its outcome is only written while the worker still holds that lease
+- Crashed workers: a RUNNING job whose lease ran out is claimed again
+
+Usage:
+    from .job_queue import enqueue
+    enqueue('telegram_new_booking', f'telegram:new_booking:{booking.id}', booking=booking)
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'NOTIFICATION_JOB_MAX_ATTEMPTS', 6)
+BACKOFF_BASE = getattr(settings, 'NOTIFICATION_JOB_BACKOFF_BASE', 30)  # Seconds
+BACKOFF_MAX = getattr(settings, 'NOTIFICATION_JOB_BACKOFF_MAX', 3600)  # Seconds
+LEASE_SECONDS = 120  # A job still RUNNING after this is assumed abandoned (handlers time out well before)
+CLAIM_BATCH_SIZE = 50  # Jobs run per pass, each claimed right before it runs
+CLAIM_CANDIDATES = 10  # Due jobs tried per claim when other workers take the first ones
+
+# Job kind -> handler(job). Handlers raise to signal a failed attempt.
+HANDLERS = {
+    'telegram_new_booking': 'booking.telegram_service.deliver_new_booking_notification',
+    'telegram_cancellation': 'booking.telegram_service.deliver_cancellation_notification',
+    'email_booking_confirmation': 'booking.notifications.deliver_booking_confirmation_email',
+    'email_booking_cancellation': 'booking.notifications.deliver_booking_cancellation_email',
+    'email_booking_reminder': 'booking.notifications.deliver_booking_reminder_email',
+}
+
+
+def enqueue(kind, idempotency_key, booking=None, payload=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Queue a notification for the worker
+    
+    Inside a transaction the job commits (or rolls back) with it, so a
+    notification is never sent for a change that didn't happen.
+    
+    Args:
+        kind: Key of HANDLERS
+        idempotency_key: Unique key; a second enqueue with the same key is ignored
+        booking: Booking the notification is about, if any
+        payload: Extra JSON-serializable handler arguments
+        max_attempts: Attempts before the job is dead-lettered
+    
+    Returns:
+        tuple: (NotificationJob, created)
+    """
+    from .models import NotificationJob
+    
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown notification job kind: {kind}")
+    
+    try:
+        with transaction.atomic():
+            return NotificationJob.objects.get_or_create(
+                idempotency_key=idempotency_key,
+                defaults={
+                    'kind': kind,
+                    'booking': booking,
+                    'payload': payload or {},
+                    'max_attempts': max_attempts,
+                }
+            )
+    except IntegrityError:
+        # Enqueued concurrently by another request
+        return NotificationJob.objects.get(idempotency_key=idempotency_key), False
+
+
+def backoff_seconds(attempts):
+    """Delay before the next attempt after `attempts` failures (exponential, capped, jittered)"""
+    delay = min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_next_job(now=None):
+    """
+    Claim the next due job for this worker
+    
+    The job is taken with a conditional UPDATE, so concurrent workers never run
+    the same attempt twice, and its lease starts now rather than when a batch
+    was fetched.
+    
+    Returns:
+        NotificationJob: Claimed job (status RUNNING, attempts incremented), or None
+    """
+    from .models import NotificationJob
+    
+    now = now or timezone.now()
+    due = Q(status='PENDING', run_after__lte=now) | Q(status='RUNNING', locked_until__lt=now)
+    candidate_ids = list(
+        NotificationJob.objects.filter(due).order_by('run_after').values_list('id', flat=True)[:CLAIM_CANDIDATES]
+    )
+    
+    for job_id in candidate_ids:
+        claimed = NotificationJob.objects.filter(due, id=job_id).update(
+            status='RUNNING',
+            locked_until=now + timedelta(seconds=LEASE_SECONDS),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return NotificationJob.objects.select_related('booking').get(id=job_id)
+    
+    return None
+
+
+def run_job(job):
+    """
+    Run one claimed job and record the outcome
+    
+    Returns:
+        str: New job status ('DONE', 'PENDING' for a scheduled retry, 'DEAD'),
+             or 'LOST' if the lease ran out and another worker re-claimed the job
+    """
+    try:
+        handler = import_string(HANDLERS[job.kind])
+        handler(job)
+    except Exception as e:
+        return _record_failure(job, e)
+    
+    job.status = 'DONE'
+    job.completed_at = timezone.now()
+    job.last_error = ''
+    return _save_outcome(job, ['status', 'completed_at', 'last_error'])
+
+
+def _record_failure(job, error):
+    job.last_error = f"{type(error).__name__}: {error}"
+    
+    if job.attempts >= job.max_attempts:
+        job.status = 'DEAD'
+        job.completed_at = timezone.now()
+        logger.error(f"Notification job {job.id} ({job.kind}) dead after {job.attempts} attempt(s): {job.last_error}")
+    else:
+        job.status = 'PENDING'
+        job.run_after = timezone.now() + timedelta(seconds=backoff_seconds(job.attempts))
+        logger.warning(
+            f"Notification job {job.id} ({job.kind}) failed (attempt {job.attempts}/{job.max_attempts}), "
+            f"retrying at {job.run_after:%H:%M:%S}: {job.last_error}"
+        )
+    
+    return _save_outcome(job, ['status', 'run_after', 'last_error', 'completed_at'])
+
+
+def _save_outcome(job, fields):
+    """Write the job's outcome and release the lease, only if this worker still holds it"""
+    from .models import NotificationJob
+    
+    lease = job.locked_until
+    job.locked_until = None
+    values = {field: getattr(job, field) for field in fields}
+    
+    updated = NotificationJob.objects.filter(id=job.id, status='RUNNING', locked_until=lease).update(
+        locked_until=None, **values
+    )
+    if not updated:
+        logger.warning(f"Notification job {job.id} ({job.kind}) lease expired before its outcome was saved")
+        return 'LOST'
+    return job.status
+
+
+def process_jobs(limit=CLAIM_BATCH_SIZE):
+    """
+    Run up to `limit` due jobs, claiming each one right before it runs
+    
+    Returns:
+        dict: {'claimed': int, 'done': int, 'retrying': int, 'dead': int, 'lost': int}
+    """
+    summary = {'claimed': 0, 'done': 0, 'retrying': 0, 'dead': 0, 'lost': 0}
+    
+    while summary['claimed'] < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        
+        summary['claimed'] += 1
+        status = run_job(job)
+        if status == 'DONE':
+            summary['done'] += 1
+        elif status == 'DEAD':
+            summary['dead'] += 1
+        elif status == 'LOST':
+            summary['lost'] += 1
+        else:
+            summary['retrying'] += 1
+    
+    return summary
+
+
+def requeue_dead_jobs(kind=None):
+    """
+    Give dead-lettered jobs a fresh set of attempts
+    
+    Returns:
+        int: Number of jobs requeued
+    """
+    from .models import NotificationJob
+    
+    jobs = NotificationJob.objects.filter(status='DEAD')
+    if kind:
+        jobs = jobs.filter(kind=kind)
+    return jobs.update(status='PENDING', attempts=0, run_after=timezone.now(), completed_at=None)
@@ -0,0 +1,73 @@
+"""
+Demand forecast backtest
+Replays recent weeks against the forecast in booking/forecasting.py: each week
+is predicted from the history before it and scored against what was booked.
+
+Usage:
+    python manage.py backtest_forecast                             # last 4 weeks
+    python manage.py backtest_forecast --weeks 8 --alpha 0.2 0.3 0.5
+    python manage.py backtest_forecast --game <game-id> --history-days 56
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from booking.forecasting import DEFAULT_ALPHA, HISTORY_DAYS, backtest
+
+
+class Command(BaseCommand):
+    help = 'Score the demand forecast on past weeks of bookings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--weeks',
+            type=int,
+            default=4,
+            help='Test weeks, ending yesterday (default: 4)'
+        )
+        parser.add_argument(
+            '--history-days',
+            type=int,
+            default=HISTORY_DAYS,
+            help=f'Days of history each fit sees (default: {HISTORY_DAYS})'
+        )
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            nargs='+',
+            default=[DEFAULT_ALPHA],
+            help=f'EWMA weight(s) of the newest observation to compare (default: {DEFAULT_ALPHA})'
+        )
+        parser.add_argument(
+            '--game',
+            action='append',
+            dest='game_ids',
+            help='Limit to a game id (repeatable; defaults to every active game)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['weeks'] < 1 or options['history_days'] < 7:
+            raise CommandError('--weeks must be at least 1 and --history-days at least 7')
+        if any(not 0 < alpha <= 1 for alpha in options['alpha']):
+            raise CommandError('--alpha values must be in (0, 1]')
+        
+        result = backtest(
+            game_ids=options['game_ids'],
+            weeks=options['weeks'],
+            history_days=options['history_days'],
+            alphas=tuple(options['alpha'])
+        )
+        
+        self.stdout.write(
+            f"{result['games']} game(s), {result['start_date']} to {result['end_date']}: "
+            f"{result['predictions']} prediction(s)"
+        )
+        if not result['predictions']:
+            self.stdout.write(self.style.WARNING('No past slots in the test weeks, nothing to score'))
+            return
+        
+        best = min(result['models'], key=lambda label: result['models'][label]['mae'])
+        for label, stats in result['models'].items():
+            line = (
+                f"  {label:<12} MAE {stats['mae']:.3f}  RMSE {stats['rmse']:.3f}  "
+                f"bias {stats['bias']:+.3f}  fit {stats['fit_ms_per_game']:.2f} ms/game"
+            )
+            self.stdout.write(self.style.SUCCESS(line) if label == best else line)
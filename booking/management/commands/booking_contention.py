@@ -0,0 +1,117 @@
+"""
+Shared booking contention harness
+Fires concurrent SHARED booking requests at one slot from several threads and
+checks that the slot was never oversold. Use it to compare
+SHARED_BOOKING_MODE = 'locking' and 'optimistic' on a staging database
+(SQLite serializes all writes, so results there say little).
+
+Usage:
+    python manage.py booking_contention --slot 123 --customer alice --threads 20
+    python manage.py booking_contention --slot 123 --customer alice --mode optimistic --keep
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from authentication.models import Customer
+from booking.booking_service import BookingService
+from booking.models import Booking, GameSlot, SlotAvailability
+
+
+class Command(BaseCommand):
+    help = 'Run concurrent SHARED bookings against one slot and verify capacity is never exceeded'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--slot', type=int, required=True, help='GameSlot id to book')
+        parser.add_argument('--customer', required=True, help='Username of the customer placing the bookings')
+        parser.add_argument('--threads', type=int, default=10, help='Concurrent requests (default: 10)')
+        parser.add_argument('--spots', type=int, default=1, help='Spots per request (default: 1)')
+        parser.add_argument(
+            '--mode',
+            choices=['locking', 'optimistic'],
+            help='Override SHARED_BOOKING_MODE for this run'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the created PENDING bookings instead of cancelling them afterwards'
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            game_slot = GameSlot.objects.select_related('game').get(id=options['slot'])
+            customer = Customer.objects.get(user__username=options['customer'])
+        except (GameSlot.DoesNotExist, Customer.DoesNotExist) as e:
+            raise CommandError(str(e))
+        
+        mode = options['mode'] or getattr(settings, 'SHARED_BOOKING_MODE', 'locking')
+        outcomes = Counter()
+        durations = []
+        created_ids = []
+        lock = threading.Lock()
+        start = threading.Barrier(options['threads'])
+        
+        def worker():
+            start.wait()
+            started = time.perf_counter()
+            try:
+                booking = BookingService.create_booking(
+                    customer, game_slot, 'SHARED', options['spots']
+                )
+                outcome = 'booked'
+                with lock:
+                    created_ids.append(booking.id)
+            except ValidationError:
+                outcome = 'rejected'
+            except Exception as e:
+                outcome = f'error: {type(e).__name__}'
+            finally:
+                connection.close()
+            
+            with lock:
+                outcomes[outcome] += 1
+                durations.append(time.perf_counter() - started)
+        
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        wall_started = time.perf_counter()
+        # Settings are process-wide, so switch the mode once around all threads
+        with override_settings(SHARED_BOOKING_MODE=mode):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        wall_time = time.perf_counter() - wall_started
+        
+        availability = SlotAvailability.objects.get(game_slot=game_slot)
+        held = availability.booked_spots + availability.reserved_spots
+        
+        self.stdout.write(f"Mode: {mode}, {options['threads']} request(s) of {options['spots']} spot(s)")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        self.stdout.write(
+            f"  wall time {wall_time * 1000:.0f} ms, "
+            f"mean request {sum(durations) / len(durations) * 1000:.0f} ms, "
+            f"max request {max(durations) * 1000:.0f} ms"
+        )
+        self.stdout.write(
+            f"  slot holds {held}/{availability.total_capacity} "
+            f"(booked {availability.booked_spots}, reserved {availability.reserved_spots})"
+        )
+        
+        if held > availability.total_capacity:
+            self.stderr.write(self.style.ERROR('Slot oversold!'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Capacity respected'))
+        
+        if not options['keep']:
+            # Cancel through save() so the reserved spots are released
+            for booking in Booking.objects.filter(id__in=created_ids):
+                booking.status = 'CANCELLED'
+                booking.save()
+            self.stdout.write(f"Cancelled {len(created_ids)} test booking(s)")
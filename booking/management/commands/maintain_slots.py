@@ -0,0 +1,89 @@
+"""
+Slot maintenance worker
+Keeps slots generated ahead for every active game: DAYS_TO_MAINTAIN days, or
+longer for games with high forecast demand (see booking/forecasting.py).
+
+Usage:
+    python manage.py maintain_slots              # single pass (cron friendly)
+    python manage.py maintain_slots --loop       # long-lived scheduler loop
+    python manage.py maintain_slots --days 14    # fixed window for every game
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from booking.auto_slot_generator import AutoSlotGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate upcoming slots for all active games (once, or continuously with --loop)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and repeat the maintenance pass every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=AutoSlotGenerator.CHECK_INTERVAL,
+            help=f'Seconds between passes in --loop mode (default: {AutoSlotGenerator.CHECK_INTERVAL})'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help=(
+                'Days of slots to keep generated ahead for every game '
+                f'(default: from forecast demand, at least {AutoSlotGenerator.DAYS_TO_MAINTAIN})'
+            )
+        )
+        parser.add_argument(
+            '--lease-ttl',
+            type=int,
+            default=AutoSlotGenerator.LEASE_TTL,
+            help=f'Seconds the maintenance lease is held before other nodes may take over (default: {AutoSlotGenerator.LEASE_TTL})'
+        )
+    
+    def handle(self, *args, **options):
+        holder = AutoSlotGenerator.default_holder()
+        
+        if not options['loop']:
+            self._run_pass(holder, options)
+            return
+        
+        self.stdout.write(f"Slot maintenance worker {holder} started (every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                self._run_pass(holder, options)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Slot maintenance worker stopped')
+    
+    def _run_pass(self, holder, options):
+        try:
+            summary = AutoSlotGenerator.run_maintenance(
+                holder=holder,
+                days_to_maintain=options['days'],
+                lease_ttl=options['lease_ttl']
+            )
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Slot maintenance failed: {e}'))
+            return
+        
+        if summary is None:
+            self.stdout.write('Another worker holds the slot maintenance lease, skipped')
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {summary['games_checked']} game(s), "
+            f"extended {summary['games_extended']}, "
+            f"created {summary['slots_created']} slot(s)"
+        ))
+        
+        for error in summary['errors']:
+            self.stderr.write(self.style.WARNING(error))
@@ -0,0 +1,96 @@
+"""
+Occupancy engine benchmark
+Times the seat-hour utilization computation (see booking/occupancy.py) on
+generated data, or the full load + compute path against the database.
+
+Usage:
+    python manage.py occupancy_benchmark                          # 50 games x 365 days, hourly slots
+    python manage.py occupancy_benchmark --games 10 --days 90
+    python manage.py occupancy_benchmark --database --days 365    # real slots and bookings
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from booking.occupancy import OccupancyFrame, benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the occupancy and utilization engine'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--games',
+            type=int,
+            default=50,
+            help='Number of generated games (default: 50)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Days of slots per game (default: 365)'
+        )
+        parser.add_argument(
+            '--slots-per-day',
+            type=int,
+            default=24,
+            help='Generated slots per game per day (default: 24)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed runs of the computation; the best is reported (default: 3)'
+        )
+        parser.add_argument(
+            '--database',
+            action='store_true',
+            help='Load the last --days days of real slots and bookings instead of generated data'
+        )
+    
+    def handle(self, *args, **options):
+        if options['database']:
+            self._benchmark_database(options['days'])
+            return
+        
+        result = benchmark(
+            games=options['games'],
+            days=options['days'],
+            slots_per_day=options['slots_per_day'],
+            repeat=options['repeat']
+        )
+        
+        self.stdout.write(
+            f"{options['games']} game(s) x {options['days']} day(s): {result['slots']} slots"
+        )
+        self.stdout.write(f"  Build frame: {result['build_seconds'] * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"  Utilization (overall, per game, per hour, per weekday): {result['compute_seconds'] * 1000:.1f} ms"
+        ))
+    
+    def _benchmark_database(self, days):
+        end_date = timezone.localdate()
+        start_date = end_date - timedelta(days=days - 1)
+        
+        started = time.perf_counter()
+        frame = OccupancyFrame.load(start_date, end_date)
+        load_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        report = frame.report()
+        overall = report.overall()
+        report.by_game()
+        report.by_hour()
+        report.by_weekday()
+        compute_seconds = time.perf_counter() - started
+        
+        self.stdout.write(
+            f"{len(frame.game_ids)} game(s), {start_date} to {end_date}: {len(frame)} slots"
+        )
+        self.stdout.write(f"  Load from database: {load_seconds * 1000:.1f} ms")
+        self.stdout.write(f"  Utilization: {overall['utilization']:.1%} "
+                          f"({overall['booked_seat_hours']} of {overall['offered_seat_hours']} seat-hours)")
+        self.stdout.write(self.style.SUCCESS(f"  Compute: {compute_seconds * 1000:.1f} ms"))
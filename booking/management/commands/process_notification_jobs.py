@@ -0,0 +1,93 @@
+"""
+Notification job worker
+Delivers queued Telegram messages and emails (see booking/job_queue.py),
+retrying failures with exponential backoff and dead-lettering jobs that run
+out of attempts.
+
+Usage:
+    python manage.py process_notification_jobs                 # single pass (cron friendly)
+    python manage.py process_notification_jobs --loop          # long-lived worker
+    python manage.py process_notification_jobs --requeue-dead  # retry dead-lettered jobs
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from booking.job_queue import CLAIM_BATCH_SIZE, process_jobs, requeue_dead_jobs
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued Telegram and email notifications (once, or continuously with --loop)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll for due jobs every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='Seconds between polls in --loop mode when the queue is empty (default: 2)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=CLAIM_BATCH_SIZE,
+            help=f'Jobs claimed per pass (default: {CLAIM_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--requeue-dead',
+            action='store_true',
+            help='Reset dead-lettered jobs to pending with fresh attempts, then exit'
+        )
+        parser.add_argument(
+            '--kind',
+            help='With --requeue-dead, only requeue jobs of this kind'
+        )
+    
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            requeued = requeue_dead_jobs(options['kind'])
+            self.stdout.write(self.style.SUCCESS(f'Requeued {requeued} dead job(s)'))
+            return
+        
+        if not options['loop']:
+            self._run_jobs(options, quiet=False)
+            return
+        
+        self.stdout.write(f"Notification worker started (polling every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                summary = self._run_jobs(options, quiet=True)
+                
+                # Keep draining while there is a backlog
+                if not summary or summary['claimed'] < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Notification worker stopped')
+    
+    def _run_jobs(self, options, quiet):
+        try:
+            summary = process_jobs(limit=options['batch_size'])
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Notification job pass failed: {e}'))
+            return None
+        
+        if quiet and not summary['claimed']:
+            return summary
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Ran {summary['claimed']} job(s): {summary['done']} delivered, "
+            f"{summary['retrying']} to retry, {summary['dead']} dead"
+        ))
+        if summary['lost']:
+            self.stderr.write(self.style.WARNING(
+                f"{summary['lost']} job(s) outlived their lease and were left to the worker that re-claimed them"
+            ))
+        return summary
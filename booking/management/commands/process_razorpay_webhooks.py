@@ -0,0 +1,117 @@
+"""
+Razorpay webhook worker
+Applies stored webhook events (see booking/razorpay_webhooks.py) in order per
+Razorpay order, retrying failures with backoff. Only one worker applies events
+at a time (a lease row in the database).
+
+Usage:
+    python manage.py process_razorpay_webhooks                            # single pass (cron friendly)
+    python manage.py process_razorpay_webhooks --loop                     # long-lived worker
+    python manage.py process_razorpay_webhooks --replay evt_123 evt_456   # apply stored events again
+    python manage.py process_razorpay_webhooks --replay-since 2025-01-31T10:00
+    python manage.py process_razorpay_webhooks --replay-failed
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from booking.razorpay_webhooks import PROCESS_BATCH_SIZE, process_webhook_events, replay_events
+
+
+class Command(BaseCommand):
+    help = 'Apply stored Razorpay webhook events (once, or continuously with --loop)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and apply new events every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='Seconds between passes in --loop mode (default: 2)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PROCESS_BATCH_SIZE,
+            help=f'Events considered per pass (default: {PROCESS_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--replay',
+            nargs='+',
+            metavar='EVENT_ID',
+            help='Mark these stored events pending again, then run a pass'
+        )
+        parser.add_argument(
+            '--replay-since',
+            help='Mark events received at or after this ISO datetime pending again, then run a pass'
+        )
+        parser.add_argument(
+            '--replay-failed',
+            action='store_true',
+            help='Mark events that gave up pending again, then run a pass'
+        )
+    
+    def handle(self, *args, **options):
+        if options['replay'] or options['replay_since'] or options['replay_failed']:
+            self._replay(options)
+            if not options['loop']:
+                self._run_pass(options, quiet=False)
+                return
+        
+        if not options['loop']:
+            self._run_pass(options, quiet=False)
+            return
+        
+        self.stdout.write(f"Razorpay webhook worker started (every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                self._run_pass(options, quiet=True)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Razorpay webhook worker stopped')
+    
+    def _replay(self, options):
+        since = None
+        if options['replay_since']:
+            since = parse_datetime(options['replay_since'])
+            if since is None:
+                raise CommandError(f"Invalid --replay-since datetime: {options['replay_since']}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        
+        replayed = replay_events(
+            event_ids=options['replay'],
+            since=since,
+            failed_only=options['replay_failed']
+        )
+        self.stdout.write(f'Queued {replayed} event(s) for replay')
+    
+    def _run_pass(self, options, quiet):
+        try:
+            summary = process_webhook_events(limit=options['batch_size'])
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Webhook processing failed: {e}'))
+            return
+        
+        if summary is None:
+            if not quiet:
+                self.stdout.write('Another worker holds the webhook lease, skipped')
+            return
+        
+        if quiet and not (summary['processed'] or summary['retrying'] or summary['failed']):
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Applied {summary['processed']} webhook event(s); {summary['retrying']} to retry, "
+            f"{summary['failed']} failed, {summary['blocked']} waiting"
+        ))
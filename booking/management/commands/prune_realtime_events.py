@@ -0,0 +1,67 @@
+"""
+Realtime event log pruning
+Deletes RealtimeEvent rows older than REALTIME_EVENT_RETENTION.
+Browsers resuming from an older Last-Event-ID get a 'reset' event and reload.
+
+Usage:
+    python manage.py prune_realtime_events                  # single pass (cron friendly)
+    python manage.py prune_realtime_events --loop           # long-lived loop
+    python manage.py prune_realtime_events --retention 600  # keep 10 minutes
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from booking.event_store import EVENT_RETENTION, prune_events
+
+
+class Command(BaseCommand):
+    help = 'Delete realtime events older than the retention window'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and prune every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between passes in --loop mode (default: 300)'
+        )
+        parser.add_argument(
+            '--retention',
+            type=int,
+            default=EVENT_RETENTION,
+            help=f'Seconds of events to keep (default: {EVENT_RETENTION})'
+        )
+    
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self._run_prune(options, quiet=False)
+            return
+        
+        self.stdout.write(f"Realtime event pruner started (every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                self._run_prune(options, quiet=True)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Realtime event pruner stopped')
+    
+    def _run_prune(self, options, quiet):
+        try:
+            deleted = prune_events(options['retention'])
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Realtime event pruning failed: {e}'))
+            return
+        
+        if quiet and not deleted:
+            return
+        
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} realtime event(s)'))
@@ -0,0 +1,169 @@
+"""
+Realtime connection load test
+Opens many concurrent availability streams against a running server, holds
+them open, and probes a normal API endpoint meanwhile. Run it against the
+WSGI and the ASGI deployment to compare how many idle subscribers each can
+carry before ordinary requests start to starve.
+
+Usage:
+    # before: sync workers
+    gunicorn gaming_cafe.wsgi --workers 2 --threads 8
+    # after: async workers
+    gunicorn gaming_cafe.asgi:application --workers 2 -k uvicorn.workers.UvicornWorker
+    
+    python manage.py realtime_load_test --url http://127.0.0.1:8000 --game <uuid> --connections 500
+    python manage.py realtime_load_test --url ... --game <uuid> --path /booking/api/notifications/?since=0&wait=25
+"""
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Hold many concurrent stream/long-poll connections open and measure capacity and probe latency'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+        parser.add_argument('--game', required=True, help='Game id whose availability stream to open')
+        parser.add_argument(
+            '--path',
+            help='Endpoint to hold open instead of the availability stream (e.g. a long-poll URL)'
+        )
+        parser.add_argument('--connections', type=int, default=200, help='Concurrent connections (default: 200)')
+        parser.add_argument('--ramp', type=float, default=5, help='Seconds to open all connections over (default: 5)')
+        parser.add_argument('--hold', type=float, default=30, help='Seconds to hold each connection (default: 30)')
+        parser.add_argument('--timeout', type=float, default=10, help='Seconds to wait for the first byte (default: 10)')
+    
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        path = options['path'] or f"/api/games/{options['game']}/availability/stream/"
+        probe_path = f"/api/games/{options['game']}/slots/"
+        
+        results = asyncio.run(self._run(base_url + path, base_url + probe_path, options))
+        self._report(results, options)
+    
+    async def _run(self, url, probe_url, options):
+        outcomes = Counter()
+        first_byte = []
+        probe_latencies = []
+        probe_failures = Counter()
+        
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        # Connection timeouts are enforced per request with asyncio.wait_for
+        async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+            stop = asyncio.Event()
+            probe = asyncio.create_task(
+                self._probe(client, probe_url, stop, probe_latencies, probe_failures, options['timeout'])
+            )
+            
+            delay = options['ramp'] / max(options['connections'], 1)
+            tasks = []
+            for index in range(options['connections']):
+                tasks.append(asyncio.create_task(
+                    self._hold_connection(client, url, index * delay, options, outcomes, first_byte)
+                ))
+            
+            await asyncio.gather(*tasks)
+            stop.set()
+            await probe
+        
+        return {
+            'outcomes': outcomes,
+            'first_byte': first_byte,
+            'probe_latencies': probe_latencies,
+            'probe_failures': probe_failures,
+        }
+    
+    async def _hold_connection(self, client, url, start_delay, options, outcomes, first_byte):
+        """Open one connection, time the first byte, then keep reading until --hold runs out"""
+        await asyncio.sleep(start_delay)
+        started = time.perf_counter()
+        
+        try:
+            # A saturated sync server accepts the socket but never answers, so bound the whole wait
+            response = await asyncio.wait_for(
+                client.send(client.build_request('GET', url), stream=True),
+                timeout=options['timeout']
+            )
+            try:
+                if response.status_code != 200:
+                    outcomes[f'http {response.status_code}'] += 1
+                    return
+                
+                chunks = response.aiter_raw()
+                await asyncio.wait_for(chunks.__anext__(), timeout=options['timeout'])
+                first_byte.append(time.perf_counter() - started)
+                
+                try:
+                    await asyncio.wait_for(self._drain(chunks), timeout=options['hold'])
+                    outcomes['closed by server'] += 1
+                except asyncio.TimeoutError:
+                    outcomes['held'] += 1
+            finally:
+                await response.aclose()
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            outcomes['timed out'] += 1
+        except StopAsyncIteration:
+            outcomes['empty response'] += 1
+        except httpx.HTTPError as e:
+            outcomes[f'error: {type(e).__name__}'] += 1
+    
+    async def _drain(self, chunks):
+        async for _ in chunks:
+            pass
+    
+    async def _probe(self, client, url, stop, latencies, failures, timeout):
+        """Time an ordinary API request once a second while the connections are open"""
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, timeout=timeout)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    failures[f'http {response.status_code}'] += 1
+            except httpx.HTTPError as e:
+                failures[type(e).__name__] += 1
+            
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _report(self, results, options):
+        outcomes = results['outcomes']
+        self.stdout.write(f"{options['connections']} connection(s), held for {options['hold']:.0f}s")
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        
+        first_byte = sorted(results['first_byte'])
+        if first_byte:
+            self.stdout.write(
+                f"  first byte: p50 {self._ms(statistics.median(first_byte))}, "
+                f"p95 {self._ms(first_byte[int(len(first_byte) * 0.95) - 1])}, "
+                f"max {self._ms(first_byte[-1])}"
+            )
+        
+        latencies = sorted(results['probe_latencies'])
+        if latencies:
+            self.stdout.write(
+                f"  probe requests: {len(latencies)} ok, p50 {self._ms(statistics.median(latencies))}, "
+                f"max {self._ms(latencies[-1])}"
+            )
+        for failure, count in sorted(results['probe_failures'].items()):
+            self.stdout.write(f"  probe {failure}: {count}")
+        
+        if outcomes['held'] == options['connections'] and not results['probe_failures']:
+            self.stdout.write(self.style.SUCCESS('All connections held; probes kept being served'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"{outcomes['held']}/{options['connections']} connection(s) held for the full period"
+            ))
+    
+    @staticmethod
+    def _ms(seconds):
+        return f'{seconds * 1000:.0f} ms'
@@ -0,0 +1,61 @@
+"""
+Revenue rollup backfill
+Recomputes DailyRevenueRollup from paid bookings (see booking/revenue_rollup.py).
+Run once after deploying the rollup table, and again to repair drift.
+
+Usage:
+    python manage.py rebuild_revenue_rollups                        # all history
+    python manage.py rebuild_revenue_rollups --days 35              # recent days only
+    python manage.py rebuild_revenue_rollups --from 2025-01-01 --to 2025-03-31
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from booking.revenue_rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily revenue rollups used by the revenue dashboards'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Rebuild only the last N days (including today)'
+        )
+        parser.add_argument(
+            '--from',
+            dest='start_date',
+            help='First date to rebuild (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--to',
+            dest='end_date',
+            help='Last date to rebuild (YYYY-MM-DD)'
+        )
+    
+    def handle(self, *args, **options):
+        start_date = self._parse_date(options['start_date'], '--from')
+        end_date = self._parse_date(options['end_date'], '--to')
+        
+        if options['days']:
+            if start_date or end_date:
+                raise CommandError('--days cannot be combined with --from/--to')
+            end_date = timezone.localdate()
+            start_date = end_date - timedelta(days=options['days'] - 1)
+        
+        rows = rebuild_rollups(start_date, end_date)
+        
+        scope = f"{start_date or 'the beginning'} to {end_date or 'the latest booking'}"
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} revenue rollup row(s) from {scope}'))
+    
+    def _parse_date(self, value, option):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f'Invalid {option} date: {value}')
+        return parsed
@@ -0,0 +1,93 @@
+"""
+Razorpay payment reconciliation
+Checks PENDING/FAILED bookings against their Razorpay order and confirms the
+ones whose payment was captured (see booking/payment_reconciliation.py).
+
+Usage:
+    python manage.py reconcile_payments                    # last 7 days
+    python manage.py reconcile_payments --days 30 --workers 8 --rate 10
+    python manage.py reconcile_payments --dry-run          # report only
+"""
+from django.core.management.base import BaseCommand
+
+from booking.payment_reconciliation import (
+    APPLY_BATCH_SIZE, CONFIRMED, DEFAULT_DAYS, DEFAULT_RATE, DEFAULT_WORKERS, ERROR, NEEDS_REVIEW, UNPAID,
+    reconcile_payments,
+)
+
+
+class Command(BaseCommand):
+    help = 'Confirm bookings whose Razorpay payment was captured but never recorded'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=DEFAULT_DAYS,
+            help=f'Check bookings created in the last N days (default: {DEFAULT_DAYS})'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f'Concurrent Razorpay requests (default: {DEFAULT_WORKERS})'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=DEFAULT_RATE,
+            help=f'Maximum Razorpay requests per second (default: {DEFAULT_RATE})'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=APPLY_BATCH_SIZE,
+            help=f'Bookings confirmed per transaction (default: {APPLY_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without writing anything'
+        )
+        parser.add_argument(
+            '--verbose-report',
+            action='store_true',
+            help='List unpaid bookings too (only actionable ones are listed by default)'
+        )
+    
+    def handle(self, *args, **options):
+        report = reconcile_payments(
+            days=options['days'],
+            workers=options['workers'],
+            rate=options['rate'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run']
+        )
+        
+        for row in report['rows']:
+            if row['outcome'] == UNPAID and not options['verbose_report']:
+                continue
+            
+            line = f"{row['outcome']:<13} booking {row['booking_id']}  order {row['order_id']}"
+            if row['payment_id']:
+                line += f"  payment {row['payment_id']}"
+            if row['detail']:
+                line += f"  ({row['detail']})"
+            
+            if row['outcome'] in (NEEDS_REVIEW, ERROR):
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+        
+        counts = ', '.join(f'{outcome}: {count}' for outcome, count in report['counts'].items() if count)
+        summary = f"Checked {report['checked']} booking(s)" + (f" - {counts}" if counts else '')
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{summary} (dry run, nothing written)'))
+        elif report['counts'][NEEDS_REVIEW] or report['counts'][ERROR]:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+        
+        if report['counts'][CONFIRMED] and options['dry_run']:
+            self.stdout.write(f"Run without --dry-run to confirm {report['counts'][CONFIRMED]} booking(s)")
@@ -0,0 +1,87 @@
+"""
+Reserved spots reconciliation
+Recomputes SlotAvailability.reserved_spots from PENDING bookings and repairs drift.
+PENDING bookings without a reservation expiry (legacy rows the sweeper never
+releases) are not counted.
+
+Usage:
+    python manage.py reconcile_reserved_spots             # today onwards
+    python manage.py reconcile_reserved_spots --all       # every slot
+    python manage.py reconcile_reserved_spots --dry-run   # report only
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from booking.availability_cache import invalidate_availability
+from booking.models import Booking, SlotAvailability
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized reserved_spots counter from PENDING bookings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Check every slot instead of only slots from today onwards'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without writing corrections'
+        )
+    
+    def handle(self, *args, **options):
+        availabilities = SlotAvailability.objects.all()
+        # Same rows as SlotAvailability.recalculate_reserved_spots
+        bookings = Booking.objects.filter(
+            status='PENDING', game_slot__isnull=False, reservation_expires_at__isnull=False
+        )
+        
+        if not options['all']:
+            today = timezone.localdate()
+            availabilities = availabilities.filter(game_slot__date__gte=today)
+            bookings = bookings.filter(game_slot__date__gte=today)
+        
+        # Expected counter per slot in one grouped query
+        expected = dict(
+            bookings.values('game_slot_id').annotate(total=Sum('spots_booked')).values_list('game_slot_id', 'total')
+        )
+        
+        drifted = [
+            (availability_id, game_slot_id, stored)
+            for availability_id, game_slot_id, stored in availabilities.values_list('id', 'game_slot_id', 'reserved_spots')
+            if stored != (expected.get(game_slot_id) or 0)
+        ]
+        
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('reserved_spots is consistent for all checked slots'))
+            return
+        
+        fixed = 0
+        for availability_id, game_slot_id, stored in drifted:
+            self.stdout.write(
+                f"Slot {game_slot_id}: stored {stored}, expected {expected.get(game_slot_id) or 0}"
+            )
+            
+            if options['dry_run']:
+                continue
+            
+            # Recompute under the row lock so concurrent reservations aren't lost
+            with transaction.atomic():
+                availability = SlotAvailability.objects.select_for_update().select_related('game_slot').get(
+                    id=availability_id
+                )
+                actual = availability.recalculate_reserved_spots()
+                if availability.reserved_spots != actual:
+                    availability.reserved_spots = actual
+                    availability.save(update_fields=['reserved_spots'])
+                    invalidate_availability(availability.game_slot.game_id, availability.game_slot.date)
+                    fixed += 1
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} slot(s) drifted (dry run, nothing written)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Corrected {fixed} of {len(drifted)} drifted slot(s)'))
@@ -0,0 +1,70 @@
+"""
+Reservation expiry sweeper
+Expires PENDING bookings whose payment window has lapsed and releases their
+reserved spots, so read paths don't have to.
+
+Usage:
+    python manage.py sweep_reservations             # single sweep (cron friendly)
+    python manage.py sweep_reservations --loop      # long-lived sweeper loop
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from booking.booking_service import RESERVATION_SWEEP_BATCH_SIZE, sweep_expired_reservations
+
+
+class Command(BaseCommand):
+    help = 'Expire lapsed payment reservations in batches (once, or continuously with --loop)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and sweep every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=15,
+            help='Seconds between sweeps in --loop mode (default: 15)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RESERVATION_SWEEP_BATCH_SIZE,
+            help=f'Reservations expired per transaction (default: {RESERVATION_SWEEP_BATCH_SIZE})'
+        )
+    
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self._run_sweep(options, quiet=False)
+            return
+        
+        self.stdout.write(f"Reservation sweeper started (every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                self._run_sweep(options, quiet=True)
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Reservation sweeper stopped')
+    
+    def _run_sweep(self, options, quiet):
+        try:
+            summary = sweep_expired_reservations(batch_size=options['batch_size'])
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Reservation sweep failed: {e}'))
+            return
+        
+        # Stay quiet in loop mode unless something was expired
+        if quiet and not summary['expired']:
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {summary['expired']} reservation(s) across {summary['slots']} slot(s) "
+            f"in {summary['batches']} batch(es)"
+        ))
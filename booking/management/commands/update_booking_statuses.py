@@ -0,0 +1,63 @@
+"""
+Booking status worker
+Applies time-driven status transitions (expiry, start, completion, no-show)
+with set-based updates, so dashboards don't have to do it on page load.
+
+Usage:
+    python manage.py update_booking_statuses             # single pass (cron friendly)
+    python manage.py update_booking_statuses --loop      # long-lived scheduler loop
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from booking.booking_service import auto_update_bookings_status
+
+
+class Command(BaseCommand):
+    help = 'Expire, start, complete and no-show bookings based on the current time (once, or continuously with --loop)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and repeat the pass every --interval seconds'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between passes in --loop mode (default: 60)'
+        )
+    
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self._run_pass()
+            return
+        
+        self.stdout.write(f"Booking status worker started (every {options['interval']}s)")
+        
+        try:
+            while True:
+                # Drop connections that went stale while sleeping
+                close_old_connections()
+                self._run_pass()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Booking status worker stopped')
+    
+    def _run_pass(self):
+        try:
+            summary = auto_update_bookings_status()
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f'Booking status update failed: {e}'))
+            return
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {summary['total_checked']} booking(s): "
+            f"{summary['expired']} expired, "
+            f"{summary['started']} started, "
+            f"{summary['completed']} completed, "
+            f"{summary['no_show']} no-show"
+        ))
@@ -1,36 +1,94 @@
 """
 Middleware to automatically maintain slot availability
-Runs background checks without blocking requests
+Opt-in fallback for deployments that cannot run the maintain_slots and
+update_booking_statuses workers
 """
-from .auto_slot_generator import check_and_generate_daily_slots
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from .auto_slot_generator import AutoSlotGenerator
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
 class AutoSlotMaintenanceMiddleware:
     """
-    Middleware that ensures slots are automatically generated
-    Checks once per day on first request
-    Runs in background - doesn't slow down user requests
+    Fallback slot maintenance for hosts without a background worker (e.g. serverless)
+    Disabled unless SLOT_MAINTENANCE_MIDDLEWARE is True; the maintain_slots and
+    update_booking_statuses management commands are the primary mechanism.
+    
+    When enabled, each process starts at most one maintenance run per
+    CHECK_INTERVAL, in a single background thread, under the same lease the
+    worker uses, and at most one booking status pass per STATUS_CHECK_INTERVAL.
+    Requests in between only compare a timestamp. The status pass also applies
+    stored Razorpay webhook events and delivers queued notification jobs.
     """
     
+    STATUS_CHECK_INTERVAL = 60  # Seconds between booking status passes
+    
     def __init__(self, get_response):
+        if not getattr(settings, 'SLOT_MAINTENANCE_MIDDLEWARE', False):
+            raise MiddlewareNotUsed("Slot maintenance is handled by the maintain_slots command")
+        
         self.get_response = get_response
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._next_status_check = 0.0
+        self._status_lock = threading.Lock()
     
     def __call__(self, request):
-        # Check and generate slots in background (once per day)
-        # This doesn't block the request - runs in a separate thread
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            self._next_check = now + AutoSlotGenerator.CHECK_INTERVAL
+            threading.Thread(target=self._run_maintenance, daemon=True).start()
+        
+        if now >= self._next_status_check and self._status_lock.acquire(blocking=False):
+            self._next_status_check = now + self.STATUS_CHECK_INTERVAL
+            threading.Thread(target=self._run_status_update, daemon=True).start()
+        
+        # Process the request normally
+        response = self.get_response(request)
+        
+        return response
+    
+    def _run_maintenance(self):
         try:
-            check_and_generate_daily_slots()
+            AutoSlotGenerator.run_maintenance()
         except Exception as e:
             # Don't let slot generation errors break the site
             logger.error(f"Error in auto slot maintenance: {str(e)}")
+        finally:
+            # Don't keep a DB connection open from this short-lived thread
+            connection.close()
+            self._lock.release()
+    
+    def _run_status_update(self):
+        from .booking_service import auto_update_bookings_status
+        from .job_queue import process_jobs
+        from .razorpay_webhooks import process_webhook_events
         
-        # Process the request normally
-        response = self.get_response(request)
+        try:
+            auto_update_bookings_status()
+        except Exception as e:
+            logger.error(f"Error in auto booking status update: {str(e)}")
         
-        return response
+        # No process_razorpay_webhooks or process_notification_jobs worker on these hosts either
+        try:
+            process_webhook_events()
+        except Exception as e:
+            logger.error(f"Error applying Razorpay webhooks: {str(e)}")
+        
+        try:
+            # After the webhooks, so the confirmations they enqueue go out in the same pass
+            process_jobs()
+        except Exception as e:
+            logger.error(f"Error delivering notification jobs: {str(e)}")
+        finally:
+            connection.close()
+            self._status_lock.release()
 
 
 class NoCacheMiddleware:
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0011_remove_qr_code_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Job name (e.g., 'slot_maintenance')", max_length=100, unique=True)),
+                ('holder', models.CharField(help_text='Identifier of the process holding the lease (host:pid)', max_length=200)),
+                ('acquired_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(help_text='Lease is free for other workers after this time')),
+            ],
+            options={
+                'verbose_name': 'Worker Lease',
+                'verbose_name_plural': 'Worker Leases',
+            },
+        ),
+    ]
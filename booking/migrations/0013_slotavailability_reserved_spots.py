@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:04
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_reserved_spots(apps, schema_editor):
+    """Seed the counter from bookings that are currently PENDING"""
+    Booking = apps.get_model('booking', 'Booking')
+    SlotAvailability = apps.get_model('booking', 'SlotAvailability')
+
+    # Legacy PENDING rows without an expiry can never be paid or swept, so they hold nothing
+    totals = (
+        Booking.objects.filter(status='PENDING', game_slot__isnull=False, reservation_expires_at__isnull=False)
+        .values('game_slot_id')
+        .annotate(total=Sum('spots_booked'))
+    )
+    for row in totals:
+        SlotAvailability.objects.filter(game_slot_id=row['game_slot_id']).update(
+            reserved_spots=row['total'] or 0
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0012_workerlease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slotavailability',
+            name='reserved_spots',
+            field=models.PositiveIntegerField(default=0, help_text='Spots held by PENDING bookings awaiting payment (maintained by Booking.update_slot_availability)'),
+        ),
+        migrations.RunPython(backfill_reserved_spots, migrations.RunPython.noop),
+    ]
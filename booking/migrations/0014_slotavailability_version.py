@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0013_slotavailability_reserved_spots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slotavailability',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every counter change (optimistic concurrency token)'),
+        ),
+    ]
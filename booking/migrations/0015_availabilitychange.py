@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0014_slotavailability_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_changes', to='booking.game')),
+                ('game_slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_changes', to='booking.gameslot')),
+            ],
+            options={
+                'verbose_name': 'Availability Change',
+                'verbose_name_plural': 'Availability Changes',
+                'indexes': [models.Index(fields=['game', 'id'], name='availchange_game_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:27
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0015_availabilitychange'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='RealtimeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(help_text="e.g. 'availability_update', 'booking_update', 'game_update'", max_length=50)),
+                ('game_id', models.UUIDField(blank=True, help_text='Game the event belongs to, if any', null=True)),
+                ('key', models.CharField(blank=True, help_text='Id of the slot, game or booking the event is about', max_length=100)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Realtime Event',
+                'verbose_name_plural': 'Realtime Events',
+                'indexes': [models.Index(fields=['event_type', 'id'], name='rtevent_type_id_idx'), models.Index(fields=['game_id', 'id'], name='rtevent_game_id_idx')],
+            },
+        ),
+        migrations.DeleteModel(
+            name='AvailabilityChange',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:41
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0016_realtimeevent'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='NotificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text="Handler name (e.g., 'telegram_new_booking')", max_length=50)),
+                ('idempotency_key', models.CharField(max_length=200, unique=True)),
+                ('payload', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('DEAD', 'Dead (gave up)')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=6)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='Not picked up before this time')),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease of the worker running the job', null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notification_jobs', to='booking.booking')),
+            ],
+            options={
+                'verbose_name': 'Notification Job',
+                'verbose_name_plural': 'Notification Jobs',
+                'indexes': [models.Index(fields=['status', 'run_after'], name='notifjob_status_run_idx')],
+            },
+        ),
+    ]
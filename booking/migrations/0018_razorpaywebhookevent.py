@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0017_notificationjob'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='RazorpayWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(help_text='X-Razorpay-Event-Id header', max_length=100, unique=True)),
+                ('event', models.CharField(help_text="e.g. 'payment.captured'", max_length=50)),
+                ('ordering_key', models.CharField(blank=True, help_text='Events with the same key are applied in order', max_length=100)),
+                ('event_created_at', models.BigIntegerField(default=0, help_text="Razorpay's created_at (unix seconds)")),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSED', 'Processed'), ('FAILED', 'Failed (gave up)')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Razorpay Webhook Event',
+                'verbose_name_plural': 'Razorpay Webhook Events',
+                'indexes': [models.Index(fields=['status', 'event_created_at', 'id'], name='rzp_webhook_status_idx')],
+            },
+        ),
+    ]
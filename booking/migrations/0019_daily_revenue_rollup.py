@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:49
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0018_razorpaywebhookevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('booking_type', models.CharField(choices=[('PRIVATE', 'Private Booking (Full Capacity)'), ('SHARED', 'Shared Booking (Individual Spots)')], max_length=10)),
+                ('payment_method', models.CharField(choices=[('RAZORPAY', 'Razorpay'), ('OTHER', 'Other')], max_length=20)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Sum of total_amount', max_digits=14)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('platform_fee', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('commission_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('owner_payout', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='booking.game')),
+            ],
+            options={
+                'verbose_name': 'Daily Revenue Rollup',
+                'verbose_name_plural': 'Daily Revenue Rollups',
+                'constraints': [models.UniqueConstraint(fields=('date', 'game', 'booking_type', 'payment_method'), name='revenue_rollup_key_uniq')],
+            },
+        ),
+    ]
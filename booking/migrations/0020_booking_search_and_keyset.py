@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-17 05:58
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_search_text(apps, schema_editor):
+    """Fill Booking.search_text from each customer's user and phone (same format as booking.search)"""
+    Booking = apps.get_model('booking', 'Booking')
+    Customer = apps.get_model('authentication', 'Customer')
+
+    for customer in Customer.objects.select_related('user').iterator(chunk_size=500):
+        user = customer.user
+        phone_digits = re.sub(r'\D', '', customer.phone or '')
+        parts = [user.first_name, user.last_name, user.username, user.email, customer.phone or '', phone_digits]
+        text = ' '.join(' '.join(parts).lower().split())
+        Booking.objects.filter(customer_id=customer.pk).update(search_text=text)
+
+
+def create_trigram_index(apps, schema_editor):
+    """Trigram GIN index for substring search (PostgreSQL only; other databases match the column directly)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS booking_search_trgm_idx '
+        'ON booking_booking USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS booking_search_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_alter_tapnexsuperuser_commission_rate_and_more'),
+        ('booking', '0019_daily_revenue_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, help_text='Normalized customer name, email and phone for owner search (maintained by booking/search.py)'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['game_slot', 'id'], name='booking_slot_id_idx'),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def expire_pending_without_expiry(apps, schema_editor):
+    """Expire legacy PENDING bookings that never got a reservation_expires_at
+
+    Bookings created before Booking.save set the expiry reliably can't be paid
+    and are never swept. Expire them, then recompute reserved_spots for their
+    slots from the remaining reservations (0013 may have counted them).
+    """
+    Booking = apps.get_model('booking', 'Booking')
+    SlotAvailability = apps.get_model('booking', 'SlotAvailability')
+
+    stale = Booking.objects.filter(status='PENDING', reservation_expires_at__isnull=True)
+    slot_ids = set(stale.exclude(game_slot__isnull=True).values_list('game_slot_id', flat=True))
+    stale.update(status='EXPIRED', is_reservation_expired=True)
+
+    for game_slot_id in slot_ids:
+        total = Booking.objects.filter(status='PENDING', game_slot_id=game_slot_id).aggregate(
+            total=Sum('spots_booked')
+        )['total']
+        SlotAvailability.objects.filter(game_slot_id=game_slot_id).update(reserved_spots=total or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0020_booking_search_and_keyset'),
+    ]
+
+    operations = [
+        migrations.RunPython(expire_pending_without_expiry, migrations.RunPython.noop),
+    ]
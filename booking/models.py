@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
 from django.utils import timezone
 from authentication.models import Customer
@@ -108,6 +109,68 @@ class Game(models.Model):
         SlotGenerator.generate_slots_for_game(self, start_date, end_date)
 
 
+class GameSlotQuerySet(models.QuerySet):
+    """QuerySet helpers for the slot listing endpoints"""
+    
+    def with_reservation_summary(self, now=None):
+        """
+        Annotate slots with their pending-payment reservation summary
+        
+        Reserved and truly available spots come from the denormalized
+        SlotAvailability.reserved_spots counter; pending_private_count and
+        pending_shared_count are EXISTS-style subquery counts on the
+        (game_slot, status) index, so the slot query needs no join or GROUP BY
+        over bookings. Active pending bookings are prefetched into
+        pending_reservations, so availability reads for a whole day cost a
+        constant number of queries instead of one per slot.
+        
+        Args:
+            now: Reference time for reservation expiry (defaults to timezone.now())
+        """
+        from django.db.models import Case, Count, F, IntegerField, OuterRef, Prefetch, Subquery, Value, When
+        from django.db.models.functions import Coalesce, Greatest
+        
+        now = now or timezone.now()
+        
+        def pending_count(booking_type):
+            return Coalesce(
+                Subquery(
+                    Booking.objects.filter(
+                        game_slot=OuterRef('pk'),
+                        status='PENDING',
+                        booking_type=booking_type,
+                        reservation_expires_at__gt=now
+                    ).order_by().values('game_slot').annotate(total=Count('pk')).values('total'),
+                    output_field=IntegerField()
+                ),
+                0
+            )
+        
+        return self.annotate(
+            reserved_spots=Coalesce(F('availability__reserved_spots'), 0),
+            pending_private_count=pending_count('PRIVATE'),
+            pending_shared_count=pending_count('SHARED'),
+            truly_available_spots=Greatest(
+                Case(
+                    When(availability__is_private_booked=True, then=Value(0)),
+                    default=F('availability__total_capacity') - F('availability__booked_spots'),
+                    output_field=IntegerField()
+                ) - Coalesce(F('availability__reserved_spots'), 0),
+                Value(0),
+                output_field=IntegerField()
+            )
+        ).prefetch_related(
+            Prefetch(
+                'bookings',
+                queryset=Booking.objects.filter(
+                    status='PENDING',
+                    reservation_expires_at__gt=now
+                ).order_by('reservation_expires_at'),
+                to_attr='pending_reservations'
+            )
+        )
+
+
 class GameSlot(models.Model):
     """Time slots for games (auto-generated + custom)"""
     
@@ -121,6 +184,8 @@ class GameSlot(models.Model):
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = GameSlotQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['game', 'date', 'start_time']
         ordering = ['date', 'start_time']
@@ -154,7 +219,15 @@ class SlotAvailability(models.Model):
     game_slot = models.OneToOneField(GameSlot, on_delete=models.CASCADE, related_name='availability')
     total_capacity = models.PositiveIntegerField()
     booked_spots = models.PositiveIntegerField(default=0)
+    reserved_spots = models.PositiveIntegerField(
+        default=0,
+        help_text="Spots held by PENDING bookings awaiting payment (maintained by Booking.update_slot_availability)"
+    )
     is_private_booked = models.BooleanField(default=False)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Incremented on every counter change (optimistic concurrency token)"
+    )
     
     class Meta:
         verbose_name = "Slot Availability"
@@ -166,10 +239,21 @@ class SlotAvailability(models.Model):
     def __str__(self):
         return f"{self.game_slot} - {self.available_spots}/{self.total_capacity} available"
     
+    def _get_slot_summary(self, name):
+        """Read an annotation from GameSlot.objects.with_reservation_summary() if it was loaded"""
+        if SlotAvailability.game_slot.is_cached(self):
+            return getattr(self.game_slot, name, None)
+        return None
+    
     def get_pending_reservations(self):
         """Get active pending reservations for this slot"""
         from django.utils import timezone
         
+        # Use the bulk-prefetched list when the slot came from with_reservation_summary()
+        pending = self._get_slot_summary('pending_reservations')
+        if pending is not None:
+            return pending
+        
         # Get all PENDING bookings that haven't expired
         pending_bookings = self.game_slot.bookings.filter(
             status='PENDING',
@@ -179,27 +263,26 @@ class SlotAvailability(models.Model):
         return pending_bookings
     
     def get_reserved_spots_count(self):
-        """Get count of spots currently reserved by pending payments (uses prefetched data)"""
-        from django.utils import timezone
-        
-        # Use prefetched bookings if available (much faster)
-        try:
-            bookings = self.game_slot.bookings.all()
-            # Filter in Python to use prefetched data
-            reserved = sum(
-                b.spots_booked for b in bookings 
-                if b.status == 'PENDING' and b.reservation_expires_at > timezone.now()
-            )
-            return reserved
-        except AttributeError:
-            # Fallback to query if not prefetched
-            pending_bookings = self.get_pending_reservations()
-            return sum(booking.spots_booked for booking in pending_bookings)
+        """Get count of spots currently reserved by pending payments (denormalized counter)"""
+        return self.reserved_spots
     
     def get_truly_available_spots(self):
         """Get spots that are neither booked nor reserved"""
-        reserved = self.get_reserved_spots_count()
-        return max(0, self.available_spots - reserved)
+        return max(0, self.available_spots - self.reserved_spots)
+    
+    def recalculate_reserved_spots(self):
+        """Recompute the reserved_spots counter from PENDING bookings (used for reconciliation)
+        
+        Bookings without a reservation expiry are skipped: they can't be paid and the
+        sweeper never releases them, so counting them would hold their spots forever.
+        """
+        from django.db.models import Sum
+        
+        return self.game_slot.bookings.filter(
+            status='PENDING', reservation_expires_at__isnull=False
+        ).aggregate(
+            total=Sum('spots_booked')
+        )['total'] or 0
     
     @property
     def available_spots(self):
@@ -217,9 +300,15 @@ class SlotAvailability(models.Model):
         return not self.is_private_booked and self.available_spots > 0
     
     def save(self, *args, **kwargs):
-        """Set total capacity from game on creation"""
+        """Set total capacity from game on creation; bump the version on updates
+        so optimistic writers (and slot ETags) notice the change"""
         if not self.pk:
             self.total_capacity = self.game_slot.game.capacity
+        elif not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'version' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'version']
         super().save(*args, **kwargs)
 
 
@@ -489,6 +578,11 @@ class Booking(models.Model):
     
     # Additional Information
     notes = models.TextField(blank=True, help_text="Additional notes for the booking")
+    search_text = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Normalized customer name, email and phone for owner search (maintained by booking/search.py)"
+    )
     
     # Backward Compatibility (DEPRECATED - will be removed)
     gaming_station = models.ForeignKey(
@@ -524,6 +618,7 @@ class Booking(models.Model):
             models.Index(fields=['customer', 'status'], name='booking_customer_status_idx'),
             models.Index(fields=['game', 'status'], name='booking_game_status_idx'),
             models.Index(fields=['customer', '-created_at'], name='booking_customer_created_idx'),
+            models.Index(fields=['game_slot', 'id'], name='booking_slot_id_idx'),
         ]
     
     def __str__(self):
@@ -613,6 +708,34 @@ class Booking(models.Model):
         remaining = (self.reservation_expires_at - timezone.now()).total_seconds()
         return max(0, int(remaining))
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the status (and revenue fields) as loaded so save() can detect transitions without re-reading the row"""
+        from .revenue_rollup import revenue_snapshot
+        
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_revenue = revenue_snapshot(instance.__dict__)
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Keep the loaded-status and revenue snapshots in step with refreshed data"""
+        from .revenue_rollup import revenue_snapshot
+        
+        if fields is not None:
+            fields = list(fields)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or 'status' in fields:
+            self._loaded_status = self.__dict__.get('status')
+        
+        # Only the refreshed fields are stored values; anything else in __dict__ may be
+        # an unsaved edit (e.g. save() loading a deferred total_amount mid-write)
+        refreshed = self.__dict__ if fields is None else {
+            name: value for name, value in self.__dict__.items()
+            if name in fields or name.removesuffix('_id') in fields
+        }
+        self._loaded_revenue = revenue_snapshot(refreshed, base=getattr(self, '_loaded_revenue', None))
+    
     def save(self, *args, **kwargs):
         """Override save to calculate total amount and update availability"""
         from django.utils import timezone
@@ -626,20 +749,40 @@ class Booking(models.Model):
                 self.total_amount = self.calculate_total_amount()
         
         # Set reservation expiry time for new PENDING bookings
-        is_new = self.pk is None
+        # (the UUID primary key is assigned on instantiation, so self.pk can't tell us)
+        is_new = self._state.adding
         if is_new and self.status == 'PENDING' and not self.reservation_expires_at:
             # Set expiry to 5 minutes from now
             self.reservation_expires_at = timezone.now() + timedelta(minutes=5)
         
+        # Customer text for the owner bookings search (later customer edits are applied by signals)
+        if is_new and not self.search_text and self.customer_id:
+            from .search import customer_search_text
+            self.search_text = customer_search_text(self.customer)
+        
         # Update slot availability when booking is confirmed
         old_status = None
         if not is_new:
-            # Only get old booking if it exists (updating existing booking)
-            try:
-                old_booking = Booking.objects.get(pk=self.pk)
-                old_status = old_booking.status
-            except Booking.DoesNotExist:
-                pass
+            # Status captured when the instance was loaded (see from_db)
+            old_status = getattr(self, '_loaded_status', None)
+            if old_status is None:
+                # Not loaded from the database, or status was deferred
+                old_status = Booking.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+            
+            # Revenue fields the rollup signal compares against; only re-read when the
+            # write can change them and they weren't all loaded
+            from .revenue_rollup import REVENUE_FIELDS, revenue_snapshot
+            loaded_revenue = getattr(self, '_loaded_revenue', None) or {}
+            update_fields = kwargs.get('update_fields')
+            touches_revenue = update_fields is None or not set(update_fields).isdisjoint(REVENUE_FIELDS)
+            if touches_revenue and len(loaded_revenue) < len(REVENUE_FIELDS):
+                stored = Booking.objects.filter(pk=self.pk).values(*REVENUE_FIELDS).first() or {}
+                self._loaded_revenue = revenue_snapshot(stored, base=loaded_revenue)
+        
+        # Exposed to the pre_save history signal; the snapshot moves forward before
+        # writing so saves made from post_save handlers compare against this status
+        self._status_before_save = old_status
+        self._loaded_status = self.status
         
         super().save(*args, **kwargs)
         
@@ -653,10 +796,38 @@ class Booking(models.Model):
         Args:
             old_status: Previous status of the booking (if updating existing booking)
         """
-        availability, created = SlotAvailability.objects.get_or_create(
-            game_slot=self.game_slot,
-            defaults={'total_capacity': self.game.capacity}
-        )
+        from django.db import transaction
+        
+        if getattr(self, '_reservation_claimed', False) and old_status is None:
+            # Spots were already claimed by BookingService.create_shared_booking_optimistic
+            self._reservation_claimed = False
+        else:
+            with transaction.atomic():
+                # Lock the row so concurrent status changes can't overwrite each other's counts
+                availability, created = SlotAvailability.objects.select_for_update().get_or_create(
+                    game_slot=self.game_slot,
+                    # Callable: the game is only loaded when the row has to be created
+                    defaults={'total_capacity': lambda: self.game.capacity}
+                )
+                
+                self._apply_availability_change(availability, old_status)
+                availability.save()
+        
+        # Drop the cached availability snapshot for this slot's day
+        from .availability_cache import invalidate_availability
+        invalidate_availability(self.game_slot.game_id, self.game_slot.date)
+        
+        # Broadcast real-time update (coalesced with the booking's other changes, sent after commit)
+        from .availability_broadcast import queue_availability_broadcast
+        queue_availability_broadcast(self.game_slot_id)
+    
+    def _apply_availability_change(self, availability, old_status):
+        """Apply this booking's status transition to a (locked) SlotAvailability row"""
+        # Pending reservations are tracked in the denormalized reserved_spots counter
+        if self.status == 'PENDING' and old_status is None:
+            availability.reserved_spots += self.spots_booked
+        elif old_status == 'PENDING' and self.status != 'PENDING':
+            availability.reserved_spots = max(0, availability.reserved_spots - self.spots_booked)
         
         if self.status in ['CONFIRMED', 'IN_PROGRESS']:
             # Add booking to availability (permanent)
@@ -670,7 +841,7 @@ class Booking(models.Model):
                     availability.booked_spots += self.spots_booked
         elif self.status == 'PENDING':
             # PENDING bookings reserve spots temporarily
-            # These are tracked separately via get_reserved_spots_count()
+            # These are tracked in reserved_spots above
             # Don't modify booked_spots for PENDING bookings
             pass
         elif self.status in ['CANCELLED', 'NO_SHOW', 'EXPIRED']:
@@ -683,12 +854,6 @@ class Booking(models.Model):
                 else:  # SHARED
                     availability.booked_spots = max(0, availability.booked_spots - self.spots_booked)
             # If old_status was PENDING, no need to modify booked_spots
-        
-        availability.save()
-        
-        # Broadcast real-time update
-        from .realtime_service import RealTimeService
-        RealTimeService.broadcast_availability_update(self.game_slot.id)
     
     def clean(self):
         """Validate booking data"""
@@ -798,4 +963,258 @@ class Notification(models.Model):
         if not self.is_read:
             self.is_read = True
             self.read_at = timezone.now()
-            self.save()
\ No newline at end of file
+            self.save()
+
+class WorkerLease(models.Model):
+    """Time-limited lease row so only one node runs a background job at a time"""
+    
+    name = models.CharField(max_length=100, unique=True, help_text="Job name (e.g., 'slot_maintenance')")
+    holder = models.CharField(max_length=200, help_text="Identifier of the process holding the lease (host:pid)")
+    acquired_at = models.DateTimeField()
+    expires_at = models.DateTimeField(help_text="Lease is free for other workers after this time")
+    
+    class Meta:
+        verbose_name = "Worker Lease"
+        verbose_name_plural = "Worker Leases"
+    
+    def __str__(self):
+        return f"{self.name} held by {self.holder} until {self.expires_at}"
+    
+    @classmethod
+    def acquire(cls, name, holder, ttl_seconds):
+        """
+        Try to take (or renew) the named lease
+        
+        Args:
+            name: Lease name
+            holder: Identifier of the calling process
+            ttl_seconds: How long the lease stays valid without renewal
+        
+        Returns:
+            bool: True if the caller now holds the lease
+        """
+        from django.db import IntegrityError, transaction
+        from django.db.models import Q
+        
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        
+        # Single conditional UPDATE: succeeds only if the lease expired or we already hold it
+        updated = cls.objects.filter(name=name).filter(
+            Q(expires_at__lte=now) | Q(holder=holder)
+        ).update(holder=holder, acquired_at=now, expires_at=expires_at)
+        
+        if updated:
+            return True
+        
+        try:
+            with transaction.atomic():
+                cls.objects.create(name=name, holder=holder, acquired_at=now, expires_at=expires_at)
+            return True
+        except IntegrityError:
+            # Another worker holds a live lease
+            return False
+    
+    @classmethod
+    def release(cls, name, holder):
+        """Release the named lease if the caller still holds it"""
+        cls.objects.filter(name=name, holder=holder).update(expires_at=timezone.now())
+
+
+class RealtimeEvent(models.Model):
+    """
+    Durable, append-only realtime event log shared by all workers
+    
+    Each publish is one INSERT and the auto-increment id is the event's
+    sequence number, so readers page through the log with id > n (the
+    availability SSE stream uses it as the event id). Rows older than
+    REALTIME_EVENT_RETENTION are deleted by prune_realtime_events.
+    """
+    
+    event_type = models.CharField(max_length=50, help_text="e.g. 'availability_update', 'booking_update', 'game_update'")
+    # Plain ids rather than foreign keys: log rows outlive the objects they describe
+    game_id = models.UUIDField(null=True, blank=True, help_text="Game the event belongs to, if any")
+    key = models.CharField(max_length=100, blank=True, help_text="Id of the slot, game or booking the event is about")
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        verbose_name = "Realtime Event"
+        verbose_name_plural = "Realtime Events"
+        indexes = [
+            models.Index(fields=['event_type', 'id'], name='rtevent_type_id_idx'),
+            models.Index(fields=['game_id', 'id'], name='rtevent_game_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.event_type} {self.key}"
+
+
+class NotificationJob(models.Model):
+    """
+    Outgoing notification (Telegram message or email) waiting to be delivered
+    
+    Notification services enqueue a job and return; the process_notification_jobs
+    worker delivers it, retrying with exponential backoff until max_attempts,
+    after which the job is dead-lettered (status DEAD) for inspection or requeue.
+    idempotency_key is unique, so enqueueing the same notification twice (e.g.
+    from both the payment callback and the webhook) creates one job.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('DEAD', 'Dead (gave up)'),
+    ]
+    
+    kind = models.CharField(max_length=50, help_text="Handler name (e.g., 'telegram_new_booking')")
+    idempotency_key = models.CharField(max_length=200, unique=True)
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notification_jobs'
+    )
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=6)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time")
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Lease of the worker running the job")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Notification Job"
+        verbose_name_plural = "Notification Jobs"
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='notifjob_status_run_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+
+class RazorpayWebhookEvent(models.Model):
+    """
+    Raw Razorpay webhook delivery, stored before it is applied
+    
+    The webhook view only verifies the signature and inserts the row (a
+    redelivery with the same Razorpay event id is ignored by the unique
+    constraint), so it answers in milliseconds. The process_razorpay_webhooks
+    worker applies events in order per ordering_key (the Razorpay order, or the
+    booking for transfer events). Resetting status to PENDING replays an event.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PROCESSED', 'Processed'),
+        ('FAILED', 'Failed (gave up)'),
+    ]
+    
+    event_id = models.CharField(max_length=100, unique=True, help_text="X-Razorpay-Event-Id header")
+    event = models.CharField(max_length=50, help_text="e.g. 'payment.captured'")
+    ordering_key = models.CharField(max_length=100, blank=True, help_text="Events with the same key are applied in order")
+    event_created_at = models.BigIntegerField(default=0, help_text="Razorpay's created_at (unix seconds)")
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Razorpay Webhook Event"
+        verbose_name_plural = "Razorpay Webhook Events"
+        indexes = [
+            models.Index(fields=['status', 'event_created_at', 'id'], name='rzp_webhook_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} {self.event_id} ({self.status})"
+
+
+class DailyRevenueRollupQuerySet(models.QuerySet):
+    """Aggregations over revenue rollups for the owner and TapNex dashboards"""
+    
+    SUM_FIELDS = ('booking_count', 'gross_amount', 'subtotal', 'platform_fee', 'commission_amount', 'owner_payout')
+    
+    def between(self, start_date, end_date):
+        """Rollups for an inclusive date range"""
+        return self.filter(date__gte=start_date, date__lte=end_date)
+    
+    def totals(self):
+        """
+        Sum every measure over the queryset
+        
+        Returns:
+            dict: {'booking_count': int, 'gross_amount': Decimal, ...} (zero when empty)
+        """
+        from django.db.models import Sum
+        
+        totals = self.aggregate(**{field: Sum(field) for field in self.SUM_FIELDS})
+        return {
+            field: totals[field] or (0 if field == 'booking_count' else Decimal('0.00'))
+            for field in self.SUM_FIELDS
+        }
+    
+    def grouped(self, *fields):
+        """
+        Sum every measure per value of the given fields (e.g. 'date', 'game__name')
+        
+        Returns:
+            QuerySet: values(*fields) rows with the summed measures, ordered by fields
+        """
+        from django.db.models import Sum
+        
+        return self.values(*fields).annotate(
+            **{f'total_{field}': Sum(field) for field in self.SUM_FIELDS}
+        ).order_by(*fields)
+
+
+class DailyRevenueRollup(models.Model):
+    """
+    Paid-booking revenue pre-aggregated per day, game, booking type and payment method
+    
+    A booking counts once its payment_status is PAID, on its created_at date
+    (local time). Booking.save() applies each booking's change as an F()
+    increment on its row, and deleting a paid booking subtracts it, so the
+    dashboards sum a few rows per day instead of scanning bookings.
+    rebuild_revenue_rollups recomputes the table from bookings.
+    """
+    
+    PAYMENT_METHODS = [
+        ('RAZORPAY', 'Razorpay'),
+        ('OTHER', 'Other'),
+    ]
+    
+    date = models.DateField()
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, blank=True, related_name='revenue_rollups')
+    booking_type = models.CharField(max_length=10, choices=Booking.BOOKING_TYPES)
+    payment_method = models.CharField(max_length=20, choices=PAYMENT_METHODS)
+    booking_count = models.IntegerField(default=0)
+    gross_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'), help_text="Sum of total_amount")
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    platform_fee = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    commission_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    owner_payout = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = DailyRevenueRollupQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Daily Revenue Rollup"
+        verbose_name_plural = "Daily Revenue Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'game', 'booking_type', 'payment_method'],
+                name='revenue_rollup_key_uniq'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.game_id} {self.booking_type}/{self.payment_method}: {self.booking_count} booking(s)"
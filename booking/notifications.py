@@ -9,115 +9,107 @@ logger = logging.getLogger(__name__)
 
 
 class NotificationService:
-    """Service for handling booking notifications"""
+    """
+    Service for handling booking notifications
+    
+    Emails are queued (see job_queue.py) and sent by the
+    process_notification_jobs worker; these methods return immediately.
+    """
     
     @staticmethod
     def send_booking_confirmation_email(booking):
-        """Send booking confirmation email to customer"""
-        try:
-            subject = f'Booking Confirmation - {booking.gaming_station.name}'
-            
-            # Render email template
-            html_message = render_to_string('booking/emails/confirmation.html', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            plain_message = render_to_string('booking/emails/confirmation.txt', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[booking.customer.user.email],
-                fail_silently=False,
-            )
-            
-            logger.info(f"Booking confirmation email sent to {booking.customer.user.email} for booking {booking.id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send booking confirmation email for booking {booking.id}: {str(e)}")
-            return False
+        """Queue booking confirmation email to customer"""
+        return NotificationService._queue_email('email_booking_confirmation', 'confirmation', booking)
     
     @staticmethod
     def send_booking_cancellation_email(booking):
-        """Send booking cancellation email to customer"""
-        try:
-            subject = f'Booking Cancelled - {booking.gaming_station.name}'
-            
-            # Render email template
-            html_message = render_to_string('booking/emails/cancellation.html', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            plain_message = render_to_string('booking/emails/cancellation.txt', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[booking.customer.user.email],
-                fail_silently=False,
-            )
-            
-            logger.info(f"Booking cancellation email sent to {booking.customer.user.email} for booking {booking.id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send booking cancellation email for booking {booking.id}: {str(e)}")
-            return False
+        """Queue booking cancellation email to customer"""
+        return NotificationService._queue_email('email_booking_cancellation', 'cancellation', booking)
     
     @staticmethod
     def send_booking_reminder_email(booking):
-        """Send booking reminder email to customer"""
+        """Queue booking reminder email to customer"""
+        return NotificationService._queue_email('email_booking_reminder', 'reminder', booking)
+    
+    @staticmethod
+    def _queue_email(kind, template_name, booking):
+        """Queue one email per booking and template; returns True if queued (or already queued)"""
+        from .job_queue import enqueue
+        
         try:
-            subject = f'Gaming Session Reminder - {booking.gaming_station.name}'
-            
-            # Render email template
-            html_message = render_to_string('booking/emails/reminder.html', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            plain_message = render_to_string('booking/emails/reminder.txt', {
-                'booking': booking,
-                'customer': booking.customer,
-                'user': booking.customer.user,
-            })
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[booking.customer.user.email],
-                fail_silently=False,
-            )
-            
-            logger.info(f"Booking reminder email sent to {booking.customer.user.email} for booking {booking.id}")
+            enqueue(kind, f'email:{template_name}:{booking.id}', booking=booking)
             return True
-            
         except Exception as e:
-            logger.error(f"Failed to send booking reminder email for booking {booking.id}: {str(e)}")
+            logger.error(f"Failed to queue booking {template_name} email for booking {booking.id}: {str(e)}")
             return False
+    
+    @staticmethod
+    def deliver_booking_email(booking, subject, template_name):
+        """
+        Render and send a booking email (raises on failure so the job is retried)
+        
+        Args:
+            booking: Booking instance
+            subject: Email subject
+            template_name: Template base name under booking/emails/ ('confirmation', ...)
+        """
+        recipient = booking.customer.user.email
+        if not recipient:
+            logger.warning(f"No email address for booking {booking.id}; skipping {template_name} email")
+            return
+        
+        context = {
+            'booking': booking,
+            'customer': booking.customer,
+            'user': booking.customer.user,
+        }
+        
+        # Render email template
+        html_message = render_to_string(f'booking/emails/{template_name}.html', context)
+        plain_message = render_to_string(f'booking/emails/{template_name}.txt', context)
+        
+        # Send email
+        send_mail(
+            subject=subject,
+            message=plain_message,
+            html_message=html_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[recipient],
+            fail_silently=False,
+        )
+        
+        logger.info(f"Booking {template_name} email sent to {recipient} for booking {booking.id}")
+
+
+def _venue_name(booking):
+    """Game name for slot bookings, station name for legacy station bookings"""
+    if booking.game:
+        return booking.game.name
+    return booking.gaming_station.name if booking.gaming_station else 'Gaming Cafe'
+
+
+def deliver_booking_confirmation_email(job):
+    """Job handler: send a queued booking confirmation email"""
+    booking = job.booking
+    NotificationService.deliver_booking_email(
+        booking, f'Booking Confirmation - {_venue_name(booking)}', 'confirmation'
+    )
+
+
+def deliver_booking_cancellation_email(job):
+    """Job handler: send a queued booking cancellation email"""
+    booking = job.booking
+    NotificationService.deliver_booking_email(
+        booking, f'Booking Cancelled - {_venue_name(booking)}', 'cancellation'
+    )
+
+
+def deliver_booking_reminder_email(job):
+    """Job handler: send a queued booking reminder email"""
+    booking = job.booking
+    NotificationService.deliver_booking_email(
+        booking, f'Gaming Session Reminder - {_venue_name(booking)}', 'reminder'
+    )
 
 
 class InAppNotification:
@@ -0,0 +1,196 @@
+"""
+Keyset (seek) pagination
+Pages through a queryset ordered newest first by a tuple of columns, using the
+last row of the current page as an opaque cursor instead of an OFFSET, so
+every page costs the same index range scan however deep it is and no
+COUNT(*) is needed.
+
+Cursors are URL-safe base64 JSON of the boundary row's key values plus the
+direction; they carry no secrets (ids and dates the owner already sees).
+
+Nullable key columns (e.g. the slot of a legacy station booking) sort as the
+smallest value: NULLS LAST newest first, and the seek treats NULL accordingly.
+
+Usage:
+    page = keyset_page(bookings, BOOKING_KEYSET, request.GET.get('cursor'), per_page=25)
+    page.next_cursor, page.previous_cursor
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, time
+
+from django.db.models import F, Q
+
+# Owner bookings order: slot date, slot start time, booking id (all descending);
+# each entry is (field, parser, nullable) and legacy bookings have no slot
+BOOKING_KEYSET = (
+    ('game_slot__date', date.fromisoformat, True),
+    ('game_slot__start_time', time.fromisoformat, True),
+    ('id', uuid.UUID, False),
+)
+
+NEXT = 'next'
+PREVIOUS = 'prev'
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset"""
+    
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+    
+    def __iter__(self):
+        return iter(self.object_list)
+    
+    def __len__(self):
+        return len(self.object_list)
+    
+    def has_next(self):
+        return self.next_cursor is not None
+    
+    def has_previous(self):
+        return self.previous_cursor is not None
+    
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(values, direction):
+    """Opaque cursor for a boundary row's key values"""
+    payload = json.dumps([
+        direction,
+        [value if value is None else value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in values],
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keyset):
+    """
+    Key values and direction from a cursor
+    
+    Returns:
+        tuple: (direction, values), or None for a missing or malformed cursor
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in (NEXT, PREVIOUS) or len(raw_values) != len(keyset):
+            return None
+        values = [
+            None if raw is None and nullable else parse(raw)
+            for (_, parse, nullable), raw in zip(keyset, raw_values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    return direction, values
+
+
+def _key_values(obj, keyset):
+    values = []
+    for field, _, _ in keyset:
+        value = obj
+        for part in field.split('__'):
+            value = getattr(value, part)
+            if value is None:
+                break
+        values.append(value)
+    return values
+
+
+def _compare(field, operator, value, nullable):
+    """
+    Q for field < value (operator 'lt') or field > value ('gt'), NULL being smallest
+    
+    Returns:
+        Q, or None if no row can match (nothing is smaller than NULL)
+    """
+    if value is None:
+        return Q(**{f'{field}__isnull': False}) if operator == 'gt' else None
+    condition = Q(**{f'{field}__{operator}': value})
+    if operator == 'lt' and nullable:
+        condition |= Q(**{f'{field}__isnull': True})
+    return condition
+
+
+def _equal(field, value):
+    return Q(**{f'{field}__isnull': True}) if value is None else Q(**{field: value})
+
+
+def _seek_filter(keyset, values, direction):
+    """
+    Rows after (NEXT: smaller keys) or before (PREVIOUS: larger keys) the boundary
+    
+    Expands the row comparison (a, b, c) < (x, y, z) into
+    a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z), plus a
+    redundant bound on the leading column so the index range is used.
+    NULL compares below every value and equal to NULL.
+    """
+    operator = 'lt' if direction == NEXT else 'gt'
+    condition = Q(pk__in=[])
+    for position, (field, _, nullable) in enumerate(keyset):
+        clause = _compare(field, operator, values[position], nullable)
+        if clause is None:
+            continue
+        for (earlier_field, _, _), earlier_value in zip(keyset[:position], values):
+            clause &= _equal(earlier_field, earlier_value)
+        condition |= clause
+    
+    (leading_field, _, leading_nullable), leading_value = keyset[0], values[0]
+    if leading_value is None:
+        leading = _equal(leading_field, None) if operator == 'lt' else Q()
+    else:
+        leading = Q(**{f'{leading_field}__{operator}e': leading_value})
+        if operator == 'lt' and leading_nullable:
+            leading |= Q(**{f'{leading_field}__isnull': True})
+    return leading & condition
+
+
+def keyset_page(queryset, keyset, cursor=None, per_page=25):
+    """
+    Fetch one page of a queryset ordered by the keyset columns, newest first
+    
+    Args:
+        queryset: Unordered or ordered queryset (its ordering is replaced)
+        keyset: ((field, parser, nullable), ...) unique together, e.g. BOOKING_KEYSET
+        cursor: Cursor from a previous page (None or malformed: first page)
+        per_page: Rows per page
+    
+    Returns:
+        KeysetPage
+    """
+    # NULL is the smallest key: last newest first, first oldest first
+    descending = [F(field).desc(nulls_last=True) if nullable else f'-{field}' for field, _, nullable in keyset]
+    ascending = [F(field).asc(nulls_first=True) if nullable else field for field, _, nullable in keyset]
+    
+    decoded = decode_cursor(cursor, keyset)
+    direction = NEXT
+    if decoded:
+        direction, values = decoded
+        queryset = queryset.filter(_seek_filter(keyset, values, direction))
+    
+    # One extra row tells whether there is another page in the same direction
+    ordering = descending if direction == NEXT else ascending
+    rows = list(queryset.order_by(*ordering)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREVIOUS:
+        rows.reverse()
+    
+    if not rows:
+        return KeysetPage(rows)
+    
+    first_key = _key_values(rows[0], keyset)
+    last_key = _key_values(rows[-1], keyset)
+    if direction == NEXT:
+        next_cursor = encode_cursor(last_key, NEXT) if has_more else None
+        previous_cursor = encode_cursor(first_key, PREVIOUS) if decoded else None
+    else:
+        next_cursor = encode_cursor(last_key, NEXT)
+        previous_cursor = encode_cursor(first_key, PREVIOUS) if has_more else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
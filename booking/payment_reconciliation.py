@@ -0,0 +1,253 @@
+"""
+Razorpay payment reconciliation
+Catches bookings whose payment went through at Razorpay but never reached us
+(closed tab before verify, lost webhook). Bookings still PENDING or FAILED
+with a Razorpay order are checked against the order's payments:
+
+- Fetch: order payments are fetched from a thread pool (bounded workers, a
+  shared rate limit), with no database work in the threads
+- Apply: captured payments confirm their booking in batches, one transaction
+  per batch, re-checked under a row lock so a webhook that lands meanwhile
+  wins
+- Report: every checked booking gets an outcome; captured payments on expired
+  or cancelled bookings are flagged for manual review instead of confirmed
+
+Usage:
+    from .payment_reconciliation import reconcile_payments
+    report = reconcile_payments(days=7, workers=4, rate=5)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAYS = 7
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 5  # Razorpay API calls per second
+APPLY_BATCH_SIZE = 50
+
+# Outcomes, in report order
+CONFIRMED = 'confirmed'
+ALREADY_PAID = 'already_paid'
+NEEDS_REVIEW = 'needs_review'
+AUTHORIZED = 'authorized'
+UNPAID = 'unpaid'
+ERROR = 'error'
+OUTCOMES = (CONFIRMED, ALREADY_PAID, NEEDS_REVIEW, AUTHORIZED, UNPAID, ERROR)
+
+
+class RateLimiter:
+    """Token bucket shared by the fetch threads (`rate` calls per second, bursts up to `burst`)"""
+    
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call may go out"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def candidate_bookings(days=DEFAULT_DAYS):
+    """
+    Bookings that may have an unrecorded payment
+    
+    Args:
+        days: Only bookings created in the last `days` days
+    
+    Returns:
+        QuerySet: Booking rows with a Razorpay order and payment PENDING or FAILED
+    """
+    from .models import Booking
+    
+    return Booking.objects.filter(
+        razorpay_order_id__isnull=False,
+        payment_status__in=['PENDING', 'FAILED'],
+        created_at__gte=timezone.now() - timedelta(days=days),
+    ).exclude(razorpay_order_id='').order_by('created_at')
+
+
+def _classify(payments):
+    """(outcome, payment) for an order's payment list"""
+    by_status = {}
+    for payment in payments:
+        by_status.setdefault(payment.get('status'), payment)
+    
+    if 'captured' in by_status:
+        return CONFIRMED, by_status['captured']
+    if 'authorized' in by_status:
+        return AUTHORIZED, by_status['authorized']
+    return UNPAID, None
+
+
+def fetch_outcomes(bookings, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE):
+    """
+    Fetch the Razorpay payments for each booking's order
+    
+    Args:
+        bookings: (booking_id, razorpay_order_id) pairs
+        workers: Concurrent fetch threads
+        rate: Maximum Razorpay calls per second across all threads
+    
+    Returns:
+        dict: {booking_id: (outcome, payment dict or None, error message)}
+    """
+    from .razorpay_service import razorpay_service
+    
+    limiter = RateLimiter(rate)
+    
+    def fetch(order_id):
+        limiter.acquire()
+        return razorpay_service.fetch_order_payments(order_id)
+    
+    bookings = list(bookings)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(fetch, [order_id for _, order_id in bookings])
+        
+        outcomes = {}
+        for (booking_id, _), result in zip(bookings, results):
+            if not result['success']:
+                outcomes[booking_id] = (ERROR, None, result['error'])
+            else:
+                outcome, payment = _classify(result['payments'])
+                outcomes[booking_id] = (outcome, payment, '')
+    
+    return outcomes
+
+
+def apply_confirmations(captured, batch_size=APPLY_BATCH_SIZE):
+    """
+    Confirm bookings whose payment was captured
+    
+    Args:
+        captured: {booking_id: captured payment dict}
+        batch_size: Bookings per transaction
+    
+    Returns:
+        dict: {booking_id: outcome} (CONFIRMED, ALREADY_PAID or NEEDS_REVIEW)
+    """
+    from .models import Booking
+    
+    outcomes = {}
+    confirmed = []
+    booking_ids = list(captured)
+    
+    for start in range(0, len(booking_ids), batch_size):
+        batch_ids = booking_ids[start:start + batch_size]
+        with transaction.atomic():
+            for booking in Booking.objects.select_for_update().filter(id__in=batch_ids).order_by('id'):
+                if booking.payment_status == 'PAID':
+                    # A webhook or the verify call got there first
+                    outcomes[booking.id] = ALREADY_PAID
+                    continue
+                
+                if booking.status not in ('PENDING', 'CONFIRMED'):
+                    # The slot may have been released; a person has to decide (refund or rebook)
+                    outcomes[booking.id] = NEEDS_REVIEW
+                    continue
+                
+                booking.razorpay_payment_id = captured[booking.id]['id']
+                booking.payment_status = 'PAID'
+                booking.status = 'CONFIRMED'
+                should_notify = not booking.owner_notified
+                booking.owner_notified = True
+                booking.save(update_fields=['razorpay_payment_id', 'payment_status', 'status', 'owner_notified'])
+                
+                outcomes[booking.id] = CONFIRMED
+                confirmed.append((booking, should_notify))
+    
+    for booking, should_notify in confirmed:
+        _after_confirmation(booking, should_notify)
+    
+    return outcomes
+
+
+def _after_confirmation(booking, should_notify):
+    """Verification token and notifications, as the verify view does"""
+    from .notifications import NotificationService
+    from .qr_service import QRCodeService
+    from .telegram_service import telegram_service
+    
+    try:
+        QRCodeService.generate_qr_code(booking)
+        if should_notify:
+            telegram_service.send_new_booking_notification(booking)
+        NotificationService.send_booking_confirmation_email(booking)
+    except Exception as e:
+        logger.error(f"Reconciled booking {booking.id} but follow-up failed: {e}")
+
+
+def reconcile_payments(days=DEFAULT_DAYS, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                       batch_size=APPLY_BATCH_SIZE, dry_run=False):
+    """
+    Check unpaid bookings against Razorpay and confirm the ones that were paid
+    
+    Args:
+        days: Only bookings created in the last `days` days
+        workers: Concurrent Razorpay fetch threads
+        rate: Maximum Razorpay calls per second
+        batch_size: Bookings confirmed per transaction
+        dry_run: Fetch and classify, but write nothing
+    
+    Returns:
+        dict: {'checked': int, 'counts': {outcome: int},
+               'rows': [{'booking_id', 'order_id', 'outcome', 'payment_id', 'detail'}]}
+    """
+    bookings = list(candidate_bookings(days).values_list('id', 'razorpay_order_id', 'status'))
+    fetched = fetch_outcomes([(booking_id, order_id) for booking_id, order_id, _ in bookings], workers, rate)
+    
+    captured = {
+        booking_id: payment
+        for booking_id, (outcome, payment, _) in fetched.items()
+        if outcome == CONFIRMED
+    }
+    
+    if dry_run:
+        applied = {
+            booking_id: CONFIRMED if status in ('PENDING', 'CONFIRMED') else NEEDS_REVIEW
+            for booking_id, _, status in bookings
+            if booking_id in captured
+        }
+    else:
+        applied = apply_confirmations(captured, batch_size)
+    
+    rows = []
+    counts = dict.fromkeys(OUTCOMES, 0)
+    for booking_id, order_id, status in bookings:
+        outcome, payment, detail = fetched[booking_id]
+        outcome = applied.get(booking_id, outcome)
+        if outcome == NEEDS_REVIEW:
+            detail = f"payment captured but booking is {status}"
+        counts[outcome] += 1
+        rows.append({
+            'booking_id': booking_id,
+            'order_id': order_id,
+            'outcome': outcome,
+            'payment_id': payment['id'] if payment else '',
+            'detail': detail,
+        })
+    
+    if counts[CONFIRMED] and not dry_run:
+        logger.info(f"Payment reconciliation confirmed {counts[CONFIRMED]} booking(s)")
+    if counts[NEEDS_REVIEW]:
+        logger.warning(f"Payment reconciliation found {counts[NEEDS_REVIEW]} captured payment(s) on closed bookings")
+    
+    return {'checked': len(bookings), 'counts': counts, 'rows': rows}
@@ -16,6 +16,7 @@ from .models import Booking
 from .razorpay_service import razorpay_service
 from .booking_service import BookingService
 from .qr_service import QRCodeService
+from .razorpay_webhooks import ingest_webhook
 import json
 import logging
 
@@ -31,7 +32,7 @@ def create_razorpay_order(request, booking_id):
     POST /booking/payment/create-order/<booking_id>/
     """
     try:
-        from authentication.models import TapNexSuperuser, CafeOwner
+        from authentication.platform_settings import get_platform_settings
         
         # Get booking
         booking = get_object_or_404(
@@ -47,9 +48,9 @@ def create_razorpay_order(request, booking_id):
                 'error': 'Booking is not in pending status'
             }, status=400)
         
-        # Get TapNex settings for commission/platform fee rates
-        tapnex_user = TapNexSuperuser.objects.first()
-        if not tapnex_user:
+        # Get TapNex settings for commission/platform fee rates (cached snapshot)
+        platform_settings = get_platform_settings()
+        if not platform_settings.is_configured:
             logger.error("TapNex superuser not found - commission and platform fee must be configured")
             return JsonResponse({
                 'success': False,
@@ -57,20 +58,16 @@ def create_razorpay_order(request, booking_id):
             }, status=500)
         
         # Get commission and platform fee rates from superuser settings
-        commission_rate = float(tapnex_user.commission_rate)
-        
-        if tapnex_user.platform_fee_type == 'PERCENT':
-            platform_fee_rate = float(tapnex_user.platform_fee)
-        else:
-            # For FIXED type, pass the fixed amount directly
-            platform_fee_rate = float(tapnex_user.platform_fee)
+        # (for FIXED type the platform fee is the fixed amount itself)
+        commission_rate = float(platform_settings.commission_rate)
+        platform_fee_rate = float(platform_settings.platform_fee)
         
         # Calculate payment split
         split = razorpay_service.calculate_payment_split(
             booking.subtotal,  # Base booking amount
             commission_rate=commission_rate,  # From superuser settings
             platform_fee_rate=platform_fee_rate,  # From superuser settings
-            platform_fee_type=tapnex_user.platform_fee_type
+            platform_fee_type=platform_settings.platform_fee_type
         )
         
         # Update booking with calculated amounts
@@ -81,10 +78,8 @@ def create_razorpay_order(request, booking_id):
         booking.save(update_fields=['platform_fee', 'total_amount', 'commission_amount', 'owner_payout'])
         
         # Get cafe owner's Razorpay account (if configured)
-        cafe_owner = CafeOwner.objects.first()
-        owner_account_id = None
-        if cafe_owner and cafe_owner.razorpay_account_id:
-            owner_account_id = cafe_owner.razorpay_account_id
+        owner_account_id = platform_settings.owner_razorpay_account_id or None
+        if owner_account_id:
             logger.info(f"Using Razorpay account {owner_account_id} for transfer")
         
         # Create Razorpay order (with transfer if account configured)
@@ -202,15 +197,15 @@ def verify_razorpay_payment(request):
         
         # Create transfer to owner if not done during order creation
         # (This happens if transfer was not included in order due to account not configured)
-        from authentication.models import CafeOwner
-        cafe_owner = CafeOwner.objects.first()
+        from authentication.platform_settings import get_platform_settings
+        owner_account_id = get_platform_settings().owner_razorpay_account_id
         
-        if cafe_owner and cafe_owner.razorpay_account_id and not booking.razorpay_transfer_id:
+        if owner_account_id and not booking.razorpay_transfer_id:
             try:
                 # Create transfer to owner
                 transfer_result = razorpay_service.create_transfer(
                     razorpay_payment_id,
-                    cafe_owner.razorpay_account_id,
+                    owner_account_id,
                     int(booking.owner_payout * 100),  # Convert to paise
                     str(booking.id),
                     notes={
@@ -241,7 +236,7 @@ def verify_razorpay_payment(request):
             try:
                 from booking.telegram_service import telegram_service
                 telegram_service.send_new_booking_notification(booking)
-                logger.info(f"Telegram notification sent for booking {booking_id}")
+                logger.info(f"Telegram notification queued for booking {booking_id}")
             except Exception as e:
                 logger.error(f"Failed to send Telegram notification for booking {booking_id}: {e}")
                 # Don't fail the payment if notification fails
@@ -253,7 +248,7 @@ def verify_razorpay_payment(request):
             from booking.notifications import NotificationService, InAppNotification
             NotificationService.send_booking_confirmation_email(booking)
             InAppNotification.notify_booking_confirmed(booking)
-            logger.info(f"Confirmation email and notification sent for booking {booking_id}")
+            logger.info(f"Confirmation email queued and notification created for booking {booking_id}")
         except Exception as e:
             logger.error(f"Failed to send confirmation email/notification for booking {booking_id}: {e}")
             # Don't fail the payment if notification fails
@@ -278,15 +273,20 @@ def verify_razorpay_payment(request):
 @require_http_methods(["POST"])
 def razorpay_webhook(request):
     """
-    Handle Razorpay webhooks
+    Receive Razorpay webhooks
     
     POST /booking/payment/webhook/
     
+    Verifies the signature, stores the event (see razorpay_webhooks.py) and
+    answers 200 at once; the process_razorpay_webhooks worker applies it.
+    Redeliveries of a stored event are ignored.
+    
     Events handled:
     - payment.authorized - Payment authorized by bank
     - payment.captured - Payment successfully captured
     - payment.failed - Payment attempt failed
     - order.paid - Order fully paid
+    - transfer.processed / transfer.failed / transfer.reversed - Owner payouts
     
     NOTE: Refunds are not supported - All sales are final
     """
@@ -311,37 +311,18 @@ def razorpay_webhook(request):
         else:
             logger.warning("Webhook secret not configured - skipping signature verification")
         
-        # Parse webhook data
-        webhook_data = json.loads(request.body)
-        event = webhook_data.get('event')
-        payload = webhook_data.get('payload', {})
-        payment_entity = payload.get('payment', {}).get('entity', {})
-        order_entity = payload.get('order', {}).get('entity', {})
+        try:
+            event = ingest_webhook(request.body, request.headers.get('X-Razorpay-Event-Id'))
+        except ValueError as e:
+            logger.warning(f"Malformed webhook body: {e}")
+            return HttpResponse(status=400)
         
         logger.info(f"Received Razorpay webhook: {event}")
         
-        # Handle payment events only (no refunds)
-        if event == 'payment.authorized':
-            handle_payment_authorized(payment_entity)
-        elif event == 'payment.captured':
-            handle_payment_captured(payment_entity)
-        elif event == 'payment.failed':
-            handle_payment_failed(payment_entity)
-        elif event == 'order.paid':
-            handle_order_paid(order_entity)
-        elif event == 'transfer.processed':
-            handle_transfer_processed(payload.get('transfer', {}).get('entity', {}))
-        elif event == 'transfer.failed':
-            handle_transfer_failed(payload.get('transfer', {}).get('entity', {}))
-        elif event == 'transfer.reversed':
-            handle_transfer_reversed(payload.get('transfer', {}).get('entity', {}))
-        else:
-            logger.info(f"Unhandled webhook event: {event}")
-        
         return HttpResponse(status=200)
         
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
+        logger.error(f"Error storing webhook: {str(e)}")
         return HttpResponse(status=500)
 
 
@@ -369,6 +350,7 @@ def handle_payment_authorized(payment_entity):
         
     except Exception as e:
         logger.error(f"Error handling payment.authorized: {str(e)}")
+        raise
 
 
 def handle_payment_captured(payment_entity):
@@ -413,7 +395,7 @@ def handle_payment_captured(payment_entity):
                 try:
                     from booking.telegram_service import telegram_service
                     telegram_service.send_new_booking_notification(booking)
-                    logger.info(f"Telegram notification sent for booking {booking.id}")
+                    logger.info(f"Telegram notification queued for booking {booking.id}")
                 except Exception as e:
                     logger.error(f"Failed to send Telegram notification for booking {booking.id}: {e}")
             else:
@@ -426,6 +408,7 @@ def handle_payment_captured(payment_entity):
         
     except Exception as e:
         logger.error(f"Error handling payment.captured: {str(e)}")
+        raise
 
 
 def handle_payment_failed(payment_entity):
@@ -453,6 +436,7 @@ def handle_payment_failed(payment_entity):
         
     except Exception as e:
         logger.error(f"Error handling payment.failed: {str(e)}")
+        raise
 
 
 def handle_order_paid(order_entity):
@@ -494,7 +478,7 @@ def handle_order_paid(order_entity):
                 try:
                     from booking.telegram_service import telegram_service
                     telegram_service.send_new_booking_notification(booking)
-                    logger.info(f"Telegram notification sent for booking {booking.id}")
+                    logger.info(f"Telegram notification queued for booking {booking.id}")
                 except Exception as e:
                     logger.error(f"Failed to send Telegram notification for booking {booking.id}: {e}")
             else:
@@ -506,6 +490,7 @@ def handle_order_paid(order_entity):
         
     except Exception as e:
         logger.error(f"Error handling order.paid: {str(e)}")
+        raise
 
 
 def handle_transfer_processed(transfer_entity):
@@ -538,6 +523,7 @@ def handle_transfer_processed(transfer_entity):
         
     except Exception as e:
         logger.error(f"Error handling transfer.processed: {str(e)}")
+        raise
 
 
 def handle_transfer_failed(transfer_entity):
@@ -572,6 +558,7 @@ def handle_transfer_failed(transfer_entity):
         
     except Exception as e:
         logger.error(f"Error handling transfer.failed: {str(e)}")
+        raise
 
 
 def handle_transfer_reversed(transfer_entity):
@@ -603,6 +590,7 @@ def handle_transfer_reversed(transfer_entity):
         
     except Exception as e:
         logger.error(f"Error handling transfer.reversed: {str(e)}")
+        raise
 
 
 @customer_required
@@ -10,6 +10,8 @@ from django.conf import settings
 from decimal import Decimal
 import logging
 
+from .http_client import get_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,8 +19,9 @@ class RazorpayService:
     """Service class for Razorpay payment integration"""
     
     def __init__(self):
-        """Initialize Razorpay client"""
+        """Initialize Razorpay client on the shared pooled session"""
         self.client = razorpay.Client(
+            session=get_session('razorpay'),
             auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
         )
         # Disable signature verification in SDK as we'll verify manually
@@ -226,6 +229,29 @@ class RazorpayService:
                 'error': str(e)
             }
     
+    def fetch_order_payments(self, order_id):
+        """
+        Fetch all payment attempts for an order
+        
+        Args:
+            order_id: Razorpay order ID
+        
+        Returns:
+            dict: {'success': bool, 'payments': list} or {'success': False, 'error': str}
+        """
+        try:
+            payments = self.client.order.payments(order_id)
+            return {
+                'success': True,
+                'payments': payments.get('items', [])
+            }
+        except Exception as e:
+            logger.error(f"Failed to fetch payments for order {order_id}: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def get_payment_details(self, payment_id):
         """
         Fetch payment details from Razorpay - used for status checks
@@ -0,0 +1,218 @@
+"""
+Razorpay webhook ingestion
+The webhook view stores each verified delivery as a RazorpayWebhookEvent and
+returns 200 straight away; Razorpay redelivers slow or failed webhooks, so the
+handlers used to run several times for one event.
+
+- Ingest: one INSERT ... ON CONFLICT DO NOTHING keyed on the X-Razorpay-Event-Id
+  header, so a duplicate delivery is a no-op
+- Apply: process_webhook_events() (run by the process_razorpay_webhooks worker)
+  applies pending events in Razorpay created_at order; a failing event blocks
+  later events with the same ordering key until it succeeds or gives up
+- Replay: replay_events() resets stored events to PENDING for recovery
+
+Usage:
+    ingest_webhook(request.body, request.headers.get('X-Razorpay-Event-Id'))
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = 'razorpay_webhooks'
+LEASE_TTL = 300  # Seconds a processing pass may hold the lease
+PROCESS_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30  # Doubled per failed attempt
+
+# Event -> (handler in payment_views, payload entity it receives)
+EVENT_HANDLERS = {
+    'payment.authorized': ('handle_payment_authorized', 'payment'),
+    'payment.captured': ('handle_payment_captured', 'payment'),
+    'payment.failed': ('handle_payment_failed', 'payment'),
+    'order.paid': ('handle_order_paid', 'order'),
+    'transfer.processed': ('handle_transfer_processed', 'transfer'),
+    'transfer.failed': ('handle_transfer_failed', 'transfer'),
+    'transfer.reversed': ('handle_transfer_reversed', 'transfer'),
+}
+
+
+def ingest_webhook(body, event_id=None):
+    """
+    Store a verified webhook delivery for the worker
+    
+    Args:
+        body: Raw request body (bytes)
+        event_id: X-Razorpay-Event-Id header; a hash of the body is used if missing
+    
+    Returns:
+        str: The event's event type
+    
+    Raises:
+        ValueError: If the body is not a JSON webhook
+    """
+    from .models import RazorpayWebhookEvent
+    
+    webhook_data = json.loads(body)
+    if not isinstance(webhook_data, dict) or not webhook_data.get('event'):
+        raise ValueError("Webhook body has no event")
+    
+    event = webhook_data['event']
+    payload = webhook_data.get('payload', {})
+    
+    # Duplicate deliveries hit the unique event_id and insert nothing
+    RazorpayWebhookEvent.objects.bulk_create([
+        RazorpayWebhookEvent(
+            event_id=event_id or f"sha256:{hashlib.sha256(body).hexdigest()}",
+            event=event,
+            ordering_key=_ordering_key(event, payload),
+            event_created_at=webhook_data.get('created_at') or 0,
+            payload=payload,
+        )
+    ], ignore_conflicts=True)
+    
+    return event
+
+
+def _ordering_key(event, payload):
+    """Events about the same order (or, for transfers, the same booking) are applied in order"""
+    if event.startswith('transfer.'):
+        notes = payload.get('transfer', {}).get('entity', {}).get('notes') or {}
+        booking_id = notes.get('booking_id') if isinstance(notes, dict) else None
+        return f"booking:{booking_id}" if booking_id else ''
+    
+    order_id = (
+        payload.get('payment', {}).get('entity', {}).get('order_id')
+        or payload.get('order', {}).get('entity', {}).get('id')
+    )
+    return f"order:{order_id}" if order_id else ''
+
+
+def apply_event(webhook_event):
+    """Run the payment_views handler for one stored event (raises if the handler fails)"""
+    from . import payment_views
+    
+    handler_name, entity = EVENT_HANDLERS.get(webhook_event.event, (None, None))
+    if handler_name is None:
+        logger.info(f"Unhandled webhook event: {webhook_event.event}")
+        return
+    
+    handler = getattr(payment_views, handler_name)
+    handler(webhook_event.payload.get(entity, {}).get('entity', {}))
+
+
+def process_webhook_events(limit=PROCESS_BATCH_SIZE, holder=None):
+    """
+    Apply pending webhook events under the webhook lease
+    
+    Args:
+        limit: Maximum due events considered in this pass
+        holder: Lease holder identifier (defaults to host:pid)
+    
+    Returns:
+        dict: {'processed': int, 'retrying': int, 'failed': int, 'blocked': int},
+              or None if another worker holds the lease
+    """
+    from .models import RazorpayWebhookEvent, WorkerLease
+    
+    holder = holder or f"{socket.gethostname()}:{os.getpid()}"
+    if not WorkerLease.acquire(LEASE_NAME, holder, LEASE_TTL):
+        return None
+    
+    summary = {'processed': 0, 'retrying': 0, 'failed': 0, 'blocked': 0}
+    try:
+        now = timezone.now()
+        pending = RazorpayWebhookEvent.objects.filter(status='PENDING')
+        
+        # Only due events, so events backing off can't fill the batch and starve newer ones
+        due = Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+        events = list(pending.filter(due).order_by('event_created_at', 'id')[:limit])
+        
+        # Earliest backing-off event per ordering key in this batch: later events
+        # with that key wait for it (one small query on the batch's keys)
+        keys = {webhook_event.ordering_key for webhook_event in events if webhook_event.ordering_key}
+        first_waiting = {}
+        if keys:
+            waiting = pending.exclude(due).filter(ordering_key__in=keys).values_list('ordering_key', 'event_created_at', 'id')
+            for key, created_at, event_pk in waiting:
+                position = (created_at, event_pk)
+                if key not in first_waiting or position < first_waiting[key]:
+                    first_waiting[key] = position
+        
+        blocked_keys = set()
+        for webhook_event in events:
+            key = webhook_event.ordering_key
+            behind_waiting = key in first_waiting and (webhook_event.event_created_at, webhook_event.id) > first_waiting[key]
+            if key and (key in blocked_keys or behind_waiting):
+                # Later events for this order wait until the earlier one is applied
+                summary['blocked'] += 1
+                continue
+            
+            outcome = _apply_and_record(webhook_event)
+            summary[outcome] += 1
+            if outcome == 'retrying' and key:
+                blocked_keys.add(key)
+    finally:
+        WorkerLease.release(LEASE_NAME, holder)
+    
+    return summary
+
+
+def _apply_and_record(webhook_event):
+    webhook_event.attempts += 1
+    try:
+        apply_event(webhook_event)
+    except Exception as e:
+        webhook_event.last_error = f"{type(e).__name__}: {e}"
+        if webhook_event.attempts >= MAX_ATTEMPTS:
+            webhook_event.status = 'FAILED'
+            webhook_event.processed_at = timezone.now()
+            logger.error(f"Webhook {webhook_event.event_id} ({webhook_event.event}) failed for good: {e}")
+            outcome = 'failed'
+        else:
+            delay = RETRY_BASE_SECONDS * (2 ** (webhook_event.attempts - 1))
+            webhook_event.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f"Webhook {webhook_event.event_id} ({webhook_event.event}) failed, retrying in {delay}s: {e}")
+            outcome = 'retrying'
+    else:
+        webhook_event.status = 'PROCESSED'
+        webhook_event.processed_at = timezone.now()
+        webhook_event.last_error = ''
+        outcome = 'processed'
+    
+    webhook_event.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'processed_at'])
+    return outcome
+
+
+def replay_events(event_ids=None, since=None, failed_only=False):
+    """
+    Queue stored events to be applied again
+    
+    Args:
+        event_ids: Razorpay event ids to replay
+        since: Replay events received at or after this datetime
+        failed_only: Only replay events that gave up
+    
+    Returns:
+        int: Number of events queued
+    """
+    from .models import RazorpayWebhookEvent
+    
+    events = RazorpayWebhookEvent.objects.all()
+    if event_ids:
+        events = events.filter(event_id__in=event_ids)
+    if since:
+        events = events.filter(received_at__gte=since)
+    if failed_only:
+        events = events.filter(status='FAILED')
+    if not (event_ids or since or failed_only):
+        return 0
+    
+    return events.update(status='PENDING', attempts=0, next_attempt_at=None, processed_at=None)
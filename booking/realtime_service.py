@@ -396,39 +396,75 @@ class RealTimeService:
         """
         Static method to broadcast availability changes to all connected clients
         
+        Sends immediately; code that changes availability should call
+        availability_broadcast.queue_availability_broadcast so repeated
+        changes to a slot are sent once, after commit.
+        
         Args:
             game_slot_id: ID of the GameSlot that had availability changes
         """
+        RealTimeService.broadcast_availability_updates([game_slot_id])
+    
+    @staticmethod
+    def broadcast_availability_updates(game_slot_ids):
+        """
+        Broadcast the current availability of several slots
+        
+        Slots, games, availability rows and pending reservation counts are
+        read with one query; one update is published per slot.
+        
+        Args:
+            game_slot_ids: IDs of the GameSlots that had availability changes
+        """
+        game_slot_ids = set(game_slot_ids)
+        
         try:
-            game_slot = GameSlot.objects.get(id=game_slot_id)
-            availability = SlotAvailability.objects.get(game_slot=game_slot)
-            
-            # Prepare availability data
-            availability_data = {
-                'game_slot_id': str(game_slot_id),
-                'game_id': str(game_slot.game.id),
-                'date': game_slot.date.isoformat(),
-                'start_time': game_slot.start_time.isoformat(),
-                'end_time': game_slot.end_time.isoformat(),
-                'total_capacity': availability.total_capacity,
-                'booked_spots': availability.booked_spots,
-                'available_spots': availability.available_spots,
-                'can_book_private': availability.can_book_private,
-                'can_book_shared': availability.can_book_shared,
-                'is_private_booked': availability.is_private_booked,
-                'booking_options': BookingService.get_booking_options(game_slot),
-                'timestamp': timezone.now().isoformat()
-            }
-            
-            # Send to Supabase real-time channel
-            supabase_realtime.publish_availability_update(game_slot_id, availability_data)
-            
-            logger.info(f"Broadcasted availability update for slot {game_slot_id}")
-            
-        except (GameSlot.DoesNotExist, SlotAvailability.DoesNotExist) as e:
-            logger.warning(f"Could not broadcast availability update for slot {game_slot_id}: {e}")
+            slots = list(
+                GameSlot.objects.filter(id__in=game_slot_ids)
+                .select_related('game', 'availability')
+                .with_reservation_summary()
+                .prefetch_related(None)  # Pending counts are annotated
+            )
         except Exception as e:
-            logger.error(f"Error broadcasting availability update: {e}")
+            logger.error(f"Error loading slots for availability broadcast: {e}")
+            return
+        
+        missing = game_slot_ids - {slot.id for slot in slots}
+        if missing:
+            logger.warning(f"Could not broadcast availability update for missing slot(s): {sorted(missing)}")
+        
+        for game_slot in slots:
+            try:
+                availability = game_slot.availability
+            except SlotAvailability.DoesNotExist:
+                logger.warning(f"Could not broadcast availability update for slot {game_slot.id}: no availability")
+                continue
+            
+            try:
+                # Prepare availability data
+                availability_data = {
+                    'game_slot_id': str(game_slot.id),
+                    'game_id': str(game_slot.game_id),
+                    'date': game_slot.date.isoformat(),
+                    'start_time': game_slot.start_time.isoformat(),
+                    'end_time': game_slot.end_time.isoformat(),
+                    'total_capacity': availability.total_capacity,
+                    'booked_spots': availability.booked_spots,
+                    'reserved_spots': availability.reserved_spots,
+                    'available_spots': availability.available_spots,
+                    'can_book_private': availability.can_book_private,
+                    'can_book_shared': availability.can_book_shared,
+                    'is_private_booked': availability.is_private_booked,
+                    'booking_options': BookingService.get_booking_options_fast(game_slot),
+                    'timestamp': timezone.now().isoformat()
+                }
+                
+                # Send to Supabase real-time channel
+                supabase_realtime.publish_availability_update(str(game_slot.id), availability_data)
+            except Exception as e:
+                logger.error(f"Error broadcasting availability update for slot {game_slot.id}: {e}")
+        
+        logger.info(f"Broadcasted availability update for {len(slots)} slot(s)")
     
     @staticmethod
     def broadcast_game_update(game_id):
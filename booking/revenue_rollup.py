@@ -0,0 +1,190 @@
+"""
+Daily revenue rollups
+Keeps DailyRevenueRollup in step with paid bookings so revenue dashboards read
+a handful of pre-aggregated rows instead of scanning the booking table.
+
+- Incremental: after each booking save, a post_save signal compares the revenue
+  fields as loaded with the ones written and apply_revenue_change() moves the
+  booking's amounts between rollup rows with F() increments (safe under
+  concurrent writers); saves that touch no revenue field are skipped
+- Deletes: deleting a paid booking subtracts it (post_delete signal)
+- Backfill: rebuild_rollups() recomputes a date range from bookings with one
+  grouped query (python manage.py rebuild_revenue_rollups)
+
+A booking contributes while its payment_status is PAID, to the row for its
+created_at date (local time), game, booking type and payment method.
+
+Usage:
+    DailyRevenueRollup.objects.between(start_date, end_date).totals()
+"""
+import logging
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Booking attributes a rollup row depends on
+REVENUE_FIELDS = (
+    'payment_status', 'booking_type', 'game_id', 'created_at', 'razorpay_order_id', 'razorpay_payment_id',
+    'total_amount', 'subtotal', 'platform_fee', 'commission_amount', 'owner_payout',
+)
+
+# Rollup measure -> booking field it sums
+AMOUNT_FIELDS = {
+    'gross_amount': 'total_amount',
+    'subtotal': 'subtotal',
+    'platform_fee': 'platform_fee',
+    'commission_amount': 'commission_amount',
+    'owner_payout': 'owner_payout',
+}
+
+
+def revenue_snapshot(values, base=None):
+    """
+    The revenue fields present in a booking's attribute dict
+    
+    Args:
+        values: Booking instance __dict__ (deferred fields are simply absent)
+        base: Earlier snapshot supplying fields missing from `values`
+    
+    Returns:
+        dict: {field: value} for the fields in REVENUE_FIELDS that are known
+    """
+    snapshot = dict(base or {})
+    snapshot.update({field: values[field] for field in REVENUE_FIELDS if field in values})
+    return snapshot
+
+
+def payment_method_for(snapshot):
+    """Rollup payment method for a booking: online (Razorpay) or anything else"""
+    if snapshot.get('razorpay_order_id') or snapshot.get('razorpay_payment_id'):
+        return 'RAZORPAY'
+    return 'OTHER'
+
+
+def _contribution(snapshot):
+    """(rollup key, measures) a booking adds to the rollups, or None if it adds nothing"""
+    if not snapshot or snapshot.get('payment_status') != 'PAID':
+        return None
+    if any(field not in snapshot for field in REVENUE_FIELDS) or snapshot['created_at'] is None:
+        return None
+    
+    key = (
+        timezone.localdate(snapshot['created_at']),
+        snapshot['game_id'],
+        snapshot['booking_type'],
+        payment_method_for(snapshot),
+    )
+    measures = {'booking_count': 1}
+    for measure, field in AMOUNT_FIELDS.items():
+        measures[measure] = Decimal(str(snapshot[field] or 0))
+    return key, measures
+
+
+def apply_revenue_change(old_snapshot, new_snapshot):
+    """
+    Move one booking's amounts between rollup rows
+    
+    Args:
+        old_snapshot: revenue_snapshot() before the write (None for a new booking)
+        new_snapshot: revenue_snapshot() after the write (None for a deleted booking)
+    """
+    old = _contribution(old_snapshot)
+    new = _contribution(new_snapshot)
+    if old == new:
+        return
+    
+    try:
+        if old:
+            _increment(*old, sign=-1)
+        if new:
+            _increment(*new, sign=1)
+    except Exception as e:
+        # Never fail a booking write over reporting; rebuild_revenue_rollups repairs drift
+        logger.error(f"Failed to update revenue rollup: {e}")
+
+
+def _increment(key, measures, sign):
+    from .models import DailyRevenueRollup
+    
+    rollup_date, game_id, booking_type, payment_method = key
+    rows = DailyRevenueRollup.objects.filter(
+        date=rollup_date, game_id=game_id, booking_type=booking_type, payment_method=payment_method
+    )
+    changes = {measure: F(measure) + sign * value for measure, value in measures.items()}
+    
+    if rows.update(**changes) or sign < 0:
+        # Nothing to subtract from a row that doesn't exist (e.g. it was removed with its game)
+        return
+    
+    try:
+        with transaction.atomic():
+            DailyRevenueRollup.objects.create(
+                date=rollup_date, game_id=game_id, booking_type=booking_type, payment_method=payment_method,
+                **measures
+            )
+    except IntegrityError:
+        # Created concurrently by another booking
+        rows.update(**changes)
+
+
+def rebuild_rollups(start_date=None, end_date=None):
+    """
+    Recompute rollups from bookings
+    
+    Args:
+        start_date: First date to rebuild (defaults to the earliest booking)
+        end_date: Last date to rebuild (defaults to the latest booking)
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    from django.db.models import Case, CharField, Count, Q, Sum, Value, When
+    from django.db.models.functions import Coalesce, TruncDate
+    
+    from .models import Booking, DailyRevenueRollup
+    
+    bookings = Booking.objects.filter(payment_status='PAID')
+    rollups = DailyRevenueRollup.objects.all()
+    if start_date:
+        bookings = bookings.filter(created_at__date__gte=start_date)
+        rollups = rollups.filter(date__gte=start_date)
+    if end_date:
+        bookings = bookings.filter(created_at__date__lte=end_date)
+        rollups = rollups.filter(date__lte=end_date)
+    
+    grouped = bookings.order_by().annotate(
+        rollup_date=TruncDate('created_at'),
+        rollup_payment_method=Case(
+            When(~Q(razorpay_order_id='') | ~Q(razorpay_payment_id=''), then=Value('RAZORPAY')),
+            default=Value('OTHER'),
+            output_field=CharField()
+        ),
+    ).values('rollup_date', 'game_id', 'booking_type', 'rollup_payment_method').annotate(
+        booking_count=Count('id'),
+        **{
+            measure: Coalesce(Sum(field), Value(Decimal('0.00')))
+            for measure, field in AMOUNT_FIELDS.items()
+        }
+    )
+    
+    rows = [
+        DailyRevenueRollup(
+            date=row['rollup_date'],
+            game_id=row['game_id'],
+            booking_type=row['booking_type'],
+            payment_method=row['rollup_payment_method'],
+            booking_count=row['booking_count'],
+            **{measure: row[measure] for measure in AMOUNT_FIELDS}
+        )
+        for row in grouped
+    ]
+    
+    with transaction.atomic():
+        rollups.delete()
+        DailyRevenueRollup.objects.bulk_create(rows, batch_size=500)
+    
+    return len(rows)
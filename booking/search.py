@@ -0,0 +1,99 @@
+"""
+Owner booking search
+Bookings carry a normalized copy of their customer's name, username, email and
+phone (Booking.search_text) so the owner bookings search is one indexed column
+instead of case-insensitive scans across three joined tables.
+
+- Maintained: set when a booking is created, and rewritten for all of a
+  customer's bookings when the customer or their user account changes (signals)
+- Indexed: on PostgreSQL a pg_trgm GIN index serves substring matches
+  (migration 0020); elsewhere the column is matched directly
+- Booking ids match by prefix, as a primary key range
+
+Usage:
+    bookings = search_bookings(Booking.objects.all(), request.GET.get('search', ''))
+"""
+import re
+import uuid
+
+from django.db.models import Q
+
+# Fields on User that feed the search text
+USER_SEARCH_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+HEX_PREFIX = re.compile(r'[0-9a-f-]+')
+
+
+def normalize(value):
+    """Lowercase and collapse whitespace"""
+    return ' '.join(str(value or '').lower().split())
+
+
+def customer_search_text(customer):
+    """
+    Search text shared by all of a customer's bookings
+    
+    Args:
+        customer: Customer instance (with its user)
+    
+    Returns:
+        str: Normalized name, username, email and phone (also as bare digits)
+    """
+    user = customer.user
+    phone_digits = re.sub(r'\D', '', customer.phone or '')
+    return normalize(' '.join([
+        user.first_name, user.last_name, user.username, user.email, customer.phone or '', phone_digits,
+    ]))
+
+
+def refresh_customer_bookings(customer):
+    """
+    Rewrite the search text of every booking of a customer
+    
+    Returns:
+        int: Number of bookings updated
+    """
+    from .models import Booking
+    
+    return Booking.objects.filter(customer=customer).update(search_text=customer_search_text(customer))
+
+
+def booking_id_range(term):
+    """
+    Primary key range matching a booking id prefix
+    
+    Args:
+        term: Normalized search term
+    
+    Returns:
+        tuple: (lowest, highest) UUID, or None if the term can't be an id prefix
+    """
+    if not HEX_PREFIX.fullmatch(term):
+        return None
+    digits = term.replace('-', '')
+    if not digits or len(digits) > 32:
+        return None
+    return uuid.UUID(digits.ljust(32, '0')), uuid.UUID(digits.ljust(32, 'f'))
+
+
+def search_bookings(bookings, query):
+    """
+    Filter bookings by customer name, username, email, phone or booking id prefix
+    
+    Args:
+        bookings: Booking queryset
+        query: Raw search string (blank leaves the queryset unchanged)
+    
+    Returns:
+        QuerySet: Filtered bookings
+    """
+    term = normalize(query)
+    if not term:
+        return bookings
+    
+    # search_text is stored lowercased, so a plain LIKE can use the trigram index
+    condition = Q(search_text__contains=term)
+    id_range = booking_id_range(term)
+    if id_range:
+        condition |= Q(id__range=id_range)
+    return bookings.filter(condition)
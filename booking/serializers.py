@@ -37,7 +37,6 @@ class SlotAvailabilitySerializer(serializers.ModelSerializer):
     available_spots = serializers.SerializerMethodField()  # Changed to use truly_available_spots
     can_book_private = serializers.BooleanField(read_only=True)
     can_book_shared = serializers.BooleanField(read_only=True)
-    reserved_spots = serializers.SerializerMethodField()
     truly_available_spots = serializers.SerializerMethodField()
     pending_reservations = serializers.SerializerMethodField()
     
@@ -53,10 +52,6 @@ class SlotAvailabilitySerializer(serializers.ModelSerializer):
         """Get truly available spots (accounting for reserved spots)"""
         return obj.get_truly_available_spots()
     
-    def get_reserved_spots(self, obj):
-        """Get count of spots reserved by pending payments"""
-        return obj.get_reserved_spots_count()
-    
     def get_truly_available_spots(self, obj):
         """Get spots that are neither booked nor reserved"""
         return obj.get_truly_available_spots()
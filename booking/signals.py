@@ -2,7 +2,11 @@ from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.core.cache import cache
+from django.contrib.auth.models import User
+from authentication.models import Customer
 from .models import Booking, BookingHistory, GamingStation, Game
+from .revenue_rollup import REVENUE_FIELDS, apply_revenue_change, revenue_snapshot
+from .search import USER_SEARCH_FIELDS, refresh_customer_bookings
 from .supabase_client import supabase_realtime
 import logging
 
@@ -12,17 +16,12 @@ logger = logging.getLogger(__name__)
 @receiver(pre_save, sender=Booking)
 def track_booking_status_change(sender, instance, **kwargs):
     """Track booking status changes for audit purposes"""
-    if instance.pk:  # Only for existing bookings
-        try:
-            old_instance = Booking.objects.get(pk=instance.pk)
-            if old_instance.status != instance.status:
-                # Store the old status to create history record after save
-                instance._old_status = old_instance.status
-                instance._status_changed = True
-            else:
-                instance._status_changed = False
-        except Booking.DoesNotExist:
-            instance._status_changed = False
+    # Previous status is captured by Booking.save() from the loaded instance, no extra query
+    old_status = getattr(instance, '_status_before_save', None)
+    if not instance._state.adding and old_status and old_status != instance.status:
+        # Store the old status to create history record after save
+        instance._old_status = old_status
+        instance._status_changed = True
     else:
         instance._status_changed = False
 
@@ -39,6 +38,25 @@ def create_booking_history(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Booking)
+def update_revenue_rollup(sender, instance, created, update_fields=None, **kwargs):
+    """Apply the booking's revenue change to DailyRevenueRollup"""
+    # Registered before auto_update_booking_status: a save made from that handler
+    # must compare against this write, not the one before it
+    if update_fields is not None and update_fields.isdisjoint(REVENUE_FIELDS):
+        return
+    
+    old_revenue = None if created else getattr(instance, '_loaded_revenue', None)
+    # With update_fields, other attributes may hold edits that were never written
+    written = instance.__dict__ if update_fields is None else {
+        name: value for name, value in instance.__dict__.items()
+        if name in update_fields or name.removesuffix('_id') in update_fields
+    }
+    new_revenue = revenue_snapshot(written, base=old_revenue)
+    instance._loaded_revenue = new_revenue
+    apply_revenue_change(old_revenue, new_revenue)
+
+
 @receiver(post_save, sender=Booking)
 def auto_update_booking_status(sender, instance, created, **kwargs):
     """Automatically update booking status based on time"""
@@ -101,33 +119,54 @@ def auto_update_booking_status(sender, instance, created, **kwargs):
             logger.info(f"Auto-updated booking {instance.id} status to {new_status}")
 
 
+def _loaded(instance, path):
+    """
+    Related object along `path` (e.g. 'customer__user') if already loaded, else None
+    
+    Never queries: the broadcasts run on every booking save, so names are only
+    included when the caller fetched them (select_related) anyway.
+    """
+    obj = instance
+    for name in path.split('__'):
+        if obj is None or not obj._meta.get_field(name).is_cached(obj):
+            return None
+        obj = getattr(obj, name)
+    return obj
+
+
 @receiver(post_save, sender=Booking)
 def broadcast_booking_update(sender, instance, created, **kwargs):
     """Broadcast booking updates to real-time subscribers"""
     try:
-        # Prepare booking data for broadcast
+        # Prepare booking data for broadcast (ids only; names when already loaded)
         booking_data = {
             'id': str(instance.id),
-            'customer_id': str(instance.customer.id),
-            'customer_name': instance.customer.user.get_full_name() or instance.customer.user.username,
+            'customer_id': str(instance.customer_id),
             'status': instance.status,
             'total_amount': float(instance.total_amount),
             'is_walk_in': instance.is_walk_in,
             'created': created,
             'timestamp': timezone.now().isoformat()
         }
+        user = _loaded(instance, 'customer__user')
+        if user:
+            booking_data['customer_name'] = user.get_full_name() or user.username
         
         # Add game-specific data if available
-        if instance.game:
-            booking_data['game_id'] = str(instance.game.id)
-            booking_data['game_name'] = instance.game.name
+        if instance.game_id:
+            booking_data['game_id'] = str(instance.game_id)
+            game = _loaded(instance, 'game')
+            if game:
+                booking_data['game_name'] = game.name
         
         # Add gaming station data if available (backward compatibility)
-        if instance.gaming_station:
-            booking_data['gaming_station_id'] = str(instance.gaming_station.id)
-            booking_data['gaming_station_name'] = instance.gaming_station.name
+        if instance.gaming_station_id:
+            booking_data['gaming_station_id'] = str(instance.gaming_station_id)
+            station = _loaded(instance, 'gaming_station')
+            if station:
+                booking_data['gaming_station_name'] = station.name
         
-        # Add time data
+        # Add time data (the slot is already loaded by auto_update_booking_status)
         start_dt = instance.start_datetime
         end_dt = instance.end_datetime
         if start_dt:
@@ -147,6 +186,34 @@ def broadcast_booking_update(sender, instance, created, **kwargs):
         logger.error(f"Error broadcasting booking update: {e}")
 
 
+@receiver(post_delete, sender=Booking)
+def remove_revenue_rollup(sender, instance, **kwargs):
+    """Subtract a deleted paid booking from DailyRevenueRollup"""
+    # The loaded values are what the rollup holds; unsaved edits never reached it
+    old_revenue = revenue_snapshot(getattr(instance, '_loaded_revenue', None) or {}, base=revenue_snapshot(instance.__dict__))
+    apply_revenue_change(old_revenue, None)
+
+
+@receiver(post_save, sender=Customer)
+def refresh_booking_search_for_customer(sender, instance, created, update_fields=None, **kwargs):
+    """Rewrite the bookings' search text when the customer's phone changes"""
+    if created or (update_fields is not None and 'phone' not in update_fields):
+        return
+    refresh_customer_bookings(instance)
+
+
+@receiver(post_save, sender=User)
+def refresh_booking_search_for_user(sender, instance, created, update_fields=None, **kwargs):
+    """Rewrite the bookings' search text when a customer's name, username or email changes"""
+    # Logins save last_login only; skip anything that can't change the search text
+    if created or (update_fields is not None and set(update_fields).isdisjoint(USER_SEARCH_FIELDS)):
+        return
+    customer = Customer.objects.filter(user=instance).first()
+    if customer:
+        customer.user = instance
+        refresh_customer_bookings(customer)
+
+
 @receiver(post_delete, sender=Booking)
 def broadcast_booking_deletion(sender, instance, **kwargs):
     """Broadcast booking deletion to real-time subscribers"""
@@ -159,12 +226,12 @@ def broadcast_booking_deletion(sender, instance, **kwargs):
         }
         
         # Add gaming station ID if available
-        if instance.gaming_station:
-            deletion_data['gaming_station_id'] = str(instance.gaming_station.id)
+        if instance.gaming_station_id:
+            deletion_data['gaming_station_id'] = str(instance.gaming_station_id)
         
         # Add game ID if available
-        if instance.game:
-            deletion_data['game_id'] = str(instance.game.id)
+        if instance.game_id:
+            deletion_data['game_id'] = str(instance.game_id)
         
         # Broadcast the deletion
         success = supabase_realtime.publish_booking_update(deletion_data)
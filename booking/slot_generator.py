@@ -18,6 +18,9 @@ from .models import GameSlot, SlotAvailability
 class SlotGenerator:
     """Enhanced utility class for generating game time slots"""
     
+    # Rows per INSERT statement when bulk-creating slots and availability records
+    BULK_BATCH_SIZE = 500
+    
     @staticmethod
     def generate_slots_for_game(game, start_date, end_date):
         """
@@ -45,25 +48,16 @@ class SlotGenerator:
         
         try:
             with transaction.atomic():
-                current_date = start_date
+                generation = SlotGenerator.bulk_generate_slots([game], start_date, end_date)[game.id]
+                errors.extend(generation['errors'])
                 
+                current_date = start_date
                 while current_date <= end_date:
-                    # Check if this day is available for the game
-                    weekday = current_date.strftime('%A').lower()
+                    created = generation['created_by_date'].get(current_date, 0)
+                    slots_created += created
                     
-                    if weekday in game.available_days:
-                        try:
-                            created = SlotGenerator._generate_slots_for_date(game, current_date)
-                            slots_created += created
-                            
-                            if created == 0:
-                                slots_skipped += 1
-                                
-                        except Exception as e:
-                            error_msg = f"Error generating slots for {current_date}: {str(e)}"
-                            errors.append(error_msg)
-                            logger.error(error_msg)
-                    else:
+                    # Unavailable weekdays, past dates and fully generated days all count as skipped
+                    if created == 0:
                         slots_skipped += 1
                     
                     current_date += timedelta(days=1)
@@ -83,76 +77,173 @@ class SlotGenerator:
         }
     
     @staticmethod
-    def _generate_slots_for_date(game, target_date):
+    def _get_slot_times(game):
         """
-        Generate slots for a specific date with enhanced validation
+        Compute the (start_time, end_time) pairs for one day of a game's schedule
         
         Args:
             game: Game instance
-            target_date: Date to generate slots for
             
         Returns:
-            int: Number of slots created
+            list: (start_time, end_time) tuples in chronological order
         """
-        if target_date < date.today():
-            logger.warning(f"Skipping slot generation for past date: {target_date}")
-            return 0
-        
-        slots_created = 0
+        slot_times = []
         current_time = game.opening_time
         
-        # Validate game schedule
-        if game.opening_time >= game.closing_time:
-            raise ValidationError(f"Invalid schedule for {game.name}: opening time must be before closing time")
-        
-        if game.slot_duration_minutes <= 0:
-            raise ValidationError(f"Invalid slot duration for {game.name}: must be greater than 0")
-        
         while current_time < game.closing_time:
             # Calculate end time for this slot
-            start_datetime = datetime.combine(target_date, current_time)
+            start_datetime = datetime.combine(date.today(), current_time)
             end_datetime = start_datetime + timedelta(minutes=game.slot_duration_minutes)
             end_time = end_datetime.time()
             
-            # Don't create slot if it goes beyond closing time
-            if end_time > game.closing_time:
+            # Don't create slot if it goes beyond closing time (or wraps past midnight)
+            if end_time > game.closing_time or end_time <= current_time:
                 logger.debug(f"Slot {current_time}-{end_time} extends beyond closing time for {game.name}")
                 break
             
-            try:
-                # Create slot if it doesn't already exist
-                slot, created = GameSlot.objects.get_or_create(
-                    game=game,
-                    date=target_date,
-                    start_time=current_time,
-                    defaults={
-                        'end_time': end_time,
-                        'is_custom': False,
-                        'is_active': True
-                    }
-                )
-                
-                if created:
-                    # Create availability tracking for new slot
-                    SlotAvailability.objects.get_or_create(
-                        game_slot=slot,
-                        defaults={
-                            'total_capacity': game.capacity,
-                            'booked_spots': 0,
-                            'is_private_booked': False
-                        }
-                    )
-                    slots_created += 1
-                    logger.debug(f"Created slot: {slot}")
-                
-            except Exception as e:
-                logger.error(f"Error creating slot {current_time}-{end_time} for {game.name}: {e}")
-                # Continue with next slot instead of failing completely
-                
+            slot_times.append((current_time, end_time))
+            
             # Move to next slot time
             current_time = end_time
         
-        return slots_created
+        return slot_times
+    
+    @staticmethod
+    def bulk_generate_slots(games, start_date, end_date):
+        """
+        Set-based slot generation for one or more games over a date range
+        
+        Builds the full slot grid in memory, loads the existing
+        (game, date, start_time) keys for the range in a single query and
+        inserts only the missing GameSlot and SlotAvailability rows with
+        chunked bulk_create(ignore_conflicts=True).
+        
+        Args:
+            games: Iterable of Game instances
+            start_date: Start date for slot generation
+            end_date: End date for slot generation
+            
+        Returns:
+            dict: Per-game results keyed by game id, each with
+                  'created_by_date' (date -> slots created) and 'errors'
+        """
+        today = date.today()
+        results = {}
+        capacities = {}
+        grid = []
+        
+        for game in games:
+            result = {'created_by_date': {}, 'errors': []}
+            results[game.id] = result
+            capacities[game.id] = game.capacity
+            
+            # Validate game schedule
+            if game.opening_time >= game.closing_time:
+                result['errors'].append(f"Invalid schedule for {game.name}: opening time must be before closing time")
+                continue
+            
+            if game.slot_duration_minutes <= 0:
+                result['errors'].append(f"Invalid slot duration for {game.name}: must be greater than 0")
+                continue
+            
+            slot_times = SlotGenerator._get_slot_times(game)
+            
+            current_date = max(start_date, today)
+            while current_date <= end_date:
+                if current_date.strftime('%A').lower() in (game.available_days or []):
+                    result['created_by_date'][current_date] = 0
+                    grid.append((game, current_date, slot_times))
+                current_date += timedelta(days=1)
+        
+        if not grid:
+            return results
+        
+        game_ids = list(results)
+        existing_keys = set(
+            GameSlot.objects.filter(
+                game_id__in=game_ids,
+                date__gte=start_date,
+                date__lte=end_date
+            ).values_list('game_id', 'date', 'start_time')
+        )
+        
+        new_slots = []
+        for game, slot_date, slot_times in grid:
+            for start_time, end_time in slot_times:
+                if (game.id, slot_date, start_time) in existing_keys:
+                    continue
+                new_slots.append(GameSlot(
+                    game=game,
+                    date=slot_date,
+                    start_time=start_time,
+                    end_time=end_time,
+                    is_custom=False,
+                    is_active=True
+                ))
+                results[game.id]['created_by_date'][slot_date] += 1
+        
+        if not new_slots:
+            return results
+        
+        GameSlot.objects.bulk_create(
+            new_slots,
+            batch_size=SlotGenerator.BULK_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        
+        # ignore_conflicts leaves primary keys unset, so look up the slots that still
+        # need availability tracking instead of relying on the created instances
+        slots_without_availability = GameSlot.objects.filter(
+            game_id__in=game_ids,
+            date__gte=start_date,
+            date__lte=end_date,
+            availability__isnull=True
+        ).values_list('id', 'game_id')
+        
+        SlotAvailability.objects.bulk_create(
+            [
+                SlotAvailability(
+                    game_slot_id=slot_id,
+                    total_capacity=capacities[game_id],
+                    booked_spots=0,
+                    is_private_booked=False
+                )
+                for slot_id, game_id in slots_without_availability
+            ],
+            batch_size=SlotGenerator.BULK_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        
+        # New slots make any cached availability for those days stale
+        from .availability_cache import invalidate_availability_many
+        invalidate_availability_many((slot.game_id, slot.date) for slot in new_slots)
+        
+        logger.debug(f"Bulk created {len(new_slots)} slots for {len(game_ids)} game(s) from {start_date} to {end_date}")
+        
+        return results
+    
+    @staticmethod
+    def _generate_slots_for_date(game, target_date):
+        """
+        Generate slots for a specific date with enhanced validation
+        
+        Args:
+            game: Game instance
+            target_date: Date to generate slots for
+            
+        Returns:
+            int: Number of slots created
+        """
+        if target_date < date.today():
+            logger.warning(f"Skipping slot generation for past date: {target_date}")
+            return 0
+        
+        result = SlotGenerator.bulk_generate_slots([game], target_date, target_date)[game.id]
+        
+        if result['errors']:
+            raise ValidationError(result['errors'][0])
+        
+        return result['created_by_date'].get(target_date, 0)
     
     @staticmethod
     def create_custom_slot(game, target_date, start_time, end_time, validate_conflicts=True):
@@ -632,30 +723,47 @@ class SlotGenerator:
         # Generate slots for the target date (days_ahead from today)
         target_date = date.today() + timedelta(days=days_ahead)
         
-        active_games = Game.objects.filter(is_active=True)
+        weekday = target_date.strftime('%A').lower()
         total_created = 0
         total_errors = []
         games_processed = 0
         games_skipped = 0
         
-        for game in active_games:
-            try:
-                weekday = target_date.strftime('%A').lower()
-                if weekday in game.available_days:
-                    created = SlotGenerator._generate_slots_for_date(game, target_date)
-                    total_created += created
-                    games_processed += 1
-                    
-                    if created > 0:
-                        logger.debug(f"Created {created} slots for {game.name} on {target_date}")
-                else:
-                    games_skipped += 1
-                    logger.debug(f"Skipped {game.name} - not available on {weekday}")
-                    
-            except Exception as e:
-                error_msg = f"Error processing {game.name}: {str(e)}"
-                total_errors.append(error_msg)
-                logger.error(error_msg)
+        games_to_generate = []
+        for game in Game.objects.filter(is_active=True):
+            if weekday in game.available_days:
+                games_to_generate.append(game)
+            else:
+                games_skipped += 1
+                logger.debug(f"Skipped {game.name} - not available on {weekday}")
+        
+        try:
+            with transaction.atomic():
+                generation = SlotGenerator.bulk_generate_slots(games_to_generate, target_date, target_date)
+        except Exception as e:
+            error_msg = f"Error generating slots for {target_date}: {str(e)}"
+            logger.error(error_msg)
+            generation = {}
+            total_errors.append(error_msg)
+        
+        for game in games_to_generate:
+            if game.id not in generation:
+                continue
+            
+            game_result = generation[game.id]
+            if game_result['errors']:
+                for error in game_result['errors']:
+                    error_msg = f"Error processing {game.name}: {error}"
+                    total_errors.append(error_msg)
+                    logger.error(error_msg)
+                continue
+            
+            created = game_result['created_by_date'].get(target_date, 0)
+            total_created += created
+            games_processed += 1
+            
+            if created > 0:
+                logger.debug(f"Created {created} slots for {game.name} on {target_date}")
         
         result = {
             'target_date': target_date,
@@ -6,6 +6,8 @@ from django.conf import settings
 from supabase import create_client, Client
 from datetime import datetime
 
+from .event_store import READ_BATCH_SIZE, append_event, recent_events
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +23,7 @@ class SupabaseRealTimeClient:
     def __init__(self):
         self.client: Optional[Client] = None
         self.subscriptions: Dict[str, any] = {}
-        self.event_log: List[Dict] = []  # Store events for conflict resolution
+        # Events are kept in the shared RealtimeEvent log (see event_store.py)
         self._initialize_client()
     
     def _initialize_client(self):
@@ -194,17 +196,17 @@ class SupabaseRealTimeClient:
             True if successful, False otherwise
         """
         try:
-            # Log the event for conflict resolution
+            # Store the event in the shared event log
             event = {
                 'type': 'booking_update',
                 'data': booking_data,
                 'timestamp': datetime.now().isoformat()
             }
-            self.event_log.append(event)
-            
-            # Keep only recent events (last 100)
-            if len(self.event_log) > 100:
-                self.event_log = self.event_log[-100:]
+            append_event(
+                'booking_update',
+                booking_data,
+                key=booking_data.get('id') or booking_data.get('booking_id') or ''
+            )
             
             # Notify local subscribers
             self._notify_local_subscribers('booking_changes', event)
@@ -228,18 +230,19 @@ class SupabaseRealTimeClient:
             True if successful, False otherwise
         """
         try:
-            # Log the event for conflict resolution
+            # Store the event in the shared event log
             event = {
                 'type': 'availability_update',
                 'game_slot_id': game_slot_id,
                 'data': availability_data,
                 'timestamp': datetime.now().isoformat()
             }
-            self.event_log.append(event)
-            
-            # Keep only recent events (last 100)
-            if len(self.event_log) > 100:
-                self.event_log = self.event_log[-100:]
+            append_event(
+                'availability_update',
+                availability_data,
+                game_id=availability_data.get('game_id'),
+                key=game_slot_id
+            )
             
             # Notify local subscribers
             self._notify_local_subscribers('availability_changes', event)
@@ -263,18 +266,14 @@ class SupabaseRealTimeClient:
             True if successful, False otherwise
         """
         try:
-            # Log the event for conflict resolution
+            # Store the event in the shared event log
             event = {
                 'type': 'game_update',
                 'game_id': game_id,
                 'data': game_data,
                 'timestamp': datetime.now().isoformat()
             }
-            self.event_log.append(event)
-            
-            # Keep only recent events (last 100)
-            if len(self.event_log) > 100:
-                self.event_log = self.event_log[-100:]
+            append_event('game_update', game_data, game_id=game_id, key=game_id)
             
             # Notify local subscribers
             self._notify_local_subscribers('game_changes', event)
@@ -299,19 +298,17 @@ class SupabaseRealTimeClient:
         """
         Get recent events for conflict resolution
         
+        Reads the shared event log, so events published by other workers are
+        included.
+        
         Args:
             event_type: Filter by event type
             limit: Maximum number of events to return
         
         Returns:
-            List of recent events
+            List of recent events, oldest first
         """
-        events = self.event_log
-        
-        if event_type:
-            events = [e for e in events if e['type'] == event_type]
-        
-        return events[-limit:] if limit else events
+        return recent_events(event_type, limit or READ_BATCH_SIZE)
 
 
 class BookingConflictResolver:
@@ -1,6 +1,10 @@
 """
 Telegram Notification Service for Gaming Cafe
 Sends booking notifications to cafe owner via Telegram Bot
+
+Booking notifications are queued (see job_queue.py) and sent by the
+process_notification_jobs worker, so a slow Telegram API never holds up a
+payment callback. Only the owner's test message is sent inline.
 """
 import logging
 import requests
@@ -8,8 +12,17 @@ from django.conf import settings
 from decimal import Decimal
 from datetime import datetime
 
+from .http_client import get_session
+
 logger = logging.getLogger(__name__)
 
+TELEGRAM_API_BASE = getattr(settings, 'TELEGRAM_API_BASE', 'https://api.telegram.org')
+REQUEST_TIMEOUT = (5, 10)  # Connect, read (seconds)
+
+
+class TelegramDeliveryError(Exception):
+    """Telegram rejected or didn't answer a sendMessage call"""
+
 
 class TelegramNotificationService:
     """Service for sending Telegram notifications to cafe owner"""
@@ -45,23 +58,25 @@ class TelegramNotificationService:
             logger.error(f"Failed to load Telegram config: {e}")
             self.enabled = False
     
-    def _send_message(self, text, parse_mode='HTML', retry_count=3):
+    def _send_message(self, text, parse_mode='HTML'):
         """
-        Send message to Telegram with retry logic
+        Send message to Telegram (one attempt; the job queue retries)
         
         Args:
             text: Message text to send
             parse_mode: 'HTML' or 'Markdown'
-            retry_count: Number of retry attempts
         
         Returns:
-            bool: True if sent successfully, False otherwise
+            bool: True if sent, False if notifications are disabled or not configured
+        
+        Raises:
+            TelegramDeliveryError: If the API call failed
         """
         if not self.enabled or not self.bot_token or not self.chat_id:
             logger.warning("Telegram notifications disabled or not configured")
             return False
         
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        url = f"{TELEGRAM_API_BASE}/bot{self.bot_token}/sendMessage"
         payload = {
             'chat_id': self.chat_id,
             'text': text,
@@ -69,21 +84,16 @@ class TelegramNotificationService:
             'disable_web_page_preview': True
         }
         
-        for attempt in range(retry_count):
-            try:
-                response = requests.post(url, json=payload, timeout=10)
-                
-                if response.status_code == 200:
-                    logger.info(f"Telegram notification sent successfully to {self.chat_id}")
-                    return True
-                else:
-                    logger.warning(f"Telegram API error (attempt {attempt + 1}/{retry_count}): {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Telegram request failed (attempt {attempt + 1}/{retry_count}): {e}")
-        
-        logger.error(f"Failed to send Telegram notification after {retry_count} attempts")
-        return False
+        try:
+            response = get_session('telegram').post(url, json=payload, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            raise TelegramDeliveryError(f"Telegram request failed: {e}") from e
+        
+        if response.status_code != 200:
+            raise TelegramDeliveryError(f"Telegram API error {response.status_code}: {response.text[:500]}")
+        
+        logger.info(f"Telegram notification sent successfully to {self.chat_id}")
+        return True
     
     def send_test_message(self):
         """
@@ -100,7 +110,7 @@ class TelegramNotificationService:
         
         # For test messages, bypass the enabled check
         # Temporarily send message even if notifications are disabled
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        url = f"{TELEGRAM_API_BASE}/bot{self.bot_token}/sendMessage"
         
         test_text = (
             "🎮 <b>Telegram Notification Test</b>\n\n"
@@ -118,7 +128,7 @@ class TelegramNotificationService:
         }
         
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = get_session('telegram').post(url, json=payload, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 logger.info(f"Test notification sent successfully to {self.chat_id}")
@@ -135,126 +145,155 @@ class TelegramNotificationService:
     
     def send_new_booking_notification(self, booking):
         """
-        Send notification for new confirmed booking
+        Queue notification for new confirmed booking
+        
+        Queued once per booking, however many payment paths confirm it.
         
         Args:
             booking: Booking model instance
+        
+        Returns:
+            bool: True if queued (or already queued)
         """
         if not self.enabled:
             return False
         
-        try:
-            # Extract booking details
-            customer = booking.customer
-            customer_name = customer.user.get_full_name() or customer.user.username
-            customer_phone = customer.phone or 'N/A'
-            customer_email = customer.user.email or 'N/A'
-            
-            # Game details
-            if booking.game:
-                game_name = booking.game.name
-                slot_start = booking.game_slot.start_datetime if booking.game_slot else booking.start_datetime
-                slot_end = booking.game_slot.end_datetime if booking.game_slot else booking.end_datetime
-            else:
-                # Fallback for old bookings
-                game_name = booking.gaming_station.name if booking.gaming_station else 'Unknown'
-                slot_start = booking.start_time
-                slot_end = booking.end_time
-            
-            # Format date and time
-            booking_date = slot_start.strftime('%b %d, %Y')
-            start_time = slot_start.strftime('%I:%M %p')
-            end_time = slot_end.strftime('%I:%M %p')
-            
-            # Calculate duration
-            duration = slot_end - slot_start
-            hours = int(duration.total_seconds() // 3600)
-            minutes = int((duration.total_seconds() % 3600) // 60)
-            duration_str = f"{hours} hour{'s' if hours != 1 else ''}"
-            if minutes > 0:
-                duration_str += f" {minutes} min"
+        from .job_queue import enqueue
+        enqueue('telegram_new_booking', f'telegram:new_booking:{booking.id}', booking=booking)
+        return True
+    
+    def build_new_booking_message(self, booking):
+        """Message text for a new confirmed booking"""
+        # Extract booking details
+        customer = booking.customer
+        customer_name = customer.user.get_full_name() or customer.user.username
+        customer_phone = customer.phone or 'N/A'
+        customer_email = customer.user.email or 'N/A'
+        
+        # Game details
+        if booking.game:
+            game_name = booking.game.name
+            slot_start = booking.game_slot.start_datetime if booking.game_slot else booking.start_datetime
+            slot_end = booking.game_slot.end_datetime if booking.game_slot else booking.end_datetime
+        else:
+            # Fallback for old bookings
+            game_name = booking.gaming_station.name if booking.gaming_station else 'Unknown'
+            slot_start = booking.start_time
+            slot_end = booking.end_time
+        
+        # Format date and time
+        booking_date = slot_start.strftime('%b %d, %Y')
+        start_time = slot_start.strftime('%I:%M %p')
+        end_time = slot_end.strftime('%I:%M %p')
+        
+        # Calculate duration
+        duration = slot_end - slot_start
+        hours = int(duration.total_seconds() // 3600)
+        minutes = int((duration.total_seconds() % 3600) // 60)
+        duration_str = f"{hours} hour{'s' if hours != 1 else ''}"
+        if minutes > 0:
+            duration_str += f" {minutes} min"
+        
+        # Booking type
+        booking_type = booking.get_booking_type_display() if hasattr(booking, 'booking_type') else 'Private Booking'
+        
+        # Amount
+        amount = booking.total_amount or Decimal('0.00')
+        
+        # Booking ID (short version)
+        booking_id_short = str(booking.id)[:8]
+        
+        # Construct message
+        message = (
+            "🎮 <b>NEW BOOKING CONFIRMED</b>\n\n"
             
-            # Booking type
-            booking_type = booking.get_booking_type_display() if hasattr(booking, 'booking_type') else 'Private Booking'
+            "👤 <b>Customer Details:</b>\n"
+            f"   Name: {customer_name}\n"
+            f"   Phone: {customer_phone}\n"
+            f"   Email: {customer_email}\n\n"
             
-            # Amount
-            amount = booking.total_amount or Decimal('0.00')
+            " <b>Booking Details:</b>\n"
+            f"   Game: {game_name}\n"
+            f"   Date: {booking_date}\n"
+            f"   Time: {start_time} - {end_time} ({duration_str})\n"
+            f"   Type: {booking_type}\n\n"
             
-            # Booking ID (short version)
-            booking_id_short = str(booking.id)[:8]
+            "💰 <b>Payment:</b>\n"
+            f"   Amount: ₹{amount}\n\n"
             
-            # Construct message
-            message = (
-                "🎮 <b>NEW BOOKING CONFIRMED</b>\n\n"
-                
-                "👤 <b>Customer Details:</b>\n"
-                f"   Name: {customer_name}\n"
-                f"   Phone: {customer_phone}\n"
-                f"   Email: {customer_email}\n\n"
-                
-                " <b>Booking Details:</b>\n"
-                f"   Game: {game_name}\n"
-                f"   Date: {booking_date}\n"
-                f"   Time: {start_time} - {end_time} ({duration_str})\n"
-                f"   Type: {booking_type}\n\n"
-                
-                "💰 <b>Payment:</b>\n"
-                f"   Amount: ₹{amount}\n\n"
-                
-                f"🔗 <b>Booking ID:</b> {booking_id_short}\n"
-                "✅ <b>Status:</b> CONFIRMED"
-            )
-            
-            return self._send_message(message)
-            
-        except Exception as e:
-            logger.error(f"Failed to send new booking notification: {e}", exc_info=True)
-            return False
+            f"🔗 <b>Booking ID:</b> {booking_id_short}\n"
+            "✅ <b>Status:</b> CONFIRMED"
+        )
+        
+        return message
     
     def send_cancellation_notification(self, booking, reason='Customer request'):
         """
-        Send notification for booking cancellation
+        Queue notification for booking cancellation
         
         Args:
             booking: Booking model instance
             reason: Cancellation reason
+        
+        Returns:
+            bool: True if queued (or already queued)
         """
         if not self.enabled:
             return False
         
-        try:
-            customer = booking.customer
-            customer_name = customer.user.get_full_name() or customer.user.username
-            
-            if booking.game:
-                game_name = booking.game.name
-                slot_start = booking.game_slot.start_datetime if booking.game_slot else booking.start_datetime
-            else:
-                game_name = booking.gaming_station.name if booking.gaming_station else 'Unknown'
-                slot_start = booking.start_time
-            
-            booking_date = slot_start.strftime('%b %d, %Y')
-            start_time = slot_start.strftime('%I:%M %p')
-            
-            amount = booking.total_amount or Decimal('0.00')
-            booking_id_short = str(booking.id)[:8]
-            
-            message = (
-                "⚠️ <b>BOOKING CANCELLED</b>\n\n"
-                f"👤 <b>Customer:</b> {customer_name}\n"
-                f"🎯 <b>Game:</b> {game_name}\n"
-                f"📅 <b>Was:</b> {booking_date}, {start_time}\n"
-                f"💸 <b>Refund:</b> ₹{amount}\n\n"
-                f"📝 <b>Reason:</b> {reason}\n"
-                f"🔗 <b>Booking ID:</b> {booking_id_short}"
-            )
-            
-            return self._send_message(message)
-            
-        except Exception as e:
-            logger.error(f"Failed to send cancellation notification: {e}", exc_info=True)
-            return False
+        from .job_queue import enqueue
+        enqueue(
+            'telegram_cancellation',
+            f'telegram:cancellation:{booking.id}',
+            booking=booking,
+            payload={'reason': reason}
+        )
+        return True
+    
+    def build_cancellation_message(self, booking, reason='Customer request'):
+        """Message text for a booking cancellation"""
+        customer = booking.customer
+        customer_name = customer.user.get_full_name() or customer.user.username
+        
+        if booking.game:
+            game_name = booking.game.name
+            slot_start = booking.game_slot.start_datetime if booking.game_slot else booking.start_datetime
+        else:
+            game_name = booking.gaming_station.name if booking.gaming_station else 'Unknown'
+            slot_start = booking.start_time
+        
+        booking_date = slot_start.strftime('%b %d, %Y')
+        start_time = slot_start.strftime('%I:%M %p')
+        
+        amount = booking.total_amount or Decimal('0.00')
+        booking_id_short = str(booking.id)[:8]
+        
+        message = (
+            "⚠️ <b>BOOKING CANCELLED</b>\n\n"
+            f"👤 <b>Customer:</b> {customer_name}\n"
+            f"🎯 <b>Game:</b> {game_name}\n"
+            f"📅 <b>Was:</b> {booking_date}, {start_time}\n"
+            f"💸 <b>Refund:</b> ₹{amount}\n\n"
+            f"📝 <b>Reason:</b> {reason}\n"
+            f"🔗 <b>Booking ID:</b> {booking_id_short}"
+        )
+        
+        return message
 
 
 # Global instance
 telegram_service = TelegramNotificationService()
+
+
+def deliver_new_booking_notification(job):
+    """Job handler: send a queued new-booking notification"""
+    # Fresh instance, so settings changed since the worker started apply
+    service = TelegramNotificationService()
+    service._send_message(service.build_new_booking_message(job.booking))
+
+
+def deliver_cancellation_notification(job):
+    """Job handler: send a queued cancellation notification"""
+    service = TelegramNotificationService()
+    reason = job.payload.get('reason', 'Customer request')
+    service._send_message(service.build_cancellation_message(job.booking, reason))
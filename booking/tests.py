@@ -0,0 +1,905 @@
+"""
+Booking app tests
+Outbound HTTP (Telegram Bot API, Razorpay) is pointed at StubServer, a local
+HTTP server that answers from a scripted list of responses and records what
+it received.
+"""
+import json
+import threading
+from datetime import date, time, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from io import StringIO
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authentication.models import CafeOwner, Customer, TapNexSuperuser
+
+from . import availability_broadcast, job_queue, payment_reconciliation, razorpay_webhooks, revenue_rollup
+from .http_client import CircuitOpenError, ResilientSession
+from .models import (
+    Booking, DailyRevenueRollup, Game, GameSlot, NotificationJob, RazorpayWebhookEvent, SlotAvailability
+)
+from .pagination import BOOKING_KEYSET, keyset_page
+
+
+class StubServer:
+    """
+    Local HTTP server for outbound-call tests
+    
+    Each request gets route(method, path) if that returns a (status, body),
+    else the next one from `responses`, or `default` once they run out.
+    Requests are recorded as (method, path, body).
+    """
+    
+    def __init__(self, responses=None, default=(200, {'ok': True}), route=None):
+        self.responses = list(responses or [])
+        self.default = default
+        self.route = route
+        self.requests = []
+        self.connections = set()
+        self._lock = threading.Lock()
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, so connection reuse is observable
+            
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode() if length else ''
+                with stub._lock:
+                    stub.requests.append((self.command, self.path, body))
+                    stub.connections.add(self.client_address)
+                    routed = stub.route(self.command, self.path) if stub.route else None
+                    if routed:
+                        status, payload = routed
+                    else:
+                        status, payload = stub.responses.pop(0) if stub.responses else stub.default
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            do_GET = do_POST = _respond
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_game(**fields):
+    """An every-day 10:00-22:00 hybrid game with tomorrow's hourly slots"""
+    values = {
+        'name': f'Game {Game.objects.count() + 1}',
+        'description': 'Test game',
+        'capacity': 4,
+        'booking_type': 'HYBRID',
+        'opening_time': time(10, 0),
+        'closing_time': time(22, 0),
+        'slot_duration_minutes': 60,
+        'available_days': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'],
+        'private_price': 100,
+        'shared_price': 30,
+    }
+    values.update(fields)
+    game = Game.objects.create(**values)
+    game.generate_slots(days_ahead=2)
+    return game
+
+
+def make_booking(customer=None, game=None, **fields):
+    """A booking on tomorrow's first (10:00) slot of a game (a fresh one by default)"""
+    game = game or make_game()
+    slot = game.slots.filter(date=date.today() + timedelta(days=1)).order_by('start_time').first()
+    
+    if customer is None:
+        user = User.objects.create_user(
+            username=f'customer{User.objects.count() + 1}', email='player@example.com', first_name='Asha'
+        )
+        customer = Customer.objects.create(user=user, phone='+919876543210')
+    
+    values = {
+        'customer': customer,
+        'game': game,
+        'game_slot': slot,
+        'booking_type': 'SHARED',
+        'spots_booked': 1,
+        'price_per_spot': 30,
+        'status': 'PENDING',
+    }
+    values.update(fields)
+    return Booking.objects.create(**values)
+
+
+class SlotAvailabilityVersionTests(TestCase):
+    """Every availability write moves the optimistic concurrency token"""
+    
+    def test_save_bumps_version(self):
+        availability = SlotAvailability.objects.get(game_slot=make_booking().game_slot)
+        version = availability.version
+        
+        availability.booked_spots += 1
+        availability.save()
+        availability.reserved_spots = 0
+        availability.save(update_fields=['reserved_spots'])
+        
+        availability.refresh_from_db()
+        self.assertEqual(availability.version, version + 2)
+    
+    def test_booking_status_change_bumps_version(self):
+        booking = make_booking()
+        version = SlotAvailability.objects.get(game_slot=booking.game_slot).version
+        
+        booking.status = 'CONFIRMED'
+        booking.save()
+        
+        self.assertEqual(SlotAvailability.objects.get(game_slot=booking.game_slot).version, version + 1)
+
+
+class BookingSaveQueryTests(TestCase):
+    """A status change must not re-read the booking or lazily load its relations"""
+    
+    def setUp(self):
+        self.booking = Booking.objects.get(id=make_booking().id)
+    
+    def test_status_change_query_count(self):
+        # UPDATE booking, INSERT history, SELECT slot (time-based status check),
+        # SAVEPOINT, SELECT + UPDATE availability, RELEASE
+        with self.assertNumQueries(7):
+            self.booking.status = 'CONFIRMED'
+            self.booking.save()
+        
+        self.assertEqual(self.booking.history.get().previous_status, 'PENDING')
+    
+    def test_broadcast_uses_loaded_relations_only(self):
+        from .supabase_client import supabase_realtime
+        
+        booking = Booking.objects.select_related('customer__user', 'game', 'game_slot').get(id=self.booking.id)
+        with mock.patch.object(supabase_realtime, 'publish_booking_update') as publish:
+            self.booking.status = 'CONFIRMED'
+            self.booking.save()
+            booking.status = 'CANCELLED'
+            booking.save()
+        
+        bare, loaded = (call.args[0] for call in publish.call_args_list)
+        self.assertEqual(bare['game_id'], str(booking.game_id))
+        self.assertNotIn('customer_name', bare)
+        self.assertEqual(loaded['customer_name'], 'Asha')
+        self.assertEqual(loaded['game_name'], booking.game.name)
+        self.assertEqual(loaded['start_time'], booking.game_slot.start_datetime.isoformat())
+
+
+class GameAnalyticsQueryTests(TestCase):
+    """The game analytics views cost the same number of queries whatever the date range"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner')
+        CafeOwner.objects.create(user=owner, contact_email='owner@example.com', phone='+919876543211')
+        cls.owner = owner
+        cls.game = make_game()
+        customer = make_booking(game=cls.game).customer
+        
+        # Three bookings a day over the last 90 days (over 50 in any window, so the
+        # weekly trend query runs for both ranges), across hours and statuses
+        today = date.today()
+        slots = GameSlot.objects.bulk_create([
+            GameSlot(game=cls.game, date=today - timedelta(days=day), start_time=time(hour, 0), end_time=time(hour + 1, 0))
+            for day in range(1, 91) for hour in (10, 14, 18)
+        ])
+        Booking.objects.bulk_create([
+            Booking(
+                customer=customer, game=cls.game, game_slot=slot,
+                booking_type='PRIVATE' if index % 3 == 0 else 'SHARED',
+                spots_booked=1, price_per_spot=30, subtotal=30, total_amount=30,
+                status='CANCELLED' if index % 5 == 0 else 'CONFIRMED',
+            )
+            for index, slot in enumerate(slots)
+        ])
+    
+    def setUp(self):
+        self.client.force_login(self.owner)
+    
+    def assertQueriesIndependentOfRange(self, short_url, long_url, bound):
+        counts = []
+        for url in (short_url, long_url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1], f'{short_url} vs {long_url}')
+        self.assertLessEqual(counts[1], bound)
+        return response
+    
+    def test_game_analytics(self):
+        url = f'/booking/games/manage/{self.game.id}/analytics/?date_from='
+        today = date.today()
+        response = self.assertQueriesIndependentOfRange(
+            f'{url}{today - timedelta(days=29)}', f'{url}{today - timedelta(days=89)}', bound=13
+        )
+        self.assertEqual(response.context['total_bookings'], 267)
+    
+    def test_schedule_optimization_suggestions(self):
+        url = f'/booking/games/manage/api/schedule-optimization/{self.game.id}/?days='
+        response = self.assertQueriesIndependentOfRange(f'{url}30', f'{url}90', bound=18)
+        analytics = response.json()['analytics']
+        self.assertEqual(analytics['analysis_period']['days'], 90)
+        self.assertEqual(analytics['total_bookings'], 216)
+    
+    def test_advanced_schedule_management(self):
+        url = f'/booking/games/manage/schedule/advanced/{self.game.id}/?days='
+        response = self.assertQueriesIndependentOfRange(f'{url}30', f'{url}90', bound=15)
+        statistics = response.context['statistics']
+        self.assertEqual(statistics['total_bookings'], 216)
+        self.assertEqual(sum(stats['bookings'] for stats in response.context['daily_stats'].values()), 216)
+        self.assertEqual(set(response.context['hourly_stats']), {10, 14, 18})
+
+
+class NotificationJobQueueTests(TestCase):
+    """enqueue -> claim -> deliver against a local fake Telegram Bot API"""
+    
+    def setUp(self):
+        TapNexSuperuser.objects.create(
+            user=User.objects.create_user(username='tapnex'),
+            telegram_bot_token='TEST-TOKEN',
+            telegram_chat_id='42',
+            telegram_enabled=True,
+        )
+        self.booking = make_booking(status='CONFIRMED', payment_status='PAID')
+    
+    def _bot_api(self, responses=None):
+        server = StubServer(responses)
+        self.enterContext(server)
+        self.enterContext(mock.patch('booking.telegram_service.TELEGRAM_API_BASE', server.url))
+        return server
+    
+    def _make_due(self, job):
+        NotificationJob.objects.filter(id=job.id).update(run_after=timezone.now())
+    
+    def test_job_is_delivered_to_bot_api(self):
+        bot = self._bot_api()
+        job, created = job_queue.enqueue('telegram_new_booking', f'telegram:new_booking:{self.booking.id}', booking=self.booking)
+        
+        summary = job_queue.process_jobs()
+        
+        self.assertTrue(created)
+        self.assertEqual(summary['done'], 1)
+        self.assertEqual(len(bot.requests), 1)
+        method, path, body = bot.requests[0]
+        self.assertEqual((method, path), ('POST', '/botTEST-TOKEN/sendMessage'))
+        self.assertEqual(json.loads(body)['chat_id'], '42')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_until), ('DONE', 1, None))
+    
+    def test_server_error_is_retried_with_backoff(self):
+        bot = self._bot_api([(500, {'ok': False}), (502, {'ok': False})])
+        job, _ = job_queue.enqueue('telegram_new_booking', f'telegram:new_booking:{self.booking.id}', booking=self.booking)
+        
+        before = timezone.now()
+        self.assertEqual(job_queue.process_jobs()['retrying'], 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('PENDING', 1))
+        self.assertIn('500', job.last_error)
+        # First retry waits BACKOFF_BASE seconds (+/- 20% jitter); not picked up before then
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=job_queue.BACKOFF_BASE * 0.8))
+        self.assertEqual(job_queue.process_jobs()['claimed'], 0)
+        
+        self._make_due(job)
+        job_queue.process_jobs()
+        job.refresh_from_db()
+        second_delay = (job.run_after - timezone.now()).total_seconds()
+        self.assertEqual(job.attempts, 2)
+        self.assertGreater(second_delay, job_queue.BACKOFF_BASE * 2 * 0.8 - 1)
+        
+        self._make_due(job)
+        self.assertEqual(job_queue.process_jobs()['done'], 1)
+        self.assertEqual(len(bot.requests), 3)
+    
+    def test_job_is_dead_lettered_after_max_attempts(self):
+        bot = self._bot_api([(503, {'ok': False})] * 3)
+        job, _ = job_queue.enqueue(
+            'telegram_new_booking', f'telegram:new_booking:{self.booking.id}', booking=self.booking, max_attempts=3
+        )
+        
+        for _ in range(3):
+            self._make_due(job)
+            job_queue.process_jobs()
+        
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('DEAD', 3))
+        self.assertIsNotNone(job.completed_at)
+        self._make_due(job)
+        self.assertEqual(job_queue.process_jobs()['claimed'], 0)
+        self.assertEqual(len(bot.requests), 3)
+        
+        self.assertEqual(job_queue.requeue_dead_jobs(), 1)
+        self.assertEqual(job_queue.process_jobs()['done'], 1)
+    
+    def test_outcome_is_dropped_after_lease_is_lost(self):
+        self._bot_api()
+        job_queue.enqueue('telegram_new_booking', f'telegram:new_booking:{self.booking.id}', booking=self.booking)
+        job = job_queue.claim_next_job()
+        
+        # Lease ran out and another worker re-claimed the job
+        NotificationJob.objects.filter(id=job.id).update(locked_until=timezone.now() + timedelta(minutes=5))
+        
+        self.assertEqual(job_queue.run_job(job), 'LOST')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'RUNNING')
+    
+    def test_payment_paths_queue_one_notification_per_booking(self):
+        from .payment_views import handle_order_paid, handle_payment_captured
+        from .telegram_service import telegram_service
+        
+        bot = self._bot_api()
+        booking = make_booking(status='PENDING', razorpay_order_id='order_stub_1')
+        self.client.force_login(booking.customer.user)
+        
+        # Each path sees owner_notified unset, as when they race on the same payment
+        with mock.patch.object(telegram_service, 'enabled', True), \
+                mock.patch('booking.payment_views.razorpay_service.verify_payment_signature', return_value=True):
+            response = self.client.post('/booking/payment/verify/', {
+                'razorpay_order_id': 'order_stub_1',
+                'razorpay_payment_id': 'pay_stub_1',
+                'razorpay_signature': 'signature',
+                'booking_id': str(booking.id),
+            }, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            
+            Booking.objects.filter(id=booking.id).update(owner_notified=False)
+            handle_payment_captured({'id': 'pay_stub_1', 'order_id': 'order_stub_1', 'amount': 3000})
+            Booking.objects.filter(id=booking.id).update(owner_notified=False)
+            handle_order_paid({'id': 'order_stub_1', 'amount_paid': 3000})
+        
+        jobs = NotificationJob.objects.filter(booking=booking, kind='telegram_new_booking')
+        self.assertEqual(jobs.count(), 1)
+        self.assertEqual(jobs.get().idempotency_key, f'telegram:new_booking:{booking.id}')
+        
+        job_queue.process_jobs()
+        self.assertEqual(len([request for request in bot.requests if request[1].endswith('/sendMessage')]), 1)
+
+
+class WebhookProcessingTests(TestCase):
+    """Stored Razorpay webhooks are applied due-first without breaking per-order order"""
+    
+    def _event(self, event_id, ordering_key, created_at, backing_off=False):
+        return RazorpayWebhookEvent.objects.create(
+            event_id=event_id,
+            event='payment.captured',
+            ordering_key=ordering_key,
+            event_created_at=created_at,
+            payload={},
+            attempts=1 if backing_off else 0,
+            next_attempt_at=timezone.now() + timedelta(minutes=5) if backing_off else None,
+        )
+    
+    def _process(self, limit=razorpay_webhooks.PROCESS_BATCH_SIZE):
+        with mock.patch('booking.razorpay_webhooks.apply_event') as apply_event:
+            summary = razorpay_webhooks.process_webhook_events(limit=limit)
+        return summary, [call.args[0].event_id for call in apply_event.call_args_list]
+    
+    def test_backing_off_events_do_not_starve_new_ones(self):
+        for number in range(150):
+            self._event(f'evt_failing_{number}', f'order_failing_{number}', created_at=1000 + number, backing_off=True)
+        self._event('evt_new', 'order_new', created_at=5000)
+        
+        summary, applied = self._process(limit=100)
+        
+        self.assertEqual(applied, ['evt_new'])
+        self.assertEqual(summary, {'processed': 1, 'retrying': 0, 'failed': 0, 'blocked': 0})
+    
+    def test_events_wait_behind_a_backing_off_event_for_the_same_order(self):
+        self._event('evt_a1', 'order_a', created_at=1000, backing_off=True)
+        self._event('evt_a2', 'order_a', created_at=1001)
+        self._event('evt_b1', 'order_b', created_at=1002)
+        self._event('evt_early', 'order_c', created_at=900)
+        self._event('evt_c2', 'order_c', created_at=1003, backing_off=True)
+        
+        summary, applied = self._process()
+        
+        # evt_early precedes order_c's backing-off event, so it isn't held back
+        self.assertEqual(applied, ['evt_early', 'evt_b1'])
+        self.assertEqual(summary['blocked'], 1)
+        self.assertEqual(RazorpayWebhookEvent.objects.get(event_id='evt_a2').status, 'PENDING')
+        
+        RazorpayWebhookEvent.objects.filter(event_id='evt_a1').update(next_attempt_at=timezone.now())
+        _, applied = self._process()
+        self.assertEqual(applied, ['evt_a1', 'evt_a2'])
+
+
+class OwnerBookingsPaginationTests(TestCase):
+    """Keyset pages cover every booking once, including legacy bookings without a slot"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner')
+        CafeOwner.objects.create(user=owner, contact_email='owner@example.com', phone='+919876543211')
+        cls.owner = owner
+        game = make_game()
+        customer = make_booking(game=game).customer
+        
+        # Several bookings per slot, plus legacy station bookings (no slot)
+        slots = list(game.slots.order_by('date', 'start_time')[:5])
+        now = timezone.now()
+        Booking.objects.bulk_create(
+            [
+                Booking(customer=customer, game=game, game_slot=slot, booking_type='SHARED', spots_booked=1,
+                        price_per_spot=30, subtotal=30, total_amount=30, status='CONFIRMED')
+                for slot in slots for _ in range(2)
+            ] + [
+                Booking(customer=customer, start_time=now, end_time=now + timedelta(hours=1), spots_booked=1,
+                        subtotal=50, total_amount=50, status='COMPLETED')
+                for _ in range(3)
+            ]
+        )
+        cls.game = game
+    
+    def _expected(self):
+        def key(booking):
+            slot = booking.game_slot
+            # NULL is the smallest key
+            return (slot is not None, slot and slot.date, slot and slot.start_time, booking.id)
+        return [booking.id for booking in sorted(Booking.objects.select_related('game_slot'), key=key, reverse=True)]
+    
+    def test_pages_forward_and_back_include_bookings_without_slot(self):
+        bookings = Booking.objects.select_related('game_slot')
+        expected = self._expected()
+        self.assertEqual(len(expected), 14)
+        
+        pages = [keyset_page(bookings, BOOKING_KEYSET, per_page=4)]
+        while pages[-1].has_next():
+            pages.append(keyset_page(bookings, BOOKING_KEYSET, pages[-1].next_cursor, per_page=4))
+        self.assertEqual([booking.id for page in pages for booking in page], expected)
+        self.assertIsNone(pages[-1].object_list[-1].game_slot)
+        
+        # Back from the last page, including one that starts on a slotless booking
+        backward = [pages[-1]]
+        while backward[-1].has_previous():
+            backward.append(keyset_page(bookings, BOOKING_KEYSET, backward[-1].previous_cursor, per_page=4))
+        self.assertEqual([booking.id for page in reversed(backward) for booking in page], expected)
+    
+    def test_owner_bookings_lists_legacy_bookings(self):
+        self.client.force_login(self.owner)
+        response = self.client.get('/accounts/owner/bookings/', {'date': 'all'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_bookings'], 14)
+        self.assertEqual([booking.id for booking in response.context['bookings']], self._expected())
+
+
+class PaymentReconciliationTests(TestCase):
+    """reconcile_payments against a local stub of the Razorpay orders API"""
+    
+    ORDER_PAYMENTS = {
+        'order_captured': [{'id': 'pay_failed', 'status': 'failed'}, {'id': 'pay_captured', 'status': 'captured'}],
+        'order_webhook': [{'id': 'pay_webhook', 'status': 'captured'}],
+        'order_expired': [{'id': 'pay_late', 'status': 'captured'}],
+        'order_authorized': [{'id': 'pay_authorized', 'status': 'authorized'}],
+        'order_unpaid': [],
+    }
+    
+    def setUp(self):
+        from .razorpay_service import razorpay_service
+        
+        server = StubServer(route=self._route)
+        self.enterContext(server)
+        self.enterContext(mock.patch.object(razorpay_service.client, 'base_url', server.url))
+        self.server = server
+        
+        self.bookings = {
+            order_id: make_booking(razorpay_order_id=order_id, payment_status='PENDING',
+                                   status='EXPIRED' if order_id == 'order_expired' else 'PENDING')
+            for order_id in list(self.ORDER_PAYMENTS) + ['order_missing']
+        }
+    
+    def _route(self, method, path):
+        # GET /v1/orders/<order_id>/payments
+        order_id = path.split('/')[3]
+        if order_id not in self.ORDER_PAYMENTS:
+            return 400, {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'The id provided does not exist'}}
+        return 200, {'entity': 'collection', 'count': len(self.ORDER_PAYMENTS[order_id]), 'items': self.ORDER_PAYMENTS[order_id]}
+    
+    def _reconcile(self):
+        fetch_outcomes = payment_reconciliation.fetch_outcomes
+        
+        def fetch_then_webhook(*args):
+            # The order.paid webhook lands between the fetch and the apply step
+            outcomes = fetch_outcomes(*args)
+            Booking.objects.filter(razorpay_order_id='order_webhook').update(payment_status='PAID', status='CONFIRMED')
+            return outcomes
+        
+        with mock.patch('booking.payment_reconciliation.fetch_outcomes', side_effect=fetch_then_webhook):
+            return payment_reconciliation.reconcile_payments(workers=3, rate=100)
+    
+    def test_outcomes(self):
+        report = self._reconcile()
+        
+        outcomes = {row['order_id']: row['outcome'] for row in report['rows']}
+        self.assertEqual(outcomes, {
+            'order_captured': payment_reconciliation.CONFIRMED,
+            'order_webhook': payment_reconciliation.ALREADY_PAID,
+            'order_expired': payment_reconciliation.NEEDS_REVIEW,
+            'order_authorized': payment_reconciliation.AUTHORIZED,
+            'order_unpaid': payment_reconciliation.UNPAID,
+            'order_missing': payment_reconciliation.ERROR,
+        })
+        self.assertEqual(report['checked'], 6)
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertTrue(all(method == 'GET' for method, _, _ in self.server.requests))
+        
+        confirmed = Booking.objects.get(id=self.bookings['order_captured'].id)
+        self.assertEqual((confirmed.status, confirmed.payment_status, confirmed.razorpay_payment_id),
+                         ('CONFIRMED', 'PAID', 'pay_captured'))
+        expired = Booking.objects.get(id=self.bookings['order_expired'].id)
+        self.assertEqual((expired.status, expired.payment_status), ('EXPIRED', 'PENDING'))
+        
+        rows = {row['order_id']: row for row in report['rows']}
+        self.assertIn('does not exist', rows['order_missing']['detail'])
+        self.assertEqual(rows['order_expired']['detail'], 'payment captured but booking is EXPIRED')
+    
+    def test_dry_run_writes_nothing(self):
+        report = payment_reconciliation.reconcile_payments(dry_run=True, rate=100)
+        
+        self.assertEqual(report['counts'][payment_reconciliation.CONFIRMED], 2)
+        self.assertFalse(Booking.objects.filter(payment_status='PAID').exists())
+    
+    def test_rate_limiter_keeps_to_its_rate(self):
+        import time as time_module
+        
+        limiter = payment_reconciliation.RateLimiter(rate=50, burst=5)
+        started = time_module.monotonic()
+        for _ in range(15):
+            limiter.acquire()
+        elapsed = time_module.monotonic() - started
+        
+        # Five go out as a burst, the other ten at 50 per second
+        self.assertGreaterEqual(elapsed, 10 / 50 * 0.9)
+        self.assertLess(elapsed, 1.0)
+
+
+class ResilientSessionTests(TestCase):
+    """Outbound session behaviour against a local stub server"""
+    
+    def _stub(self, responses=None):
+        return self.enterContext(StubServer(responses))
+    
+    def test_connections_are_reused(self):
+        stub = self._stub()
+        session = ResilientSession('test')
+        
+        for _ in range(5):
+            self.assertEqual(session.get(f'{stub.url}/ping').status_code, 200)
+        
+        self.assertEqual(len(stub.requests), 5)
+        self.assertEqual(len(stub.connections), 1)
+    
+    def test_get_is_retried_on_503_but_post_is_not(self):
+        stub = self._stub([(503, {}), (200, {'ok': True})])
+        session = ResilientSession('test')
+        
+        self.assertEqual(session.get(f'{stub.url}/orders').status_code, 200)
+        self.assertEqual(session.stats.snapshot()['retries'], 1)
+        
+        stub.responses = [(503, {}), (200, {'ok': True})]
+        self.assertEqual(session.post(f'{stub.url}/orders', json={}).status_code, 503)
+        self.assertEqual([method for method, _, _ in stub.requests], ['GET', 'GET', 'POST'])
+    
+    def test_breaker_opens_after_consecutive_failures(self):
+        stub = self._stub()
+        stub.default = (500, {})
+        session = ResilientSession('test')
+        breaker = session.breaker_for(stub.url)
+        breaker.threshold = 3
+        
+        for _ in range(3):
+            self.assertEqual(session.post(f'{stub.url}/sendMessage', json={}).status_code, 500)
+        self.assertEqual(breaker.state, 'open')
+        
+        with self.assertRaises(CircuitOpenError):
+            session.post(f'{stub.url}/sendMessage', json={})
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(session.stats.snapshot()['short_circuited'], 1)
+    
+    def test_half_open_trial_is_resolved_by_any_exception(self):
+        import requests
+        
+        stub = self._stub()
+        session = ResilientSession('test')
+        breaker = session.breaker_for(stub.url)
+        breaker.threshold = 1
+        breaker.reset_seconds = 0
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'half-open')
+        
+        # The trial call fails with something other than a connection error or timeout
+        with mock.patch('requests.Session.request', side_effect=requests.exceptions.ChunkedEncodingError('cut off')):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                session.get(f'{stub.url}/ping')
+        
+        # The next trial is let through and closes the circuit
+        self.assertEqual(session.get(f'{stub.url}/ping').status_code, 200)
+        self.assertEqual(breaker.state, 'closed')
+
+
+
+class ReservedSpotsTests(TestCase):
+    """PENDING bookings without a reservation expiry never hold spots"""
+    
+    def setUp(self):
+        self.live = make_booking(spots_booked=1)
+        self.legacy = make_booking(game=self.live.game, spots_booked=2)
+        # Baseline bookings were saved without an expiry
+        Booking.objects.filter(pk=self.legacy.pk).update(reservation_expires_at=None)
+        self.availability = SlotAvailability.objects.get(game_slot=self.live.game_slot)
+        self.assertEqual(self.availability.reserved_spots, 3)
+    
+    def test_reconciliation_skips_bookings_without_expiry(self):
+        from django.core.management import call_command
+        
+        self.assertEqual(self.availability.recalculate_reserved_spots(), 1)
+        
+        call_command('reconcile_reserved_spots', stdout=StringIO())
+        
+        self.availability.refresh_from_db()
+        self.assertEqual(self.availability.reserved_spots, 1)
+    
+    def test_migration_expires_bookings_without_expiry(self):
+        from django.apps import apps
+        
+        migration = import_module('booking.migrations.0021_expire_pending_without_expiry')
+        migration.expire_pending_without_expiry(apps, None)
+        
+        self.legacy.refresh_from_db()
+        self.live.refresh_from_db()
+        self.availability.refresh_from_db()
+        self.assertEqual((self.legacy.status, self.legacy.is_reservation_expired), ('EXPIRED', True))
+        self.assertEqual(self.live.status, 'PENDING')
+        self.assertEqual(self.availability.reserved_spots, 1)
+
+class BookingConflictTests(TestCase):
+    """A rejected booking attempt doesn't broadcast availability"""
+    
+    def test_conflict_raises_without_broadcast(self):
+        from django.core.exceptions import ValidationError
+        
+        from .booking_service import BookingService
+        
+        booking = make_booking(booking_type='PRIVATE', spots_booked=4, price_per_spot=25, status='CONFIRMED')
+        
+        with mock.patch('booking.realtime_service.RealTimeService.broadcast_availability_updates') as broadcast:
+            with self.assertRaises(ValidationError):
+                BookingService.handle_booking_conflict(booking.game_slot, 'SHARED', 1)
+        
+        broadcast.assert_not_called()
+
+
+
+class RevenueRollupTests(TestCase):
+    """Incremental rollup updates always agree with a rebuild from bookings"""
+    
+    def assertMatchesRebuild(self):
+        def rows():
+            # Rows emptied by subtractions stay behind incrementally; a rebuild omits them
+            return sorted(
+                DailyRevenueRollup.objects.exclude(booking_count=0).values_list(
+                    'date', 'game_id', 'booking_type', 'payment_method', 'booking_count',
+                    'gross_amount', 'subtotal', 'platform_fee', 'commission_amount', 'owner_payout'
+                )
+            )
+        
+        incremental = rows()
+        revenue_rollup.rebuild_rollups()
+        self.assertEqual(incremental, rows())
+        return incremental
+    
+    def test_booking_lifecycle(self):
+        booking = make_booking(razorpay_order_id='order_1')
+        self.assertEqual(self.assertMatchesRebuild(), [])
+        
+        booking.payment_status = 'PAID'
+        booking.status = 'CONFIRMED'
+        booking.save()
+        self.assertEqual(len(self.assertMatchesRebuild()), 1)
+        
+        booking.status = 'CANCELLED'
+        booking.payment_status = 'REFUNDED'
+        booking.save()
+        self.assertEqual(self.assertMatchesRebuild(), [])
+        
+        booking.payment_status = 'PAID'
+        booking.save(update_fields=['payment_status'])
+        self.assertEqual(len(self.assertMatchesRebuild()), 1)
+        
+        Booking.objects.get(pk=booking.pk).delete()
+        self.assertEqual(self.assertMatchesRebuild(), [])
+    
+    def test_unpaid_after_loading_deferred_amount(self):
+        booking = make_booking(payment_status='PAID', status='CONFIRMED')
+        self.assertEqual(len(self.assertMatchesRebuild()), 1)
+        
+        # save() reads the deferred total_amount before writing the new payment status
+        booking = Booking.objects.defer('total_amount').get(pk=booking.pk)
+        booking.payment_status = 'FAILED'
+        booking.save(update_fields=['payment_status'])
+        
+        self.assertEqual(self.assertMatchesRebuild(), [])
+    
+    def test_unsaved_edits_outside_update_fields_are_ignored(self):
+        booking = make_booking()
+        
+        booking.total_amount = 999
+        booking.payment_status = 'PAID'
+        booking.save(update_fields=['payment_status'])
+        
+        rollup = self.assertMatchesRebuild()
+        self.assertEqual(len(rollup), 1)
+        self.assertNotEqual(rollup[0][5], 999)
+
+@override_settings(SHARED_BOOKING_MODE='optimistic')
+class OptimisticSharedBookingTests(TransactionTestCase):
+    """The optimistic path never oversells and accepts what the locking path accepts"""
+    
+    def _interleave(self, during_check):
+        """Run during_check() once, between the first capacity check and the claiming UPDATE"""
+        original = SlotAvailability.get_truly_available_spots
+        pending = [during_check]
+        
+        def check(availability):
+            spots = original(availability)
+            if pending:
+                pending.pop()()
+            return spots
+        
+        return mock.patch.object(SlotAvailability, 'get_truly_available_spots', autospec=True, side_effect=check)
+    
+    def test_concurrent_bookings_that_fit_both_succeed_first_time(self):
+        from .booking_service import BookingService
+        
+        first = make_booking(status='CANCELLED')
+        slot = first.game_slot
+        
+        with self._interleave(lambda: BookingService.create_booking(first.customer, slot, 'SHARED', 2)), \
+                mock.patch('time.sleep') as backoff:
+            booking = BookingService.create_booking(first.customer, slot, 'SHARED', 2)
+        
+        backoff.assert_not_called()
+        self.assertEqual(booking.status, 'PENDING')
+        self.assertEqual(SlotAvailability.objects.get(game_slot=slot).reserved_spots, 4)
+    
+    def test_stale_capacity_check_cannot_oversell(self):
+        from .booking_service import BookingService
+        
+        first = make_booking(status='CANCELLED')
+        slot = first.game_slot
+        
+        # Another request takes the last 3 spots after this one saw 4 free
+        with self._interleave(lambda: BookingService.create_booking(first.customer, slot, 'SHARED', 3)):
+            with self.assertRaises(ValidationError):
+                BookingService.create_booking(first.customer, slot, 'SHARED', 2)
+        
+        availability = SlotAvailability.objects.get(game_slot=slot)
+        self.assertEqual(availability.reserved_spots, 3)
+        self.assertEqual(Booking.objects.filter(game_slot=slot, status='PENDING').count(), 1)
+    
+    @skipIf(connection.vendor == 'sqlite', "SQLite's shared in-memory test database rejects concurrent writers")
+    def test_concurrent_bookings_never_oversell(self):
+        from .booking_service import BookingService
+        
+        first = make_booking(status='CANCELLED')
+        slot, customer = first.game_slot, first.customer
+        booked, rejected, errors = [], [], []
+        lock = threading.Lock()
+        start = threading.Barrier(8)
+        
+        def worker():
+            start.wait()
+            try:
+                booking = BookingService.create_booking(customer, slot, 'SHARED', 1)
+                with lock:
+                    booked.append(booking.id)
+            except ValidationError:
+                with lock:
+                    rejected.append(1)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+            finally:
+                connection.close()
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        availability = SlotAvailability.objects.get(game_slot=slot)
+        held = availability.booked_spots + availability.reserved_spots
+        self.assertLessEqual(held, availability.total_capacity)
+        self.assertEqual(len(booked), 4)
+        self.assertEqual(len(rejected), 4)
+        self.assertEqual(availability.reserved_spots, Booking.objects.filter(id__in=booked, status='PENDING').count())
+    
+    def test_lapsed_reservation_is_released(self):
+        from .booking_service import BookingService
+        
+        game = make_game()
+        lapsed = make_booking(game=game, spots_booked=3)
+        Booking.objects.filter(pk=lapsed.pk).update(reservation_expires_at=timezone.now() - timedelta(minutes=1))
+        
+        booking = BookingService.create_booking(lapsed.customer, lapsed.game_slot, 'SHARED', 2)
+        
+        lapsed.refresh_from_db()
+        self.assertEqual(lapsed.status, 'EXPIRED')
+        self.assertEqual(SlotAvailability.objects.get(game_slot=booking.game_slot).reserved_spots, 2)
+    
+    def test_privately_booked_slot_is_rejected(self):
+        from .booking_service import BookingService
+        
+        private = make_booking(booking_type='PRIVATE', spots_booked=4, price_per_spot=25, status='CONFIRMED')
+        
+        with self.assertRaises(ValidationError):
+            BookingService.create_booking(private.customer, private.game_slot, 'SHARED', 1)
+        
+        self.assertEqual(Booking.objects.filter(game_slot=private.game_slot).count(), 1)
+
+
+
+class AvailabilityBroadcastBatchTests(TransactionTestCase):
+    """Slots marked dirty in a transaction are broadcast once, only if it commits"""
+    
+    def setUp(self):
+        patcher = mock.patch('booking.realtime_service.RealTimeService.broadcast_availability_updates')
+        self.broadcast = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _mark_and_roll_back(self, *game_slot_ids):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                availability_broadcast.queue_availability_broadcasts(game_slot_ids)
+                raise RuntimeError
+    
+    def test_commit_sends_one_broadcast_per_slot(self):
+        with transaction.atomic():
+            availability_broadcast.queue_availability_broadcast(1)
+            availability_broadcast.queue_availability_broadcast(1)
+            with transaction.atomic():
+                availability_broadcast.queue_availability_broadcasts([2, 1])
+            self.broadcast.assert_not_called()
+        
+        self.broadcast.assert_called_once_with({1, 2})
+    
+    def test_rollback_sends_nothing(self):
+        self._mark_and_roll_back(1, 2)
+        self.broadcast.assert_not_called()
+        
+        # The next transaction doesn't inherit the rolled-back slots
+        with transaction.atomic():
+            availability_broadcast.queue_availability_broadcast(3)
+        
+        self.broadcast.assert_called_once_with({3})
+    
+    def test_rolled_back_savepoint_is_dropped(self):
+        with transaction.atomic():
+            self._mark_and_roll_back(2)
+            availability_broadcast.queue_availability_broadcast(1)
+        
+        self.broadcast.assert_called_once_with({1})
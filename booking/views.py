@@ -12,6 +12,7 @@ from .models import GamingStation, Booking, Notification, Game
 from .notifications import NotificationService, InAppNotification
 from .qr_service import QRCodeService
 from authentication.models import Customer
+import asyncio
 import json
 import logging
 
@@ -253,15 +254,36 @@ def simulate_payment(request, booking_id):
 
 
 @customer_required
-def get_notifications(request):
-    """Get user's notifications - REAL-TIME (NO CACHE)"""
-    # Optimized query - get unread notifications with single database hit
-    notifications = request.user.notifications.filter(
-        is_read=False
-    ).select_related('booking').order_by('-created_at')[:10]
+async def get_notifications(request):
+    """Get user's notifications - REAL-TIME (NO CACHE)
+    
+    Long-poll: with ?since=<newest notification id seen>&wait=<seconds> the
+    request is held until a newer unread notification exists or the wait
+    (capped at NOTIFICATION_LONG_POLL_MAX_WAIT) runs out. The view is async,
+    so under ASGI a held request costs a coroutine rather than a thread.
+    """
+    from django.conf import settings
+    
+    user = await request.auser()
+    unread = Notification.objects.filter(user=user, is_read=False)
+    
+    try:
+        since = int(request.GET['since'])
+        wait = min(max(int(request.GET.get('wait', 0)), 0), getattr(settings, 'NOTIFICATION_LONG_POLL_MAX_WAIT', 25))
+    except (KeyError, ValueError):
+        since, wait = None, 0
     
-    # Convert to list to get count without extra query
-    notifications_list = list(notifications)
+    if wait:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while loop.time() < deadline and not await unread.filter(id__gt=since).aexists():
+            await asyncio.sleep(getattr(settings, 'NOTIFICATION_LONG_POLL_INTERVAL', 2))
+    
+    # Optimized query - get unread notifications with single database hit
+    notifications_list = [
+        notification async for notification in
+        unread.select_related('booking').order_by('-created_at')[:10]
+    ]
     
     notification_data = []
     for notification in notifications_list:
@@ -306,14 +328,10 @@ def mark_notification_read(request, notification_id):
 def game_selection(request):
     """Game selection interface with hybrid booking options - OPTIMIZED"""
     from .models import Game, GameSlot, SlotAvailability
-    from .auto_slot_generator import auto_generate_slots_all_games
     from datetime import date, timedelta
     from django.db.models import Exists, OuterRef, Q, F
     from .timezone_utils import get_local_now, get_local_today, get_local_time
     
-    # Ensure slots are available (runs in background, doesn't block)
-    auto_generate_slots_all_games(async_mode=True)
-    
     # Get current time in local timezone (IST)
     now_local = get_local_now()
     today_local = get_local_today()
@@ -620,7 +638,9 @@ def update_booking_spots(request, booking_id):
         
         # Check if spots are available
         with transaction.atomic():
-            availability = booking.game_slot.availability
+            from .models import SlotAvailability
+            
+            availability = SlotAvailability.objects.select_for_update().get(game_slot=booking.game_slot)
             
             # Calculate spot difference
             spot_difference = new_spots - booking.spots_booked
@@ -646,12 +666,21 @@ def update_booking_spots(request, booking_id):
             booking.total_amount = booking.subtotal + booking.platform_fee
             
             # CRITICAL: Do NOT update availability.booked_spots for PENDING bookings
-            # PENDING bookings are tracked separately via get_reserved_spots_count()
+            # PENDING bookings are tracked in availability.reserved_spots instead
             # Only CONFIRMED bookings update booked_spots (handled in Booking.save())
             
-            # Save booking (this will NOT update availability.booked_spots since status is PENDING)
+            # Save booking (this will NOT update availability since status is unchanged)
             booking.save(update_fields=['spots_booked', 'subtotal', 'total_amount'])
             
+            # Move the reservation counter by the change in held spots
+            SlotAvailability.objects.filter(pk=availability.pk).update(
+                reserved_spots=F('reserved_spots') + spot_difference,
+                version=F('version') + 1
+            )
+            
+            from .availability_cache import invalidate_availability
+            invalidate_availability(booking.game_slot.game_id, booking.game_slot.date)
+            
             return JsonResponse({
                 'success': True,
                 'message': f'Booking updated from {old_spots} to {new_spots} spot(s)',
@@ -679,12 +708,47 @@ def update_booking_spots(request, booking_id):
 
 @customer_required
 def get_slot_availability(request, game_slot_id):
-    """AJAX endpoint to get real-time slot availability with detailed information"""
+    """AJAX endpoint to get real-time slot availability with detailed information
+    
+    Supports If-None-Match: the ETag is built from the slot's availability
+    version (bumped on every booking change), so unchanged polls get a 304.
+    """
     try:
-        from .models import GameSlot
+        from .models import GameSlot, SlotAvailability
         from .booking_service import BookingService
+        from .etags import make_etag, not_modified, with_etag
         
-        game_slot = get_object_or_404(GameSlot, id=game_slot_id, is_active=True)
+        game_slot = get_object_or_404(
+            GameSlot.objects.select_related('game', 'availability'),
+            id=game_slot_id,
+            is_active=True
+        )
+        
+        now = timezone.now()
+        lapsed_reservations = 0
+        try:
+            availability_version = game_slot.availability.version
+            if game_slot.availability.reserved_spots:
+                # Reservations that lapsed but haven't been swept yet change the options without a write
+                lapsed_reservations = game_slot.bookings.filter(
+                    status='PENDING',
+                    reservation_expires_at__lte=now
+                ).count()
+        except SlotAvailability.DoesNotExist:
+            availability_version = None
+        
+        etag = make_etag(
+            game_slot.id,
+            availability_version,
+            lapsed_reservations,
+            game_slot.game.updated_at,
+            game_slot.start_time,
+            game_slot.end_time,
+            game_slot.start_datetime <= now
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response is not None:
+            return cached_response
         
         # Get current booking options with detailed information
         booking_options = BookingService.get_booking_options(game_slot)
@@ -707,7 +771,7 @@ def get_slot_availability(request, game_slot_id):
                 'created_at': booking.created_at.isoformat()
             })
         
-        return JsonResponse({
+        return with_etag(JsonResponse({
             'success': True,
             'game_slot_id': str(game_slot_id),
             'game_info': {
@@ -738,9 +802,9 @@ def get_slot_availability(request, game_slot_id):
             'booking_options': booking_options,
             'existing_bookings': booking_details,
             'restrictions': restrictions,
-            'timestamp': timezone.now().isoformat(),
-            'is_past_slot': game_slot.start_datetime <= timezone.now()
-        })
+            'timestamp': now.isoformat(),
+            'is_past_slot': game_slot.start_datetime <= now
+        }), etag)
         
     except Exception as e:
         return JsonResponse({
@@ -3,6 +3,12 @@ ASGI config for gaming_cafe project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with uvicorn workers so the async realtime views (availability
+stream, station status, notification long-polling) hold idle connections as
+coroutines instead of threads:
+
+    gunicorn gaming_cafe.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
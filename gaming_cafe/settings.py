@@ -70,7 +70,7 @@ MIDDLEWARE = [
     'authentication.middleware.SessionTimeoutMiddleware',
     'authentication.middleware.AdminAccessMiddleware',
     'authentication.middleware.RoleBasedRedirectMiddleware',
-    'booking.middleware.AutoSlotMaintenanceMiddleware',  # Auto-generate slots in background
+    'booking.middleware.AutoSlotMaintenanceMiddleware',  # Opt-in fallback, see SLOT_MAINTENANCE_MIDDLEWARE
     'booking.middleware.NoCacheMiddleware',  # Disable caching on owner/admin pages for real-time updates
 ]
 
@@ -107,6 +107,35 @@ DATABASES = {
     )
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND selects where shared caches (see booking/cache.py) live:
+#   locmem - per process, no setup (default without REDIS_URL); platform fee settings aren't cached
+#   file   - shared by all workers on one host, stored in CACHE_LOCATION
+#   db     - shared by all hosts via the database (run `python manage.py createcachetable`)
+#   redis  - REDIS_URL (default when REDIS_URL is set; needs the `redis` package)
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis' if REDIS_URL else 'locmem')
+
+_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'fcb-default'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', config('CACHE_LOCATION', default='/tmp/fcb-cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', config('CACHE_LOCATION', default='fcb_cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', REDIS_URL),
+}
+
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ValueError(f"Unknown CACHE_BACKEND '{CACHE_BACKEND}', expected one of: {', '.join(_CACHE_BACKENDS)}")
+
+CACHES = {
+    'default': {
+        'BACKEND': _CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': _CACHE_BACKENDS[CACHE_BACKEND][1],
+        'KEY_PREFIX': 'fcb',
+        'TIMEOUT': 300,
+    }
+}
+
 # Supabase Configuration
 SUPABASE_URL = config('SUPABASE_URL', default='')
 SUPABASE_KEY = config('SUPABASE_KEY', default='')
@@ -221,16 +250,81 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Keep user logged in even after closin
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@gamingcafe.com')
+# Seconds before an SMTP connection gives up; keeps notification jobs well inside their lease
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
 
 # Razorpay Configuration
 RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID', default='')
 RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default='')
 RAZORPAY_WEBHOOK_SECRET = config('RAZORPAY_WEBHOOK_SECRET', default='')
 
+# Outbound HTTP (Razorpay, Telegram)
+# Each service uses one pooled keep-alive session. Idempotent calls are retried up to
+# OUTBOUND_HTTP_MAX_RETRIES times (within a retry budget); after BREAKER_THRESHOLD consecutive
+# failures a host is short-circuited for BREAKER_RESET seconds.
+OUTBOUND_HTTP_CONNECT_TIMEOUT = config('OUTBOUND_HTTP_CONNECT_TIMEOUT', default=5, cast=float)
+OUTBOUND_HTTP_READ_TIMEOUT = config('OUTBOUND_HTTP_READ_TIMEOUT', default=15, cast=float)
+OUTBOUND_HTTP_POOL_SIZE = config('OUTBOUND_HTTP_POOL_SIZE', default=10, cast=int)
+OUTBOUND_HTTP_MAX_RETRIES = config('OUTBOUND_HTTP_MAX_RETRIES', default=2, cast=int)
+OUTBOUND_HTTP_BREAKER_THRESHOLD = config('OUTBOUND_HTTP_BREAKER_THRESHOLD', default=5, cast=int)
+OUTBOUND_HTTP_BREAKER_RESET = config('OUTBOUND_HTTP_BREAKER_RESET', default=30, cast=int)
+
 # Telegram Notification Configuration
 # Note: Database settings override these defaults (set in TapNex Settings page)
 TELEGRAM_BOT_TOKEN = config('TELEGRAM_BOT_TOKEN', default='')
 TELEGRAM_CHAT_ID = config('TELEGRAM_CHAT_ID', default='')
+TELEGRAM_API_BASE = config('TELEGRAM_API_BASE', default='https://api.telegram.org')
+
+# Slot Maintenance
+# Slots are kept generated ahead by `python manage.py maintain_slots --loop`.
+# Enable the request-path fallback only where no worker can run (e.g. Vercel).
+SLOT_MAINTENANCE_MIDDLEWARE = config('SLOT_MAINTENANCE_MIDDLEWARE', default=IS_VERCEL, cast=bool)
+
+# Availability Snapshot Cache
+# Seconds a cached (game, date) slot list may be served; writes invalidate it sooner.
+AVAILABILITY_SNAPSHOT_TTL = config('AVAILABILITY_SNAPSHOT_TTL', default=30, cast=int)
+
+# Shared Booking Concurrency
+# 'locking' serializes bookings per slot with SELECT ... FOR UPDATE.
+# 'optimistic' claims shared spots with a conditional UPDATE that only checks capacity
+# and retries OPTIMISTIC_BOOKING_RETRIES times before falling back to locking.
+SHARED_BOOKING_MODE = config('SHARED_BOOKING_MODE', default='locking')
+OPTIMISTIC_BOOKING_RETRIES = config('OPTIMISTIC_BOOKING_RETRIES', default=5, cast=int)
+
+# Notification Job Queue
+# Telegram messages and emails are queued and sent by `python manage.py process_notification_jobs --loop`.
+# Failed jobs are retried after BACKOFF_BASE * 2^(attempt - 1) seconds (capped at BACKOFF_MAX)
+# and dead-lettered after MAX_ATTEMPTS.
+NOTIFICATION_JOB_MAX_ATTEMPTS = config('NOTIFICATION_JOB_MAX_ATTEMPTS', default=6, cast=int)
+NOTIFICATION_JOB_BACKOFF_BASE = config('NOTIFICATION_JOB_BACKOFF_BASE', default=30, cast=int)
+NOTIFICATION_JOB_BACKOFF_MAX = config('NOTIFICATION_JOB_BACKOFF_MAX', default=3600, cast=int)
+
+# Realtime Event Log
+# Booking, availability and game events are stored in the RealtimeEvent table so every
+# worker sees them. Events older than REALTIME_EVENT_RETENTION seconds are pruned
+# (python manage.py prune_realtime_events); SSE clients can resume within this window.
+REALTIME_EVENT_RETENTION = config('REALTIME_EVENT_RETENTION', default=3600, cast=int)
+
+# Availability Broadcasts
+# Slots whose availability changed are broadcast once per transaction, after commit.
+# A positive AVAILABILITY_BROADCAST_DEBOUNCE (seconds) also merges bursts across commits.
+AVAILABILITY_BROADCAST_DEBOUNCE = config('AVAILABILITY_BROADCAST_DEBOUNCE', default=0, cast=float)
+
+# Availability Event Stream (SSE)
+# Each web worker polls the RealtimeEvent log every AVAILABILITY_STREAM_POLL_INTERVAL
+# seconds while it has subscribers. Streams send a heartbeat comment when idle and are closed
+# after AVAILABILITY_STREAM_MAX_SECONDS so sync workers are recycled (browsers reconnect
+# with Last-Event-ID).
+AVAILABILITY_STREAM_POLL_INTERVAL = config('AVAILABILITY_STREAM_POLL_INTERVAL', default=0.5, cast=float)
+AVAILABILITY_STREAM_HEARTBEAT = config('AVAILABILITY_STREAM_HEARTBEAT', default=15, cast=int)
+AVAILABILITY_STREAM_MAX_SECONDS = config('AVAILABILITY_STREAM_MAX_SECONDS', default=300, cast=int)
+
+# Notification Long-Polling
+# /booking/api/notifications/?since=<id>&wait=<seconds> holds the request until a newer
+# notification arrives, checking every NOTIFICATION_LONG_POLL_INTERVAL seconds.
+# Only worth enabling in the client when served over ASGI (see README).
+NOTIFICATION_LONG_POLL_MAX_WAIT = config('NOTIFICATION_LONG_POLL_MAX_WAIT', default=25, cast=int)
+NOTIFICATION_LONG_POLL_INTERVAL = config('NOTIFICATION_LONG_POLL_INTERVAL', default=2, cast=float)
 
 # Company Information for Razorpay Whitelisting
 COMPANY_NAME = 'TapNex Technologies'